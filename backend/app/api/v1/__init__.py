@@ -3,6 +3,8 @@ from fastapi import APIRouter
 # Import the individual routers
 from .endpoints.users import router as users_router
 from .endpoints.organizations import router as orgs_router
+from .endpoints.proposals import router as proposals_router
+from .endpoints.jobs import router as jobs_router
 
 # Create main v1 router
 api_router = APIRouter()
@@ -10,6 +12,8 @@ api_router = APIRouter()
 # Include the individual routers
 api_router.include_router(users_router, tags=["Users"], prefix="/endpoints/users")
 api_router.include_router(orgs_router, tags=["Organizations"], prefix="/endpoints/organizations")
+api_router.include_router(jobs_router, tags=["Jobs"], prefix="/endpoints/jobs")
+api_router.include_router(proposals_router, tags=["Proposals"], prefix="/endpoints/proposals")
 
 
 __all__ = ["api_router"]
\ No newline at end of file
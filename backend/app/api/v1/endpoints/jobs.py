@@ -0,0 +1,103 @@
+# backend/app/api/v1/endpoints/jobs.py
+
+from datetime import datetime, timezone
+from typing import List, Optional
+from bson import ObjectId
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
+from ..models.job import JobCreate, JobMatchList, JobSearchPage
+from ..models.bulk import BulkImportReport
+from ..models.user import UserInDB
+from ....core.bulk import BulkImporter
+from ....core.database import jobs_collection
+from ....core.dependencies import get_current_user, get_org_admin
+from ....core.serialization import Serializer
+from ....services.job_service import match_freelancers
+from ....services.job_search_service import JobSearch, cached_search, invalidate_job_search, search_jobs
+
+router = APIRouter()
+
+search_page_serializer = Serializer(JobSearchPage)
+
+@router.get("/search", response_model=JobSearchPage)
+async def search_job_posts(
+    q: Optional[str] = Query(None, max_length=200),
+    skills: List[str] = Query([]),
+    budget_min: Optional[float] = Query(None, ge=0),
+    budget_max: Optional[float] = Query(None, ge=0),
+    posted_within_days: Optional[int] = Query(None, ge=1, le=365),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Search job posts by text in title, skills and description, optionally
+    filtered to jobs requiring all of ``skills``, overlapping the budget range
+    or posted within the last ``posted_within_days`` days.
+
+    Results are ranked by relevance with ``q`` and newest first without it.
+    Pages are keyset-paginated: pass ``next_cursor`` from one page as ``cursor``
+    to get the next. The first page also carries facet counts for refining the
+    search.
+    """
+    if budget_min is not None and budget_max is not None and budget_min > budget_max:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="budget_min must not exceed budget_max"
+        )
+
+    search = JobSearch.create(q, skills, budget_min, budget_max, posted_within_days)
+
+    async def render() -> bytes:
+        return search_page_serializer.dumps(await search_jobs(search, limit, cursor))
+
+    body = await cached_search((search, limit, cursor), render)
+    return Response(body, media_type="application/json")
+
+@router.get("/{job_id}/matches", response_model=JobMatchList)
+async def get_job_matches(
+    job_id: str,
+    limit: int = Query(20, ge=1, le=100),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    The freelancers best matching a job post, by profile similarity to the post
+    and overlap with its skills. Only members of the organization that posted
+    the job may see its matches.
+    """
+    if not ObjectId.is_valid(job_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Job ID")
+
+    job = await jobs_collection.find_one(
+        {"_id": ObjectId(job_id)}, {"title": 1, "description": 1, "skills": 1, "org_id": 1}
+    )
+    if job is None or not current_user.org_id or job.get("org_id") != current_user.org_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+
+    skills = job.get("skills") or []
+    job_text = "\n".join(part for part in (job.get("title"), job.get("description"), ", ".join(skills)) if part)
+    matches = await match_freelancers(job_text, skills, top_k=limit)
+    return {"job_id": job_id, "matches": [vars(match) for match in matches]}
+
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_import_jobs(request: Request, current_user: UserInDB = Depends(get_org_admin)):
+    """
+    Import job posts for the caller's organization from an NDJSON upload, one
+    ``JobCreate`` object per line. Posts whose ``external_id`` was already
+    imported are reported as duplicates. Only organization administrators may
+    import.
+    """
+    async def build_documents(records: List[JobCreate]) -> List[dict]:
+        now = datetime.now(timezone.utc)
+        return [
+            {
+                **record.model_dump(exclude_none=True),
+                "org_id": current_user.org_id,
+                "posted_by": current_user.id,
+                "created_at": now
+            }
+            for record in records
+        ]
+
+    report = await BulkImporter(jobs_collection, JobCreate, build_documents).run(request.stream())
+    if report["inserted"]:
+        invalidate_job_search()
+    return report
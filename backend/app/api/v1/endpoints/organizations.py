@@ -1,61 +1,110 @@
 from typing import Optional, List
-from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi import APIRouter, HTTPException, status, Depends, Query, Request, Header, Response
+from fastapi.responses import StreamingResponse
 from ....core.database import organizations_collection, users_collection
-from ..models.organization import OrganizationCreate, OrganizationInDB, OrganizationUpdate
-from ..models.user import UserInDB
-from ....core.dependencies import get_current_user
+from ....core.bulk import BulkImporter
+from ....core.conditional import etag, etag_matches, response_cache
+from ....core.pagination import encode_cursor, decode_cursor
+from ....core.serialization import Serializer
+from ..models.bulk import BulkImportReport
+from ..models.organization import OrganizationCreate, OrganizationInDB, OrganizationUpdate, OrgStats
+from ..models.user import UserInDB, MemberSummary, MemberPage
+from ....core.dependencies import get_current_user, get_org_admin
+from ....services.org_stats_service import get_org_stats
 from bson import ObjectId
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
 
 router = APIRouter()
 
+# Only the fields needed for a member summary; never fetch password hashes or profile arrays
+MEMBER_PROJECTION = {field: 1 for field in ("email", "first_name", "last_name", "role", "is_active")}
+MEMBER_STREAM_BATCH_SIZE = 500
+
+# Handlers validate Mongo documents once and return the rendered response directly
+org_serializer = Serializer(OrganizationInDB)
+member_serializer = Serializer(MemberSummary)
+member_page_serializer = Serializer(MemberPage)
+stats_serializer = Serializer(OrgStats)
+
 @router.post("/register", response_model=OrganizationInDB, status_code=status.HTTP_201_CREATED)
 async def register_organization(organization: OrganizationCreate):
     """
     Register a new organization.
     """
-    existing_org = await organizations_collection.find_one({"name": organization.name})
-    if existing_org:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="Organization with this name already exists"
-        )
-    
     org_data = {
         "name": organization.name,
         "description": organization.description,
         "org_email": organization.org_email,
         "org_phone_number": organization.org_phone_number,
         "industry": organization.industry,
-        "location": organization.location
+        "location": organization.location,
+        "version": 0
     }
 
-    new_org = await organizations_collection.insert_one(org_data)
-    
-    created_org = await organizations_collection.find_one({"_id": new_org.inserted_id})
-    if created_org is None:
+    # The unique name index rejects duplicates, so no pre-check or re-read is needed
+    try:
+        new_org = await organizations_collection.insert_one(org_data)
+    except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve newly created organization"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Organization with this name already exists"
         )
 
-    return OrganizationInDB.model_validate(created_org)
+    org_data["_id"] = new_org.inserted_id
+    return org_serializer.response(
+        org_data, status_code=status.HTTP_201_CREATED, headers={"ETag": etag(org_data["version"])}
+    )
+
+
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_import_organizations(request: Request, current_user: UserInDB = Depends(get_org_admin)):
+    """
+    Import organizations from an NDJSON upload, one ``OrganizationCreate`` object
+    per line. Names that already exist are reported as duplicates. Only
+    organization administrators may import.
+    """
+    async def build_documents(records: List[OrganizationCreate]) -> List[dict]:
+        return [{**record.model_dump(), "version": 0} for record in records]
+
+    return await BulkImporter(organizations_collection, OrganizationCreate, build_documents).run(request.stream())
 
 
 @router.get("/{org_id}", response_model=OrganizationInDB)
-async def get_organization(org_id: str):
+async def get_organization(org_id: str, if_none_match: Optional[str] = Header(None)):
     """
     Get a specific organization by its ID.
+
+    The response carries the organization's version as its ETag; send it back
+    in If-None-Match to get a 304 while the organization is unchanged.
     """
     if not ObjectId.is_valid(org_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Organization ID")
 
-    org = await organizations_collection.find_one({"_id": ObjectId(org_id)})
-    if org is None:
+    # A version-only read decides between a 304, a cached body and a full read
+    current = await organizations_collection.find_one({"_id": ObjectId(org_id)}, {"version": 1})
+    if current is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
-    return OrganizationInDB.model_validate(org)
+    headers = {"ETag": etag(current.get("version")), "Cache-Control": "no-cache"}
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    body = response_cache.get((("organization", org_id), current.get("version") or 0))
+    if body is None:
+        org = await organizations_collection.find_one({"_id": ObjectId(org_id)})
+        if org is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found"
+            )
+        # Cached under the version actually read, in case a write landed in between
+        headers["ETag"] = etag(org.get("version"))
+        body = org_serializer.dumps(org)
+        response_cache.set((("organization", org_id), org.get("version") or 0), body)
+    return Response(body, headers=headers, media_type="application/json")
 
 
 @router.patch("/{org_id}", response_model=OrganizationInDB)
@@ -84,31 +133,41 @@ async def update_organization(
             detail="No fields to update provided"
         )
     
-    result = await organizations_collection.update_one(
-        {"_id": ObjectId(org_id)},
-        {"$set": update_data}
-    )
-    
-    if result.matched_count == 0:
+    try:
+        updated_org = await organizations_collection.find_one_and_update(
+            {"_id": ObjectId(org_id)},
+            {"$set": update_data, "$inc": {"version": 1}},
+            return_document=ReturnDocument.AFTER
+        )
+    except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organization not found"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Organization with this name already exists"
         )
     
-    updated_org = await organizations_collection.find_one({"_id": ObjectId(org_id)})
     if updated_org is None:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve updated organization"
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Organization not found"
         )
     
-    return OrganizationInDB.model_validate(updated_org)
+    return org_serializer.response(updated_org, headers={"ETag": etag(updated_org.get("version"))})
 
 
-@router.get("/{org_id}/members", response_model=List[UserInDB])
-async def get_organization_members(org_id: str, current_user: UserInDB = Depends(get_current_user)):
+@router.get("/{org_id}/members", response_model=MemberPage)
+async def get_organization_members(
+    org_id: str,
+    limit: int = Query(50, ge=1, le=500),
+    cursor: Optional[str] = None,
+    stream: bool = False,
+    current_user: UserInDB = Depends(get_current_user)
+):
     """
-    Get all members of a specific organization.
+    List members of a specific organization, ordered by ID.
+
+    Pages are keyset-paginated: pass ``next_cursor`` from one page as ``cursor`` to
+    get the next. With ``stream=true`` every member after ``cursor`` is streamed as
+    NDJSON instead, one summary per line.
     """
     if not ObjectId.is_valid(org_id):
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Organization ID")
@@ -120,7 +179,50 @@ async def get_organization_members(org_id: str, current_user: UserInDB = Depends
             detail="You do not have permission to view this organization's members."
         )
 
-    # Now, find all users who have this org_id
-    members = await users_collection.find({"org_id": org_id}).to_list(length=100)
-    
-    return [UserInDB.model_validate(member) for member in members]
\ No newline at end of file
+    # is_deleted is part of the query so the partial org_members index applies
+    query = {"org_id": org_id, "is_deleted": False}
+    if cursor:
+        query["_id"] = {"$gt": decode_cursor(cursor)}
+
+    if stream:
+        return StreamingResponse(_stream_members(query), media_type="application/x-ndjson")
+
+    # Fetch one extra document to learn whether another page exists
+    members = await users_collection.find(query, MEMBER_PROJECTION).sort("_id", 1).to_list(length=limit + 1)
+
+    next_cursor = None
+    if len(members) > limit:
+        members = members[:limit]
+        next_cursor = encode_cursor(members[-1]["_id"])
+
+    return member_page_serializer.response({"items": members, "next_cursor": next_cursor})
+
+
+@router.get("/{org_id}/stats", response_model=OrgStats)
+async def get_organization_stats(
+    org_id: str,
+    weeks: int = Query(12, ge=1, le=104),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Dashboard statistics of an organization: member count, proposals applied,
+    generated, won and lost, win rate, and the same proposal counts for each of
+    the last ``weeks`` ISO weeks. Read from the materialized ``org_stats``
+    document, kept current as users and proposals change.
+    """
+    if not ObjectId.is_valid(org_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Organization ID")
+
+    if current_user.org_id != org_id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="You do not have permission to view this organization's statistics."
+        )
+
+    return stats_serializer.response(await get_org_stats(org_id, weeks))
+
+
+async def _stream_members(query: dict):
+    members = users_collection.find(query, MEMBER_PROJECTION).sort("_id", 1).batch_size(MEMBER_STREAM_BATCH_SIZE)
+    async for member in members:
+        yield member_serializer.dumps(member) + b"\n"
@@ -0,0 +1,111 @@
+# backend/app/api/v1/endpoints/proposals.py
+
+import json
+from datetime import datetime, timezone
+from fastapi import APIRouter, HTTPException, status, Depends
+from fastapi.responses import StreamingResponse
+from bson import ObjectId
+from pymongo import ReturnDocument
+from ..models.proposal import ProposalCreate, ProposalInDB, ProposalJob, ProposalOutcome
+from ..models.user import UserInDB
+from ....core.database import proposals_collection
+from ....core.dependencies import get_current_user
+from ....core.serialization import Serializer
+from ....services import org_stats_service
+from ....services.proposal_service import PROPOSAL_COMPLETED, ProposalQueueFull, get_proposal_service
+
+router = APIRouter()
+
+proposal_serializer = Serializer(ProposalInDB)
+
+
+async def _get_own_proposal(proposal_id: str, current_user: UserInDB, projection: dict = None) -> dict:
+    if not ObjectId.is_valid(proposal_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Proposal ID")
+
+    proposal = await proposals_collection.find_one({"_id": ObjectId(proposal_id)}, projection)
+    if proposal is None or proposal.get("user_id") != current_user.id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Proposal not found")
+    return proposal
+
+
+@router.post("", response_model=ProposalJob, status_code=status.HTTP_202_ACCEPTED)
+async def create_proposal(proposal: ProposalCreate, current_user: UserInDB = Depends(get_current_user)):
+    """
+    Queue a proposal for generation and return its job id immediately.
+    """
+    try:
+        document = await get_proposal_service().submit(
+            current_user.id, current_user.org_id, proposal.model_dump()
+        )
+    except ProposalQueueFull as exc:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many proposals are waiting to be generated, please retry shortly",
+            headers={"Retry-After": str(exc.retry_after)},
+        )
+    return ProposalJob(id=str(document["_id"]), status=document["status"])
+
+
+@router.get("/{proposal_id}", response_model=ProposalInDB)
+async def get_proposal(proposal_id: str, current_user: UserInDB = Depends(get_current_user)):
+    """
+    Get a proposal and its generation status.
+    """
+    proposal = await _get_own_proposal(proposal_id, current_user)
+    return proposal_serializer.response(proposal)
+
+
+@router.patch("/{proposal_id}/outcome", response_model=ProposalInDB)
+async def set_proposal_outcome(
+    proposal_id: str,
+    outcome: ProposalOutcome,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Record whether a completed proposal was won or lost, or clear the outcome with null.
+    """
+    if not ObjectId.is_valid(proposal_id):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid Proposal ID")
+
+    update = {"outcome": outcome.outcome, "outcome_at": datetime.now(timezone.utc) if outcome.outcome else None}
+    # The previous outcome tells the organization stats which counter to move
+    previous = await proposals_collection.find_one_and_update(
+        {"_id": ObjectId(proposal_id), "user_id": current_user.id, "status": PROPOSAL_COMPLETED},
+        {"$set": update},
+        return_document=ReturnDocument.BEFORE
+    )
+    if previous is None:
+        await _get_own_proposal(proposal_id, current_user, {"user_id": 1})
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Only completed proposals can have an outcome"
+        )
+
+    await org_stats_service.record_outcome_change(
+        previous.get("org_id"),
+        previous.get("outcome"), previous.get("outcome_at"),
+        update["outcome"], update["outcome_at"]
+    )
+    return proposal_serializer.response({**previous, **update})
+
+
+@router.get("/{proposal_id}/stream")
+async def stream_proposal(proposal_id: str, current_user: UserInDB = Depends(get_current_user)):
+    """
+    Stream a proposal as Server-Sent Events: ``token`` events carry generated
+    text, and a final ``completed`` or ``failed`` event ends the stream. A
+    ``restart`` event means generation started over (e.g. after a worker shut
+    down) and the text received so far should be discarded.
+    """
+    await _get_own_proposal(proposal_id, current_user, {"user_id": 1})
+
+    async def events():
+        async for kind, data in get_proposal_service().stream(proposal_id):
+            yield f"event: {kind}\ndata: {json.dumps(data)}\n\n"
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,16 +1,42 @@
 # backend/app/api/v1/endpoints/users.py
 
-from fastapi import APIRouter, HTTPException, status, Depends
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, BackgroundTasks, Request, Body, Header, Response
+from fastapi.exceptions import RequestValidationError
 from fastapi.security import OAuth2PasswordRequestForm
-from ..models.user import UserCreate, UserInDB, UserUpdate, Profile, Education, Experience, Project, Skill, PasswordChange
-from ....core.security import hash_password, verify_password, create_access_token
+from pydantic import BaseModel, ValidationError
+from ..models.user import (
+    UserCreate, UserImport, UserInDB, UserUpdate, Profile, Education, Experience, Project, Skill, PasswordChange,
+    ProfileSection, PROFILE_SECTION_MODELS, ProfileItemResult, ORG_ADMIN_ROLE
+)
+from ..models.bulk import BulkImportReport
+from ..models.resume import ResumeParse
+from ....core.bulk import BulkImporter
+from ....core.conditional import conditional_response, etag, etag_matches, response_cache
+from ....core.serialization import Serializer
+from ....core.security import hash_password_async, hash_passwords_async, verify_password_async, create_access_token
 from ....core.database import users_collection
 from bson import ObjectId
-from ....core.dependencies import get_current_user
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from ....core.dependencies import get_current_user, get_org_admin, invalidate_principal
+from ....services.job_service import MATCH_FIELDS, refresh_user, refresh_user_by_id
+from ....services import org_stats_service
+from ....services.profile_digest import DIGEST_FIELDS, refresh_digest
+from ....services.resume_parser import ResumeParseError, ResumeParseTimeout
+from ....services.resume_service import ingest_resume, parser_pool
 import logging
 
 router = APIRouter()
 
+# Handlers validate Mongo documents once and return the rendered response directly
+user_serializer = Serializer(UserInDB)
+item_result_serializer = Serializer(ProfileItemResult)
+resume_serializer = Serializer(ResumeParse)
+
+# Profile sections a parsed resume can fill in
+RESUME_SECTIONS = (ProfileSection.education, ProfileSection.experience, ProfileSection.skills)
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -24,14 +50,7 @@ async def register_user(user: UserCreate):
     """
     Register a new user.
     """
-    existing_user = await users_collection.find_one({"email": user.email})
-    if existing_user:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail="User with this email already exists"
-        )
-    
-    hashed_password = hash_password(user.password)
+    hashed_password = await hash_password_async(user.password)
     
     # 🐛 FIXED: Create a dictionary for the data to be inserted
     user_data = {
@@ -42,20 +61,51 @@ async def register_user(user: UserCreate):
         "phone_number": user.phone_number,
         "role": "freelancer", # Default role
         "is_active": True, # Default status
-        "is_deleted": False # Default soft-delete status
+        "is_deleted": False, # Default soft-delete status
+        "version": 0
     }
 
-    new_user = await users_collection.insert_one(user_data)
-    
-    # 🐛 FIXED: Find the newly created user by its inserted_id
-    created_user = await users_collection.find_one({"_id": new_user.inserted_id})
-    if created_user is None:
+    # The unique email index rejects duplicates, so no pre-check or re-read is needed
+    try:
+        new_user = await users_collection.insert_one(user_data)
+    except DuplicateKeyError:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to retrieve newly created user"
+            status_code=status.HTTP_409_CONFLICT,
+            detail="User with this email already exists"
         )
-        
-    return UserInDB.model_validate(created_user)
+
+    user_data["_id"] = new_user.inserted_id
+    return user_serializer.response(user_data, status_code=status.HTTP_201_CREATED)
+
+@router.post("/bulk", response_model=BulkImportReport)
+async def bulk_import_users(request: Request, current_user: UserInDB = Depends(get_org_admin)):
+    """
+    Import freelancers into the caller's organization from an NDJSON upload, one
+    ``UserImport`` object per line. Returns an outcome for every line. Only
+    organization administrators may import.
+    """
+    async def build_documents(records: List[UserImport]) -> List[dict]:
+        # Hash the whole batch at once so every password worker stays busy
+        hashes = iter(await hash_passwords_async([r.password for r in records if r.password_hash is None]))
+        return [
+            {
+                "email": record.email,
+                "password_hash": record.password_hash or next(hashes),
+                "first_name": record.first_name,
+                "last_name": record.last_name,
+                "phone_number": record.phone_number,
+                "role": record.role,
+                "org_id": current_user.org_id,
+                "is_active": True,
+                "is_deleted": False,
+                "version": 0
+            }
+            for record in records
+        ]
+
+    report = await BulkImporter(users_collection, UserImport, build_documents).run(request.stream())
+    await org_stats_service.record(current_user.org_id, members=report["inserted"])
+    return report
 
 @router.post("/login")
 async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends()):
@@ -64,27 +114,60 @@ async def login_for_access_token(form_data: OAuth2PasswordRequestForm = Depends(
     """
     user = await users_collection.find_one({"email": form_data.username})
     
-    if not user or not verify_password(form_data.password, user.get("password_hash")):
+    if not user or not await verify_password_async(form_data.password, user.get("password_hash")):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    access_token = create_access_token(data={"sub": user["email"]})
+    access_token = create_access_token(data={"sub": user["email"], "ver": user.get("version", 0)})
     
     return {"access_token": access_token, "token_type": "bearer"}
 
 @router.get("/me", response_model=UserInDB)
-async def get_my_profile(current_user: UserInDB = Depends(get_current_user)):
+async def get_my_profile(
+    if_none_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user)
+):
     """
     Get the full profile of the current authenticated user.
+
+    The response carries the profile version as its ETag; send it back in
+    If-None-Match to get a 304 while the profile is unchanged.
     """
-    return current_user
+    # The cached principal may predate a write made on another worker, so the
+    # version comes from a version-only read, as for organizations
+    current = await users_collection.find_one({"_id": ObjectId(current_user.id)}, {"version": 1})
+    if current is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+    version = current.get("version") or 0
+    # The URL is the same for every user, so caches must key on the token too
+    headers = {"Cache-Control": "private, no-cache", "Vary": "Authorization"}
+    if version == (current_user.version or 0):
+        return conditional_response(
+            if_none_match, ("user", current_user.id), version, lambda: user_serializer.dumps(current_user), headers
+        )
+
+    invalidate_principal(current_user.email)
+    headers["ETag"] = etag(version)
+    if etag_matches(if_none_match, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    body = response_cache.get((("user", current_user.id), version))
+    if body is None:
+        user = await users_collection.find_one({"_id": ObjectId(current_user.id)}, {"profile_digest": 0})
+        if user is None:
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="User not found")
+        # Cached under the version actually read, in case a write landed in between
+        headers["ETag"] = etag(user.get("version"))
+        body = user_serializer.dumps(user)
+        response_cache.set((("user", current_user.id), user.get("version") or 0), body)
+    return Response(body, headers=headers, media_type="application/json")
 
 @router.patch("/me", response_model=UserInDB)
 async def update_my_profile(
     user_update: UserUpdate,
+    background_tasks: BackgroundTasks,
     current_user: UserInDB = Depends(get_current_user)
 ):
     """
@@ -100,22 +183,28 @@ async def update_my_profile(
         update_data["phone_number"] = user_update.phone_number
     if user_update.org_id is not None:
         update_data["org_id"] = user_update.org_id
-    if user_update.role is not None:
+    # role and is_deleted have non-None defaults, so only fields the client sent count
+    if user_update.role is not None and "role" in user_update.model_fields_set:
+        if user_update.role == ORG_ADMIN_ROLE and current_user.role != ORG_ADMIN_ROLE:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Organization administrators are appointed, not self-assigned"
+            )
         update_data["role"] = user_update.role
     
     if user_update.profile is not None:
         update_data["profile"] = user_update.profile.model_dump()
         
     if user_update.education is not None:
-        update_data["education"] = [item.model_dump() for item in user_update.education]
+        update_data["education"] = _profile_items("education", user_update.education)
     if user_update.experience is not None:
-        update_data["experience"] = [item.model_dump() for item in user_update.experience]
+        update_data["experience"] = _profile_items("experience", user_update.experience)
     if user_update.projects is not None:
-        update_data["projects"] = [item.model_dump() for item in user_update.projects]
+        update_data["projects"] = _profile_items("projects", user_update.projects)
     if user_update.skills is not None:
-        update_data["skills"] = [item.model_dump() for item in user_update.skills]
+        update_data["skills"] = _profile_items("skills", user_update.skills)
     
-    if user_update.is_deleted is not None:
+    if user_update.is_deleted is not None and "is_deleted" in user_update.model_fields_set:
         update_data["is_deleted"] = user_update.is_deleted
 
     if not update_data:
@@ -124,21 +213,266 @@ async def update_my_profile(
             detail="No fields to update provided"
         )
     
-    result = await users_collection.update_one(
+    # The stored document before the write (one round trip) plus the fields set
+    # is exactly what was stored, unlike the possibly stale cached principal. The
+    # previous membership fields tell whether the organization's member count moves
+    previous = await users_collection.find_one_and_update(
         {"email": current_user.email},
-        {"$set": update_data}
+        {"$set": update_data, "$inc": {"version": 1}},
+        projection={"profile_digest": 0},
+        return_document=ReturnDocument.BEFORE
     )
+    invalidate_principal(current_user.email)
     
-    if result.matched_count == 0:
+    if previous is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="User not found for update"
         )
-      
-    updated_user_dict = current_user.model_dump(by_alias=True, exclude_unset=True)
-    updated_user_dict.update(update_data)
+    updated_user_dict = {**previous, **update_data, "version": (previous.get("version") or 0) + 1}
+    if "org_id" in update_data or "is_deleted" in update_data:
+        await org_stats_service.record_membership_change(previous, updated_user_dict)
+
+    # Keep the job matcher's skill index and profile vector current
+    if any(field in update_data for field in MATCH_FIELDS):
+        background_tasks.add_task(refresh_user, updated_user_dict)
+    # And the prompt builder's token-counted digest
+    if any(field in update_data for field in DIGEST_FIELDS):
+        background_tasks.add_task(refresh_digest, current_user.id)
     
-    return UserInDB.model_validate(updated_user_dict)
+    return user_serializer.response(updated_user_dict, headers={"ETag": etag(updated_user_dict["version"])})
+
+def _profile_item(item: BaseModel, keep_id: bool = True) -> dict:
+    """Stored form of a profile array entry, with an item_id assigned if it has none."""
+    data = item.model_dump()
+    if not (keep_id and data.get("item_id")):
+        data["item_id"] = str(ObjectId())
+    return data
+
+def _profile_items(section: str, items: List[BaseModel]) -> List[dict]:
+    """Stored form of a whole profile array; item_ids the client sent must be unique in it."""
+    stored = [_profile_item(item) for item in items]
+    seen = set()
+    for data in stored:
+        if data["item_id"] in seen:
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_CONTENT,
+                detail=f"Duplicate item_id {data['item_id']!r} in {section}"
+            )
+        seen.add(data["item_id"])
+    return stored
+
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+    """Profile version from an If-Match header ("7", W/"7" or 7), if one was sent."""
+    if if_match is None:
+        return None
+    tag = if_match.strip()
+    if tag.startswith("W/"):
+        tag = tag[2:]
+    tag = tag.strip('"')
+    if not tag.isdigit():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="If-Match must carry the profile version"
+        )
+    return int(tag)
+
+def _validate_item(model, data: dict) -> BaseModel:
+    try:
+        return model.model_validate(data)
+    except ValidationError as exc:
+        # Same shape as FastAPI's own body validation errors
+        raise RequestValidationError([
+            {**error, "loc": ("body", *error["loc"])} for error in exc.errors(include_url=False)
+        ])
+
+async def _update_profile_items(
+    current_user: UserInDB,
+    section: ProfileSection,
+    item_filter: dict,
+    update: dict,
+    projection: dict,
+    if_match: Optional[str],
+    background_tasks: BackgroundTasks
+) -> dict:
+    """
+    Applies an item-level update and bumps the user's version in one round trip,
+    returning only ``projection`` and the new version. With If-Match the write
+    only applies if the profile is still at that version.
+    """
+    query = {"_id": ObjectId(current_user.id), **item_filter}
+    expected = _expected_version(if_match)
+    if expected is not None:
+        query["version"] = expected
+
+    updated = await users_collection.find_one_and_update(
+        query,
+        {**update, "$inc": {"version": 1}},
+        projection={**projection, "version": 1},
+        return_document=ReturnDocument.AFTER
+    )
+    if updated is None:
+        # Only the failure path pays for telling a stale version from a missing item
+        if expected is not None and await users_collection.count_documents(
+            {"_id": ObjectId(current_user.id), **item_filter}, limit=1
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_412_PRECONDITION_FAILED,
+                detail="Profile was modified since the given version"
+            )
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile item not found")
+
+    invalidate_principal(current_user.email)
+    if section.value in MATCH_FIELDS:
+        background_tasks.add_task(refresh_user_by_id, current_user.id)
+    if section.value in DIGEST_FIELDS:
+        background_tasks.add_task(refresh_digest, current_user.id)
+    return updated
+
+def _item_response(item: Optional[dict], version: int, status_code: int = status.HTTP_200_OK):
+    return item_result_serializer.response(
+        {"item": item, "version": version},
+        status_code=status_code,
+        headers={"ETag": f'"{version}"'}
+    )
+
+@router.post("/me/resume", response_model=ResumeParse, status_code=status.HTTP_201_CREATED)
+async def upload_resume(
+    request: Request,
+    background_tasks: BackgroundTasks,
+    filename: Optional[str] = None,
+    apply: bool = False,
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Upload a resume (PDF, DOCX or plain text) as the raw request body and get the
+    education, experience and skills parsed from it. With ``apply=true`` parsed
+    sections are written to the profile where the profile's section is still empty.
+    """
+    try:
+        parsed = await ingest_resume(
+            request.stream(), current_user.id, filename, request.headers.get("content-type")
+        )
+    except ResumeParseTimeout as exc:
+        # Not necessarily the file's fault: parses slow down when the pool is busy
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(exc),
+            headers={"Retry-After": str(parser_pool.retry_after())}
+        )
+    except ResumeParseError as exc:
+        raise HTTPException(status_code=status.HTTP_422_UNPROCESSABLE_CONTENT, detail=str(exc))
+
+    sections = [
+        section for section in RESUME_SECTIONS
+        if apply and parsed[section.value] and not getattr(current_user, section.value)
+    ]
+    if sections:
+        items = {
+            section.value: [
+                _profile_item(_validate_item(PROFILE_SECTION_MODELS[section][0], item), keep_id=False)
+                for item in parsed[section.value]
+            ]
+            for section in sections
+        }
+        # Only fills sections that are still empty when the write lands
+        empty = [{"$or": [{section.value: {"$exists": False}}, {section.value: {"$in": [None, []]}}]}
+                 for section in sections]
+        updated = await users_collection.find_one_and_update(
+            {"_id": ObjectId(current_user.id), "$and": empty},
+            {"$set": items, "$inc": {"version": 1}},
+            projection={"version": 1},
+            return_document=ReturnDocument.AFTER
+        )
+        if updated is None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="Profile sections were filled in while the resume was parsed"
+            )
+        invalidate_principal(current_user.email)
+        if any(section.value in MATCH_FIELDS for section in sections):
+            background_tasks.add_task(refresh_user_by_id, current_user.id)
+        if any(section.value in DIGEST_FIELDS for section in sections):
+            background_tasks.add_task(refresh_digest, current_user.id)
+        parsed.update(items, applied=[section.value for section in sections], version=updated["version"])
+
+    return resume_serializer.response(parsed, status_code=status.HTTP_201_CREATED)
+
+@router.post("/me/{section}", response_model=ProfileItemResult, status_code=status.HTTP_201_CREATED)
+async def add_profile_item(
+    section: ProfileSection,
+    background_tasks: BackgroundTasks,
+    item: dict = Body(...),
+    if_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Append one entry to a profile array (education, experience, projects or skills).
+    """
+    create_model, _ = PROFILE_SECTION_MODELS[section]
+    stored = _profile_item(_validate_item(create_model, item), keep_id=False)
+    updated = await _update_profile_items(
+        current_user, section, {}, {"$push": {section.value: stored}}, {"_id": 1}, if_match, background_tasks
+    )
+    return _item_response(stored, updated["version"], status.HTTP_201_CREATED)
+
+@router.patch("/me/{section}/{item_id}", response_model=ProfileItemResult)
+async def update_profile_item(
+    section: ProfileSection,
+    item_id: str,
+    background_tasks: BackgroundTasks,
+    changes: dict = Body(...),
+    if_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Change fields of one profile array entry, leaving the rest of the array untouched.
+    """
+    create_model, update_model = PROFILE_SECTION_MODELS[section]
+    fields = _validate_item(update_model, changes).model_dump(exclude_unset=True)
+    if not fields:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No fields to update provided"
+        )
+    for name, value in fields.items():
+        if value is None and create_model.model_fields[name].is_required():
+            raise RequestValidationError([
+                {"type": "value_error", "loc": ("body", name), "msg": f"{name} cannot be null", "input": None}
+            ])
+
+    updated = await _update_profile_items(
+        current_user,
+        section,
+        {f"{section.value}.item_id": item_id},
+        {"$set": {f"{section.value}.$.{name}": value for name, value in fields.items()}},
+        {section.value: {"$elemMatch": {"item_id": item_id}}},
+        if_match,
+        background_tasks
+    )
+    return _item_response(updated[section.value][0], updated["version"])
+
+@router.delete("/me/{section}/{item_id}", response_model=ProfileItemResult)
+async def remove_profile_item(
+    section: ProfileSection,
+    item_id: str,
+    background_tasks: BackgroundTasks,
+    if_match: Optional[str] = Header(None),
+    current_user: UserInDB = Depends(get_current_user)
+):
+    """
+    Remove one profile array entry by its item_id.
+    """
+    updated = await _update_profile_items(
+        current_user,
+        section,
+        {f"{section.value}.item_id": item_id},
+        {"$pull": {section.value: {"item_id": item_id}}},
+        {"_id": 1},
+        if_match,
+        background_tasks
+    )
+    return _item_response(None, updated["version"])
 
 @router.patch("/me/password", status_code=status.HTTP_204_NO_CONTENT)
 async def change_my_password(
@@ -151,10 +485,11 @@ async def change_my_password(
 
     new_password = password_change_form.new_password
     
-    hashed_password = hash_password(new_password)
+    hashed_password = await hash_password_async(new_password)
     await users_collection.update_one(
         {"email": current_user.email},
-        {"$set": {"password_hash": hashed_password}}
+        {"$set": {"password_hash": hashed_password}, "$inc": {"version": 1}}
     )
+    invalidate_principal(current_user.email)
     
     return
\ No newline at end of file
@@ -0,0 +1,15 @@
+from typing import Optional, List, Literal
+from pydantic import BaseModel
+
+# Outcome of one NDJSON line in a bulk import
+class BulkRecordResult(BaseModel):
+    line: int
+    status: Literal["inserted", "invalid", "duplicate", "failed"]
+    id: Optional[str] = None
+    error: Optional[str] = None
+
+class BulkImportReport(BaseModel):
+    total: int = 0
+    inserted: int = 0
+    failed: int = 0
+    results: List[BulkRecordResult] = []
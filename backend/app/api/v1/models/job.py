@@ -0,0 +1,63 @@
+from datetime import datetime
+from typing import Optional, List
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from .user import AnnotatedObjectId
+
+class JobBase(BaseModel):
+    title: str = Field(..., min_length=2)
+    description: str = Field(..., min_length=10)
+    skills: List[str] = []
+    client_name: Optional[str] = None
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    location: Optional[str] = None
+    # Identifier of the post in the system it was imported from; unique when present
+    external_id: Optional[str] = None
+
+class JobCreate(JobBase):
+    pass
+
+class JobInDB(JobBase):
+    id: AnnotatedObjectId = Field(alias="_id")
+    org_id: Optional[str] = None
+    posted_by: Optional[str] = None
+    created_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
+
+class JobSearchHit(JobInDB):
+    # Text relevance; only set when searching with ``q``
+    score: Optional[float] = None
+
+class FacetBucket(BaseModel):
+    value: str
+    count: int
+
+class JobFacets(BaseModel):
+    skills: List[FacetBucket] = []
+    budget: List[FacetBucket] = []
+    posted: List[FacetBucket] = []
+    # Matches counted; when ``truncated`` only the first JOB_SEARCH_FACET_SCAN_LIMIT were
+    total: int = 0
+    truncated: bool = False
+
+class JobSearchPage(BaseModel):
+    items: List[JobSearchHit]
+    next_cursor: Optional[str] = None
+    # Only computed for the first page of a search
+    facets: Optional[JobFacets] = None
+
+class JobMatch(BaseModel):
+    user_id: str
+    # Blend of profile similarity and skill overlap used for ranking
+    score: float
+    similarity: float
+    skill_overlap: int
+
+class JobMatchList(BaseModel):
+    job_id: str
+    matches: List[JobMatch]
@@ -1,3 +1,4 @@
+from datetime import datetime
 from typing import Optional, Any, List
 from pydantic import BaseModel, EmailStr, Field, BeforeValidator
 from pydantic_core import core_schema
@@ -55,9 +56,30 @@ class OrganizationUpdate(OrganizationBase):
 
 class OrganizationInDB(OrganizationBase):
     id: AnnotatedObjectId = Field(alias="_id")
+    # Bumped on every write; GET responses carry it as their ETag
+    version: Optional[int] = 0
     
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
         json_encoders = {ObjectId: str}
 
+class WeeklyOrgStats(BaseModel):
+    # ISO week, e.g. "2026-W42"
+    week: str
+    applied: int = 0
+    generated: int = 0
+    won: int = 0
+    lost: int = 0
+
+class OrgStats(BaseModel):
+    org_id: str
+    members: int = 0
+    applied: int = 0
+    generated: int = 0
+    won: int = 0
+    lost: int = 0
+    # won / (won + lost); null until an outcome is recorded
+    win_rate: Optional[float] = None
+    weekly: List[WeeklyOrgStats] = []
+    updated_at: Optional[datetime] = None
@@ -0,0 +1,43 @@
+from datetime import datetime
+from typing import Optional, List, Literal
+from pydantic import BaseModel, Field
+from bson import ObjectId
+from .user import AnnotatedObjectId
+
+class ProposalCreate(BaseModel):
+    job_title: str = Field(..., min_length=2)
+    job_description: str = Field(..., min_length=10)
+    job_skills: List[str] = []
+    job_id: Optional[str] = None
+    client_name: Optional[str] = None
+    tone: Optional[str] = "professional"
+    # Set to false to always generate a fresh proposal instead of reusing a cached one
+    use_cache: bool = True
+
+class ProposalOutcome(BaseModel):
+    # null clears a previously recorded outcome
+    outcome: Optional[Literal["won", "lost"]] = None
+
+class ProposalJob(BaseModel):
+    id: str
+    status: str
+
+class ProposalInDB(ProposalCreate):
+    id: AnnotatedObjectId = Field(alias="_id")
+    user_id: str
+    org_id: Optional[str] = None
+    # queued -> running -> completed | failed
+    status: str = "queued"
+    content: Optional[str] = ""
+    error: Optional[str] = None
+    attempts: Optional[int] = 0
+    created_at: Optional[datetime] = None
+    started_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+    outcome: Optional[str] = None
+    outcome_at: Optional[datetime] = None
+
+    class Config:
+        populate_by_name = True
+        arbitrary_types_allowed = True
+        json_encoders = {ObjectId: str}
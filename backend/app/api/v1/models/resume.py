@@ -0,0 +1,21 @@
+from typing import List, Optional
+from pydantic import BaseModel
+from .user import AnnotatedObjectId, Education, Experience, Skill
+
+class ResumeParse(BaseModel):
+    file_id: AnnotatedObjectId
+    sha256: str
+    size: int
+    # pdf, docx or text
+    kind: str
+    pages: int = 1
+    # True when pages or text beyond the parser's limits were skipped
+    truncated: bool = False
+    # True when the same file was parsed before and the stored result was reused
+    cached: bool = False
+    education: List[Education] = []
+    experience: List[Experience] = []
+    skills: List[Skill] = []
+    # Sections written to the profile with apply=true, and the profile's new version
+    applied: List[str] = []
+    version: Optional[int] = None
@@ -1,5 +1,6 @@
-from typing import Optional, Any, List
-from pydantic import BaseModel, EmailStr, Field, BeforeValidator
+from enum import Enum
+from typing import Optional, Any, List, Literal
+from pydantic import BaseModel, EmailStr, Field, BeforeValidator, model_validator
 from pydantic_core import core_schema
 from typing_extensions import Annotated
 from bson import ObjectId
@@ -37,8 +38,10 @@ AnnotatedObjectId = Annotated[str, BeforeValidator(str)]
 class PasswordChange(BaseModel):
     new_password: str = Field(..., min_length=8)
 
-# Models for the nested arrays
+# Models for the nested arrays. Every stored entry carries a server-assigned
+# item_id so it can be updated or removed on its own.
 class Education(BaseModel):
+    item_id: Optional[str] = None
     school_name: str
     degree: str
     field_of_study: str
@@ -46,6 +49,7 @@ class Education(BaseModel):
     end_date: Optional[str] = None
 
 class Experience(BaseModel):
+    item_id: Optional[str] = None
     company_name: str
     job_title: str
     start_date: str
@@ -53,6 +57,7 @@ class Experience(BaseModel):
     is_current: Optional[bool] = False
 
 class Project(BaseModel):
+    item_id: Optional[str] = None
     project_title: str
     description: Optional[str] = None
 
@@ -66,10 +71,55 @@ class Profile(BaseModel):
     portfolio_url: Optional[str] = None
 
 class Skill(BaseModel):
+    item_id: Optional[str] = None
     skill_name: str
     endorsements: Optional[int] = 0
     proficiency: Optional[str] = None
 
+# Partial updates of a single array entry; only the fields sent are changed
+class EducationUpdate(BaseModel):
+    school_name: Optional[str] = None
+    degree: Optional[str] = None
+    field_of_study: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+
+class ExperienceUpdate(BaseModel):
+    company_name: Optional[str] = None
+    job_title: Optional[str] = None
+    start_date: Optional[str] = None
+    end_date: Optional[str] = None
+    is_current: Optional[bool] = None
+
+class ProjectUpdate(BaseModel):
+    project_title: Optional[str] = None
+    description: Optional[str] = None
+
+class SkillUpdate(BaseModel):
+    skill_name: Optional[str] = None
+    endorsements: Optional[int] = None
+    proficiency: Optional[str] = None
+
+class ProfileSection(str, Enum):
+    education = "education"
+    experience = "experience"
+    projects = "projects"
+    skills = "skills"
+
+# Model used to create and to partially update entries of each profile array
+PROFILE_SECTION_MODELS = {
+    ProfileSection.education: (Education, EducationUpdate),
+    ProfileSection.experience: (Experience, ExperienceUpdate),
+    ProfileSection.projects: (Project, ProjectUpdate),
+    ProfileSection.skills: (Skill, SkillUpdate),
+}
+
+# Result of an item-level profile edit: the entry as stored (None after a
+# removal) and the user's new version
+class ProfileItemResult(BaseModel):
+    item: Optional[dict] = None
+    version: int
+
 # Main User Models
 class UserBase(BaseModel):
     email: EmailStr
@@ -109,8 +159,44 @@ class UserInDB(UserBase):
     projects: Optional[List[dict]] = None
     skills: Optional[List[dict]] = None
     is_deleted: Optional[bool] = False
+    # Bumped on every write so caches can tell stale copies apart
+    version: Optional[int] = 0
 
     class Config:
         populate_by_name = True
         arbitrary_types_allowed = True
-        json_encoders = {ObjectId: str}
\ No newline at end of file
+        json_encoders = {ObjectId: str}
+
+# Slim view of a user returned by organization member listings
+class MemberSummary(BaseModel):
+    id: AnnotatedObjectId = Field(alias="_id")
+    email: EmailStr
+    first_name: Optional[str] = None
+    last_name: Optional[str] = None
+    role: Optional[str] = "freelancer"
+    is_active: Optional[bool] = True
+
+    class Config:
+        populate_by_name = True
+
+class MemberPage(BaseModel):
+    items: List[MemberSummary]
+    next_cursor: Optional[str] = None
+
+# Role of the users allowed to run bulk imports for their organization. It is
+# granted directly in the database; PATCH /me cannot grant it.
+ORG_ADMIN_ROLE = "org_admin"
+
+# One line of a bulk user import. Either a plain password (hashed on import) or a
+# bcrypt hash carried over from another system must be given. Imports only
+# create freelancers, so an importer cannot hand out other roles.
+class UserImport(UserBase):
+    password: Optional[str] = Field(None, min_length=8)
+    password_hash: Optional[str] = Field(None, pattern=r"^\$2[aby]\$\d{2}\$[./A-Za-z0-9]{53}$")
+    role: Literal["freelancer"] = "freelancer"
+
+    @model_validator(mode="after")
+    def check_credentials(self):
+        if (self.password is None) == (self.password_hash is None):
+            raise ValueError("Exactly one of password or password_hash is required")
+        return self
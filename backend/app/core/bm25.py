@@ -0,0 +1,126 @@
+# backend/app/core/bm25.py
+
+"""
+In-process BM25 keyword index.
+
+Postings map each term to the documents containing it and their term counts,
+so a query only touches the postings of its own terms. Documents are added,
+replaced and removed one at a time; collection statistics (document count and
+average length) are kept as running totals, so updates never rebuild the index.
+Each document can belong to an owner, and searches can be limited to one owner
+while still scoring with the statistics of the whole index.
+"""
+
+import hashlib
+import math
+import re
+from collections import Counter
+from typing import Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+# Keeps tech-stack terms intact: "c++", "c#", "node.js", "k8s"
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#]*(?:\.[a-z0-9]+)*")
+STOPWORDS = frozenset(
+    "a an and are as at be by for from has have in is it its of on or that the to was were will with "
+    "i we you our my your this these those".split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    return [token for token in _TOKEN_RE.findall((text or "").lower()) if token not in STOPWORDS]
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an incrementally maintained inverted index.
+    ``k1`` controls term-frequency saturation and ``b`` length normalization.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, int]] = {}
+        self._terms: Dict[str, Counter] = {}
+        self._lengths: Dict[str, int] = {}
+        self._hashes: Dict[str, str] = {}
+        self._owner_of: Dict[str, Optional[str]] = {}
+        self._docs_by_owner: Dict[Optional[str], Set[str]] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._lengths)
+
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._lengths
+
+    def upsert(self, doc_id: str, text: str, owner: Optional[str] = None) -> bool:
+        """Indexes ``text`` under ``doc_id``; returns False if it was already indexed unchanged."""
+        digest = hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+        if self._hashes.get(doc_id) == digest and self._owner_of.get(doc_id) == owner:
+            return False
+        self.remove(doc_id)
+
+        terms = Counter(tokenize(text))
+        for term, count in terms.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        length = sum(terms.values())
+        self._terms[doc_id] = terms
+        self._lengths[doc_id] = length
+        self._hashes[doc_id] = digest
+        self._owner_of[doc_id] = owner
+        self._docs_by_owner.setdefault(owner, set()).add(doc_id)
+        self._total_length += length
+        return True
+
+    def remove(self, doc_id: str) -> bool:
+        terms = self._terms.pop(doc_id, None)
+        if terms is None:
+            return False
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._lengths.pop(doc_id)
+        del self._hashes[doc_id]
+        owner = self._owner_of.pop(doc_id)
+        owned = self._docs_by_owner[owner]
+        owned.discard(doc_id)
+        if not owned:
+            del self._docs_by_owner[owner]
+        return True
+
+    def sync_owner(self, owner: str, documents: Mapping[str, str]) -> int:
+        """
+        Makes ``owner``'s documents exactly ``documents`` (id to text): changed
+        ones are re-indexed and missing ones removed. Returns the number of
+        documents written or removed, which is zero when nothing changed.
+        """
+        changed = 0
+        for doc_id in self._docs_by_owner.get(owner, set()) - documents.keys():
+            changed += self.remove(doc_id)
+        for doc_id, text in documents.items():
+            changed += self.upsert(doc_id, text, owner)
+        return changed
+
+    def search(self, query: str, top_k: int = 10, owner: Optional[str] = None) -> List[Tuple[str, float]]:
+        """The ``top_k`` best matching ``(doc_id, score)`` pairs, best first."""
+        if not self._lengths:
+            return []
+        count = len(self._lengths)
+        average_length = self._total_length / count or 1.0
+        allowed = self._docs_by_owner.get(owner, set()) if owner is not None else None
+        scores: Dict[str, float] = {}
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1.0 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            candidates: Iterable[str] = postings if allowed is None or len(allowed) > len(postings) else allowed
+            for doc_id in candidates:
+                frequency = postings.get(doc_id)
+                if frequency is None or (allowed is not None and doc_id not in allowed):
+                    continue
+                norm = self.k1 * (1.0 - self.b + self.b * self._lengths[doc_id] / average_length)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * frequency * (self.k1 + 1.0) / (frequency + norm)
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+        return ranked[:top_k]
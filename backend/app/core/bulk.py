@@ -0,0 +1,172 @@
+# backend/app/core/bulk.py
+
+"""
+Streaming NDJSON bulk imports.
+
+The upload is split into lines as the body arrives and each line is validated
+with the target Pydantic model, so memory stays bounded by one batch whatever
+the upload size; lines and whole uploads have byte limits. Valid records are turned into documents and written with
+``insert_many(ordered=False)``: one round trip per batch, and a duplicate key
+fails only its own record instead of the rest of the batch.
+"""
+
+from typing import AsyncIterator, Awaitable, Callable, List, Optional, Tuple, Type
+
+from bson import ObjectId
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+
+from .config import settings
+
+DUPLICATE_KEY_ERROR = 11000
+
+
+class UploadTooLarge(Exception):
+    """Raised by ``iter_ndjson_lines`` once the upload passes its byte limit."""
+
+    def __init__(self, line: int, max_bytes: int):
+        super().__init__(f"Upload is larger than {max_bytes} bytes; the rest was not read")
+        self.line = line
+
+
+async def iter_ndjson_lines(chunks: AsyncIterator[bytes], max_line_bytes: int,
+                            max_bytes: int) -> AsyncIterator[Tuple[int, Optional[bytes]]]:
+    """
+    Yields ``(line_number, line)`` for every non-blank line of an NDJSON byte
+    stream. Line numbers are 1-based and count blank lines. A line longer than
+    ``max_line_bytes`` is yielded as ``None`` without being buffered; past
+    ``max_bytes`` in total, ``UploadTooLarge`` is raised.
+    """
+    # Only the unfinished last line is kept between chunks
+    tail = bytearray()
+    overlong = False
+    line_no = 0
+    size = 0
+    async for chunk in chunks:
+        size += len(chunk)
+        if size > max_bytes:
+            raise UploadTooLarge(line_no + 1, max_bytes)
+        start = 0
+        while True:
+            end = chunk.find(b"\n", start)
+            if end < 0:
+                if not overlong:
+                    tail += chunk[start:]
+                    if len(tail) > max_line_bytes:
+                        overlong = True
+                        tail.clear()
+                break
+            line_no += 1
+            if overlong:
+                yield line_no, None
+            else:
+                line = bytes(tail) + chunk[start:end] if tail else chunk[start:end]
+                if len(line) > max_line_bytes:
+                    yield line_no, None
+                elif line.strip():
+                    yield line_no, line
+            tail.clear()
+            overlong = False
+            start = end + 1
+    if overlong:
+        yield line_no + 1, None
+    elif tail.strip():
+        yield line_no + 1, bytes(tail)
+
+
+def _describe(exc: ValidationError) -> str:
+    messages = []
+    for error in exc.errors():
+        location = ".".join(str(part) for part in error["loc"])
+        messages.append(f"{location}: {error['msg']}" if location else error["msg"])
+    return "; ".join(messages)
+
+
+def _describe_write_error(error: dict) -> str:
+    if error.get("code") == DUPLICATE_KEY_ERROR and error.get("keyValue"):
+        fields = ", ".join(f"{key}={value!r}" for key, value in error["keyValue"].items())
+        return f"Duplicate key: {fields}"
+    return error.get("errmsg", "Write failed")
+
+
+class BulkImporter:
+    """
+    Validates and inserts one NDJSON upload, recording an outcome per line.
+
+    ``build_documents`` receives each batch of validated records and returns the
+    documents to insert, in the same order; it is where batch-wide work such as
+    password hashing happens.
+    """
+
+    def __init__(self, collection, model: Type[BaseModel],
+                 build_documents: Callable[[List[BaseModel]], Awaitable[List[dict]]],
+                 batch_size: Optional[int] = None, max_records: Optional[int] = None,
+                 max_line_bytes: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.collection = collection
+        self.model = model
+        self.build_documents = build_documents
+        self.batch_size = batch_size or settings.BULK_IMPORT_BATCH_SIZE
+        self.max_records = max_records or settings.BULK_IMPORT_MAX_RECORDS
+        self.max_line_bytes = max_line_bytes or settings.BULK_IMPORT_MAX_LINE_BYTES
+        self.max_bytes = max_bytes or settings.BULK_IMPORT_MAX_BYTES
+        self.total = 0
+        self.inserted = 0
+        self.results: List[dict] = []
+
+    def _record(self, line: int, status: str, id: Optional[str] = None, error: Optional[str] = None):
+        self.results.append({"line": line, "status": status, "id": id, "error": error})
+
+    async def _flush(self, batch: List[Tuple[int, BaseModel]]):
+        documents = await self.build_documents([record for _, record in batch])
+        for document in documents:
+            document.setdefault("_id", ObjectId())
+
+        failures = {}
+        try:
+            await self.collection.insert_many(documents, ordered=False)
+        except BulkWriteError as exc:
+            failures = {error["index"]: error for error in exc.details.get("writeErrors", [])}
+
+        for index, ((line, _), document) in enumerate(zip(batch, documents)):
+            error = failures.get(index)
+            if error is None:
+                self.inserted += 1
+                self._record(line, "inserted", id=str(document["_id"]))
+            elif error.get("code") == DUPLICATE_KEY_ERROR:
+                self._record(line, "duplicate", error=_describe_write_error(error))
+            else:
+                self._record(line, "failed", error=_describe_write_error(error))
+
+    async def run(self, chunks: AsyncIterator[bytes]) -> dict:
+        batch: List[Tuple[int, BaseModel]] = []
+        try:
+            async for line, raw in iter_ndjson_lines(chunks, self.max_line_bytes, self.max_bytes):
+                self.total += 1
+                if self.total > self.max_records:
+                    self._record(line, "failed", error=f"Import is limited to {self.max_records} records")
+                    continue
+                if raw is None:
+                    self._record(line, "invalid", error=f"Line is longer than {self.max_line_bytes} bytes")
+                    continue
+                try:
+                    batch.append((line, self.model.model_validate_json(raw)))
+                except ValidationError as exc:
+                    self._record(line, "invalid", error=_describe(exc))
+                    continue
+                if len(batch) >= self.batch_size:
+                    await self._flush(batch)
+                    batch = []
+        except UploadTooLarge as exc:
+            # Batches already written stay written, so the report still covers them
+            self.total += 1
+            self._record(exc.line, "failed", error=str(exc))
+        if batch:
+            await self._flush(batch)
+
+        self.results.sort(key=lambda result: result["line"])
+        return {
+            "total": self.total,
+            "inserted": self.inserted,
+            "failed": self.total - self.inserted,
+            "results": self.results,
+        }
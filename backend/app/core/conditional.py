@@ -0,0 +1,59 @@
+# backend/app/core/conditional.py
+
+"""
+Conditional GET for versioned documents.
+
+Documents that carry a ``version`` field bumped by every write get the strong
+ETag ``"<version>"``, the same form ``If-Match`` accepts on profile writes. A
+request whose ``If-None-Match`` lists the current tag gets an empty 304. Other
+requests are served from ``response_cache``, a per-process LRU of rendered
+bodies keyed by resource and version: since any change bumps the version, a
+cached body never needs invalidating, it just stops being asked for.
+"""
+
+from typing import Callable, Hashable, Optional
+
+from fastapi import Response, status
+
+from .cache import TTLCache
+from .config import settings
+from .metrics import stats_collector
+
+response_cache = TTLCache(maxsize=settings.RESPONSE_CACHE_SIZE, ttl=settings.RESPONSE_CACHE_TTL_SECONDS)
+stats_collector("response_cache", "Rendered response bodies keyed by document version", response_cache.stats)
+
+
+def etag(version: Optional[int]) -> str:
+    return f'"{version or 0}"'
+
+
+def etag_matches(if_none_match: Optional[str], tag: str) -> bool:
+    """Weak comparison of ``tag`` against an If-None-Match header, as RFC 9110 requires."""
+    if not if_none_match:
+        return False
+    candidates = [candidate.strip() for candidate in if_none_match.split(",")]
+    return "*" in candidates or tag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+def conditional_response(
+    if_none_match: Optional[str],
+    key: Hashable,
+    version: Optional[int],
+    render: Callable[[], bytes],
+    headers: Optional[dict] = None,
+) -> Response:
+    """
+    304 when the client already has ``version``, else the body for ``(key,
+    version)`` from the cache, calling ``render`` only on a miss.
+    """
+    tag = etag(version)
+    headers = {"ETag": tag, **(headers or {})}
+    if etag_matches(if_none_match, tag):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    cache_key = (key, version or 0)
+    body = response_cache.get(cache_key)
+    if body is None:
+        body = render()
+        response_cache.set(cache_key, body)
+    return Response(body, headers=headers, media_type="application/json")
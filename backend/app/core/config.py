@@ -13,6 +13,143 @@ class Settings(BaseSettings):
     MONGO_URI: str = os.getenv("MONGO_URI", "mongodb://localhost:27017/ai_proposal_agent_db")
     SECRET_KEY: str = os.getenv("SECRET_KEY", "2c06faae23cf6b334fcb985e8e743d1bb9aa51fc61fdc20d7274f77986e5520a")
 
+    # Password hashing executor: "thread" (bcrypt releases the GIL) or "process"
+    PASSWORD_HASH_EXECUTOR: str = os.getenv("PASSWORD_HASH_EXECUTOR", "thread")
+    PASSWORD_HASH_WORKERS: int = int(os.getenv("PASSWORD_HASH_WORKERS", 4))
+    PASSWORD_HASH_QUEUE_SIZE: int = int(os.getenv("PASSWORD_HASH_QUEUE_SIZE", 64))
+
+    # Per-process cache of authenticated users, keyed by token subject
+    PRINCIPAL_CACHE_SIZE: int = int(os.getenv("PRINCIPAL_CACHE_SIZE", 10000))
+    PRINCIPAL_CACHE_TTL_SECONDS: int = int(os.getenv("PRINCIPAL_CACHE_TTL_SECONDS", 60))
+    # How long a cached user is trusted before its stored version is read again;
+    # bounds how long another worker's soft-delete or role change goes unseen
+    PRINCIPAL_CACHE_REVALIDATE_SECONDS: float = float(os.getenv("PRINCIPAL_CACHE_REVALIDATE_SECONDS", 5))
+
+    # Vector store: "milvus" (docker-compose service) or "local" (in-process NumPy)
+    VECTOR_STORE_BACKEND: str = os.getenv("VECTOR_STORE_BACKEND", "milvus")
+    LOCAL_VECTOR_PATH: str = os.getenv("LOCAL_VECTOR_PATH", "")
+    EMBEDDING_DIM: int = int(os.getenv("EMBEDDING_DIM", 1536))
+    MILVUS_URI: str = os.getenv("MILVUS_URI", "http://localhost:19530")
+    MILVUS_TOKEN: str = os.getenv("MILVUS_TOKEN", "")
+    MILVUS_INDEX_TYPE: str = os.getenv("MILVUS_INDEX_TYPE", "HNSW")
+    MILVUS_SEARCH_EF: int = int(os.getenv("MILVUS_SEARCH_EF", 64))
+    MILVUS_SEARCH_NPROBE: int = int(os.getenv("MILVUS_SEARCH_NPROBE", 16))
+    VECTOR_UPSERT_BATCH_SIZE: int = int(os.getenv("VECTOR_UPSERT_BATCH_SIZE", 512))
+    PROJECT_VECTOR_COLLECTION: str = os.getenv("PROJECT_VECTOR_COLLECTION", "freelancer_projects")
+
+    # Embeddings: "openai" or "fake" (deterministic, offline)
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "openai")
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "text-embedding-3-small")
+    EMBEDDING_CACHE_ENABLED: bool = os.getenv("EMBEDDING_CACHE_ENABLED", "true").lower() == "true"
+    EMBEDDING_CACHE_MEMORY_ITEMS: int = int(os.getenv("EMBEDDING_CACHE_MEMORY_ITEMS", 50000))
+    # Empty disables the on-disk tier
+    EMBEDDING_CACHE_PATH: str = os.getenv("EMBEDDING_CACHE_PATH", "data/embedding_cache.sqlite3")
+    EMBEDDING_CACHE_MAX_BYTES: int = int(os.getenv("EMBEDDING_CACHE_MAX_BYTES", 1024 ** 3))
+
+    # Job-to-freelancer matching
+    MATCH_EMBEDDING_DIM: int = int(os.getenv("MATCH_EMBEDDING_DIM", 128))
+    MATCH_SKILL_WEIGHT: float = float(os.getenv("MATCH_SKILL_WEIGHT", 0.3))
+
+    # LLM: "openai" or "fake" (offline, configurable latency)
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "openai")
+    LLM_MODEL: str = os.getenv("LLM_MODEL", "gpt-4o-mini")
+    FAKE_LLM_FIRST_TOKEN_LATENCY: float = float(os.getenv("FAKE_LLM_FIRST_TOKEN_LATENCY", 0.2))
+    FAKE_LLM_TOKEN_LATENCY: float = float(os.getenv("FAKE_LLM_TOKEN_LATENCY", 0.01))
+
+    # Completion cache: exact prompt matches, plus optional per-tenant semantic matches
+    LLM_CACHE_ENABLED: bool = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+    LLM_CACHE_SIZE: int = int(os.getenv("LLM_CACHE_SIZE", 5000))
+    LLM_CACHE_TTL_SECONDS: int = int(os.getenv("LLM_CACHE_TTL_SECONDS", 24 * 3600))
+    LLM_SEMANTIC_CACHE_ENABLED: bool = os.getenv("LLM_SEMANTIC_CACHE_ENABLED", "false").lower() == "true"
+    LLM_SEMANTIC_CACHE_THRESHOLD: float = float(os.getenv("LLM_SEMANTIC_CACHE_THRESHOLD", 0.95))
+    # Scopes (organization, freelancer, profile version) holding semantic vectors
+    LLM_SEMANTIC_CACHE_MAX_SCOPES: int = int(os.getenv("LLM_SEMANTIC_CACHE_MAX_SCOPES", 1000))
+
+    # Proposal prompts: the freelancer part is assembled from a precomputed profile
+    # digest within a token budget. "regex" counts tokens offline; "tiktoken" needs
+    # the optional tiktoken package and its encoding files
+    PROMPT_TOKENIZER: str = os.getenv("PROMPT_TOKENIZER", "regex")
+    PROMPT_PROFILE_TOKEN_BUDGET: int = int(os.getenv("PROMPT_PROFILE_TOKEN_BUDGET", 600))
+    PROFILE_DIGEST_MAX_SKILLS: int = int(os.getenv("PROFILE_DIGEST_MAX_SKILLS", 15))
+    PROFILE_DIGEST_BIO_TOKENS: int = int(os.getenv("PROFILE_DIGEST_BIO_TOKENS", 160))
+
+    # Proposal context retrieval: BM25 and vector search over the freelancer's past
+    # work, fused by reciprocal rank; legs still running after the budget are dropped
+    RETRIEVAL_ENABLED: bool = os.getenv("RETRIEVAL_ENABLED", "true").lower() == "true"
+    RETRIEVAL_TOP_K: int = int(os.getenv("RETRIEVAL_TOP_K", 5))
+    RETRIEVAL_BUDGET_MS: int = int(os.getenv("RETRIEVAL_BUDGET_MS", 150))
+    RETRIEVAL_RRF_K: int = int(os.getenv("RETRIEVAL_RRF_K", 60))
+    # Vector hits fetched per ranked item, as an item can be stored in several chunks
+    RETRIEVAL_VECTOR_OVERSAMPLE: int = int(os.getenv("RETRIEVAL_VECTOR_OVERSAMPLE", 3))
+    RETRIEVAL_MAX_INDEXES: int = int(os.getenv("RETRIEVAL_MAX_INDEXES", 1000))
+
+    # Proposal generation queue: "mongo" (durable, multi-process) or "local" (in-process)
+    PROPOSAL_QUEUE_BACKEND: str = os.getenv("PROPOSAL_QUEUE_BACKEND", "mongo")
+    PROPOSAL_RUN_WORKERS_IN_API: bool = os.getenv("PROPOSAL_RUN_WORKERS_IN_API", "true").lower() == "true"
+    PROPOSAL_WORKER_CONCURRENCY: int = int(os.getenv("PROPOSAL_WORKER_CONCURRENCY", 8))
+    # Jobs of one organization generating at once in each process, not deployment-wide
+    PROPOSAL_ORG_CONCURRENCY: int = int(os.getenv("PROPOSAL_ORG_CONCURRENCY", 2))
+    PROPOSAL_MAX_QUEUED_PER_ORG: int = int(os.getenv("PROPOSAL_MAX_QUEUED_PER_ORG", 50))
+    PROPOSAL_LOCAL_QUEUE_SIZE: int = int(os.getenv("PROPOSAL_LOCAL_QUEUE_SIZE", 1000))
+    PROPOSAL_LEASE_SECONDS: int = int(os.getenv("PROPOSAL_LEASE_SECONDS", 120))
+    PROPOSAL_POLL_INTERVAL: float = float(os.getenv("PROPOSAL_POLL_INTERVAL", 0.5))
+    PROPOSAL_FLUSH_INTERVAL: float = float(os.getenv("PROPOSAL_FLUSH_INTERVAL", 0.5))
+
+    # Load shedding: requests are admitted per cost class (password, bulk, generate,
+    # default) up to its concurrency limit, the rest wait in a short bounded queue.
+    # Once a class's queue has not drained for SHED_INTERVAL_MS, new arrivals may
+    # only wait SHED_TARGET_MS and are rejected up front if they would wait longer
+    SHED_ENABLED: bool = os.getenv("SHED_ENABLED", "true").lower() == "true"
+    SHED_TARGET_MS: int = int(os.getenv("SHED_TARGET_MS", 50))
+    SHED_INTERVAL_MS: int = int(os.getenv("SHED_INTERVAL_MS", 500))
+    # bcrypt threads compete with the event loop for CPU, so by default logins may
+    # use half the cores
+    SHED_PASSWORD_CONCURRENCY: int = int(os.getenv("SHED_PASSWORD_CONCURRENCY", max(1, (os.cpu_count() or 2) // 2)))
+    SHED_PASSWORD_QUEUE: int = int(os.getenv("SHED_PASSWORD_QUEUE", 32))
+    SHED_BULK_CONCURRENCY: int = int(os.getenv("SHED_BULK_CONCURRENCY", 2))
+    SHED_BULK_QUEUE: int = int(os.getenv("SHED_BULK_QUEUE", 4))
+    # Uploads hold a slot for seconds, so waits are judged on that scale: with the
+    # global target an arrival would be rejected before its queue could be used
+    SHED_BULK_TARGET_MS: int = int(os.getenv("SHED_BULK_TARGET_MS", 5000))
+    SHED_BULK_INTERVAL_MS: int = int(os.getenv("SHED_BULK_INTERVAL_MS", 30000))
+    SHED_GENERATE_CONCURRENCY: int = int(os.getenv("SHED_GENERATE_CONCURRENCY", 16))
+    SHED_GENERATE_QUEUE: int = int(os.getenv("SHED_GENERATE_QUEUE", 64))
+    SHED_DEFAULT_CONCURRENCY: int = int(os.getenv("SHED_DEFAULT_CONCURRENCY", 256))
+    SHED_DEFAULT_QUEUE: int = int(os.getenv("SHED_DEFAULT_QUEUE", 512))
+
+    # Request, MongoDB and span metrics served on /metrics in Prometheus format
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+
+    # Comma-separated components loaded at worker startup instead of on first use
+    # (password, embedder, matcher, llm, vectors, resume); see app/lifespan.py
+    WARMUP: str = os.getenv("WARMUP", "")
+
+    # Job search: per-process cache of rendered result pages, cleared when jobs are
+    # inserted, and the number of matches facet counts are computed over
+    JOB_SEARCH_CACHE_SIZE: int = int(os.getenv("JOB_SEARCH_CACHE_SIZE", 2000))
+    JOB_SEARCH_CACHE_TTL_SECONDS: int = int(os.getenv("JOB_SEARCH_CACHE_TTL_SECONDS", 30))
+    JOB_SEARCH_FACET_SCAN_LIMIT: int = int(os.getenv("JOB_SEARCH_FACET_SCAN_LIMIT", 10000))
+
+    # Rendered bodies of versioned documents (GET /users/me, GET /organizations/{id}),
+    # keyed by document version; see app/core/conditional.py
+    RESPONSE_CACHE_SIZE: int = int(os.getenv("RESPONSE_CACHE_SIZE", 10000))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", 3600))
+
+    # Resume uploads: streamed to GridFS and parsed in a process pool; parses beyond
+    # workers + queue are rejected with 503, and each document gets a time limit
+    RESUME_MAX_BYTES: int = int(os.getenv("RESUME_MAX_BYTES", 10 * 1024 * 1024))
+    RESUME_PARSE_WORKERS: int = int(os.getenv("RESUME_PARSE_WORKERS", 2))
+    RESUME_PARSE_QUEUE_SIZE: int = int(os.getenv("RESUME_PARSE_QUEUE_SIZE", 8))
+    RESUME_PARSE_TIMEOUT_SECONDS: float = float(os.getenv("RESUME_PARSE_TIMEOUT_SECONDS", 20))
+    RESUME_MAX_PAGES: int = int(os.getenv("RESUME_MAX_PAGES", 30))
+
+    # NDJSON bulk imports: records per insert_many batch and per upload, bytes per
+    # line and per upload
+    BULK_IMPORT_BATCH_SIZE: int = int(os.getenv("BULK_IMPORT_BATCH_SIZE", 1000))
+    BULK_IMPORT_MAX_RECORDS: int = int(os.getenv("BULK_IMPORT_MAX_RECORDS", 50000))
+    BULK_IMPORT_MAX_LINE_BYTES: int = int(os.getenv("BULK_IMPORT_MAX_LINE_BYTES", 64 * 1024))
+    BULK_IMPORT_MAX_BYTES: int = int(os.getenv("BULK_IMPORT_MAX_BYTES", 100 * 1024 ** 2))
+
     class Config:
         case_sensitive = True
 
@@ -1,10 +1,15 @@
 # backend/app/core/database.py
 
-from motor.motor_asyncio import AsyncIOMotorClient
-from pymongo import ASCENDING, TEXT
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
 from .config import settings
+from .indexes import apply_indexes
+from .metrics import MongoCommandTimer
 
-client = AsyncIOMotorClient(settings.MONGO_URI)
+# Command timing is attached per client, so it costs nothing when metrics are off
+client = AsyncIOMotorClient(
+    settings.MONGO_URI,
+    event_listeners=[MongoCommandTimer()] if settings.METRICS_ENABLED else [],
+)
 db = client.get_database()
 
 # Database collections
@@ -12,15 +17,16 @@ users_collection = db.users
 organizations_collection = db.organizations
 jobs_collection = db.jobs
 proposals_collection = db.proposals
+# Parsed resumes keyed by the SHA-256 of the uploaded file
 resumes_collection = db.resumes
+# Uploaded resume files (resume_files.files and resume_files.chunks)
+resume_files = AsyncIOMotorGridFSBucket(db, bucket_name="resume_files")
+# Materialized dashboard counters, one document per organization
+org_stats_collection = db.org_stats
 
-# Create unique index for the 'users' collection
 async def create_db_indexes():
     """
     Creates necessary indexes on application startup.
     """
-    await users_collection.create_index(
-        [("email", ASCENDING)],
-        unique=True
-    )
+    await apply_indexes(db)
     print("MongoDB indexes created successfully.")
\ No newline at end of file
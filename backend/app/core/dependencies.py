@@ -1,15 +1,36 @@
 # backend/app/api/v1/dependencies.py
 
+import time
+
 from fastapi import HTTPException, status, Depends
 from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError
-from .security import decode_access_token
+from .cache import TTLCache
+from .config import settings
+from .security import decode_access_token, ACCESS_TOKEN_EXPIRE_MINUTES
 from .database import users_collection
-from ..api.v1.models.user import UserInDB
+from .metrics import span, stats_collector
+from ..api.v1.models.user import ORG_ADMIN_ROLE, UserInDB
 from pydantic import ValidationError
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/endpoints/users/login")
 
+# (authenticated user, monotonic time its version was last confirmed) keyed by
+# token subject (email). Entries never outlive a token.
+principal_cache = TTLCache(
+    maxsize=settings.PRINCIPAL_CACHE_SIZE,
+    ttl=min(settings.PRINCIPAL_CACHE_TTL_SECONDS, ACCESS_TOKEN_EXPIRE_MINUTES * 60),
+)
+
+stats_collector("principal_cache", "Principal cache", principal_cache.stats)
+
+def invalidate_principal(email: str):
+    """
+    Drops a cached user so the next request re-reads it from MongoDB.
+    Call this from every write path that changes the user document.
+    """
+    principal_cache.pop(email)
+
 async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -18,7 +39,8 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
     )
     
     try:
-        payload = decode_access_token(token)
+        with span("auth.jwt_decode"):
+            payload = decode_access_token(token)
         if payload is None:
             raise credentials_exception
         
@@ -29,8 +51,44 @@ async def get_current_user(token: str = Depends(oauth2_scheme)) -> UserInDB:
     except (JWTError, ValidationError):
         raise credentials_exception
 
-    user_in_db = await users_collection.find_one({"email": user_email})
+    # A token minted after a change made on another worker carries a newer
+    # version than our cached copy; treat that as a miss. Changes that mint no
+    # token (a soft-delete, a role change) are caught by re-checking the stored
+    # version once the entry is older than PRINCIPAL_CACHE_REVALIDATE_SECONDS.
+    cached = principal_cache.get(user_email, count=False)
+    if cached is not None:
+        cached_user, checked_at = cached
+        if (cached_user.version or 0) < payload.get("ver", 0):
+            cached = None
+        elif time.monotonic() - checked_at >= settings.PRINCIPAL_CACHE_REVALIDATE_SECONDS:
+            with span("auth.user_version"):
+                current = await users_collection.find_one({"email": user_email}, {"version": 1, "_id": 0})
+            if current is None or (current.get("version") or 0) != (cached_user.version or 0):
+                cached = None
+            else:
+                principal_cache.set(user_email, (cached_user, time.monotonic()))
+    if cached is not None:
+        principal_cache.hits += 1
+        # Handed out as a copy so no request can change what the next one sees
+        return cached[0].model_copy(deep=True)
+    principal_cache.misses += 1
+
+    with span("auth.user_lookup"):
+        # The profile digest is only read by proposal workers
+        user_in_db = await users_collection.find_one({"email": user_email}, {"profile_digest": 0})
     if user_in_db is None:
         raise credentials_exception
     
-    return UserInDB.model_validate(user_in_db)
\ No newline at end of file
+    with span("auth.user_validate"):
+        user = UserInDB.model_validate(user_in_db)
+    principal_cache.set(user_email, (user, time.monotonic()))
+    return user.model_copy(deep=True)
+
+async def get_org_admin(current_user: UserInDB = Depends(get_current_user)) -> UserInDB:
+    """The current user, if they administer an organization; bulk imports require one."""
+    if not current_user.org_id or current_user.role != ORG_ADMIN_ROLE:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="This requires an organization administrator"
+        )
+    return current_user
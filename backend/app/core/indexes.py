@@ -0,0 +1,225 @@
+# backend/app/core/indexes.py
+
+"""
+Declarative index registry and the query shapes the endpoints rely on.
+
+Every index the application needs is listed in ``INDEXES`` and created by
+``apply_indexes`` at startup, which fails if a unique index cannot be built
+(``scripts/dedupe_unique_fields.py`` resolves the duplicates that block one).
+``QUERY_SHAPES`` records each distinct query the
+endpoints issue so ``scripts/check_query_plans.py`` can verify that none of them
+falls back to a collection scan.
+"""
+
+import logging
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from pymongo import ASCENDING, DESCENDING, TEXT, IndexModel
+from pymongo.errors import OperationFailure
+
+logger = logging.getLogger(__name__)
+
+# Users flagged with is_deleted: true never appear in these indexes
+ACTIVE_USERS = {"is_deleted": False}
+
+
+class IndexBuildError(RuntimeError):
+    """A unique index could not be built, so the uniqueness it guards is not enforced."""
+
+
+@dataclass(frozen=True)
+class IndexSpec:
+    name: str
+    keys: Tuple[Tuple[str, object], ...]
+    unique: bool = False
+    partial_filter: Optional[dict] = None
+    weights: Optional[dict] = None
+
+    def to_index_model(self) -> IndexModel:
+        options = {"name": self.name}
+        if self.unique:
+            options["unique"] = True
+        if self.partial_filter is not None:
+            options["partialFilterExpression"] = self.partial_filter
+        if self.weights is not None:
+            options["weights"] = self.weights
+        return IndexModel(list(self.keys), **options)
+
+
+@dataclass(frozen=True)
+class QueryShape:
+    name: str
+    collection: str
+    filter: dict
+    sort: Tuple[Tuple[str, int], ...] = ()
+    projection: Optional[dict] = None
+
+
+INDEXES: Dict[str, List[IndexSpec]] = {
+    "users": [
+        IndexSpec("email_1", (("email", ASCENDING),), unique=True),
+        IndexSpec("org_members", (("org_id", ASCENDING), ("_id", ASCENDING)), partial_filter=ACTIVE_USERS),
+    ],
+    "organizations": [
+        IndexSpec("name_1", (("name", ASCENDING),), unique=True),
+    ],
+    "jobs": [
+        IndexSpec(
+            "job_text",
+            (("title", TEXT), ("description", TEXT), ("skills", TEXT)),
+            weights={"title": 10, "skills": 5, "description": 1},
+        ),
+        IndexSpec("recent_jobs", (("created_at", DESCENDING), ("_id", DESCENDING))),
+        # Job search filtered by skill without a text query, newest first
+        IndexSpec("job_skills", (("skills", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING))),
+        # Re-importing the same post from another system is rejected per record
+        IndexSpec(
+            "job_external_id",
+            (("external_id", ASCENDING),),
+            unique=True,
+            partial_filter={"external_id": {"$type": "string"}},
+        ),
+    ],
+    "proposals": [
+        IndexSpec("user_proposals", (("user_id", ASCENDING), ("created_at", DESCENDING))),
+        IndexSpec("org_proposals", (("org_id", ASCENDING), ("created_at", DESCENDING))),
+        # Worker claims: oldest queued (or lease-expired) job first
+        IndexSpec("proposal_queue", (("status", ASCENDING), ("created_at", ASCENDING))),
+    ],
+    # Re-uploads of the same file by the same user reuse the stored copy
+    "resume_files.files": [
+        IndexSpec("resume_owner_hash", (("metadata.user_id", ASCENDING), ("metadata.sha256", ASCENDING))),
+    ],
+}
+
+
+QUERY_SHAPES: List[QueryShape] = [
+    QueryShape("users.by_email", "users", {"email": "someone@example.com"}),
+    QueryShape(
+        "users.org_members",
+        "users",
+        {"org_id": "0" * 24, "is_deleted": False, "_id": {"$gt": "0" * 24}},
+        sort=(("_id", ASCENDING),),
+        projection={"email": 1, "first_name": 1, "last_name": 1, "role": 1, "is_active": 1},
+    ),
+    QueryShape("organizations.by_name", "organizations", {"name": "Example Org"}),
+    QueryShape("organizations.by_id", "organizations", {"_id": "0" * 24}),
+    QueryShape(
+        "proposals.claim",
+        "proposals",
+        {"status": "queued", "queue_key": {"$nin": ["org:" + "0" * 24]}},
+        sort=(("created_at", ASCENDING),),
+    ),
+    QueryShape("proposals.queued_for_org", "proposals", {"queue_key": "org:" + "0" * 24, "status": "queued"}),
+    QueryShape("proposals.by_id", "proposals", {"_id": "0" * 24}),
+    QueryShape("org_stats.by_id", "org_stats", {"_id": "0" * 24}),
+    QueryShape("resumes.by_hash", "resumes", {"_id": "0" * 64, "parser_version": 1}),
+    QueryShape(
+        "resume_files.by_owner_hash",
+        "resume_files.files",
+        {"metadata.user_id": "0" * 24, "metadata.sha256": "0" * 64, "_id": {"$ne": "0" * 24}},
+    ),
+    QueryShape("jobs.recent", "jobs", {}, sort=(("created_at", DESCENDING), ("_id", DESCENDING))),
+    QueryShape(
+        "jobs.by_skill",
+        "jobs",
+        {"skills": {"$all": ["python"]}},
+        sort=(("created_at", DESCENDING), ("_id", DESCENDING)),
+    ),
+    QueryShape("jobs.text", "jobs", {"$text": {"$search": "python developer"}}),
+]
+
+
+async def apply_indexes(db, registry: Dict[str, List[IndexSpec]] = INDEXES):
+    """
+    Creates every index in ``registry``. Safe to run on every startup: MongoDB
+    treats re-creating an identical index as a no-op. An index whose name exists
+    with different options is logged and left alone rather than dropped.
+
+    A unique index that fails (usually because existing documents already
+    collide) raises ``IndexBuildError`` instead: the endpoints rely on it to
+    reject duplicates, so running without it would let them through silently.
+    """
+    for collection_name, specs in registry.items():
+        collection = db[collection_name]
+        for spec in specs:
+            try:
+                await collection.create_indexes([spec.to_index_model()])
+            except OperationFailure as exc:
+                if spec.unique:
+                    raise IndexBuildError(
+                        f"Unique index {collection_name}.{spec.name} could not be built: {exc}. "
+                        "Run scripts/dedupe_unique_fields.py to find and resolve the duplicates."
+                    ) from exc
+                logger.warning("Index %s.%s not applied: %s", collection_name, spec.name, exc)
+
+
+def _satisfies_partial(query_filter: dict, partial_filter: Optional[dict]) -> bool:
+    if not partial_filter:
+        return True
+    return all(query_filter.get(key) == value for key, value in partial_filter.items())
+
+
+def plan_query(shape: QueryShape, registry: Dict[str, List[IndexSpec]] = INDEXES) -> Tuple[str, Optional[str]]:
+    """
+    Offline stand-in for ``explain()``: returns ``("IXSCAN", index_name)`` if some
+    registered index can serve ``shape``, else ``("COLLSCAN", None)``.
+
+    Equality on ``_id`` uses the built-in ``_id`` index. Otherwise an index
+    qualifies when its leading key is constrained by the filter, or its keys
+    start with the sort (in either direction), and its partial filter is implied
+    by the query; ``$text`` queries need a text index.
+    """
+    query_filter = shape.filter
+    if "_id" in query_filter and not isinstance(query_filter["_id"], dict):
+        return "IDHACK", "_id_"
+
+    specs: Sequence[IndexSpec] = registry.get(shape.collection, [])
+    if "$text" in query_filter:
+        for spec in specs:
+            if any(direction == TEXT for _, direction in spec.keys):
+                return "TEXT", spec.name
+        return "COLLSCAN", None
+
+    for spec in specs:
+        if any(direction == TEXT for _, direction in spec.keys):
+            continue
+        leading_field = spec.keys[0][0]
+        if leading_field not in query_filter:
+            continue
+        if not _satisfies_partial(query_filter, spec.partial_filter):
+            continue
+        return "IXSCAN", spec.name
+
+    if shape.sort:
+        reverse = tuple((field, -direction) for field, direction in shape.sort)
+        for spec in specs:
+            if any(direction == TEXT for _, direction in spec.keys):
+                continue
+            if not _satisfies_partial(query_filter, spec.partial_filter):
+                continue
+            if spec.keys[:len(shape.sort)] in (shape.sort, reverse):
+                return "IXSCAN", spec.name
+
+    return "COLLSCAN", None
+
+
+def winning_stages(explain_output: dict) -> List[str]:
+    """
+    Flattens the stage names of the winning plan in an ``explain()`` result.
+    """
+    stages: List[str] = []
+
+    def walk(plan: dict):
+        if not isinstance(plan, dict):
+            return
+        if "stage" in plan:
+            stages.append(plan["stage"])
+        for key in ("inputStage", "queryPlan"):
+            walk(plan.get(key))
+        for child in plan.get("inputStages", []):
+            walk(child)
+
+    walk(explain_output.get("queryPlanner", {}).get("winningPlan", {}))
+    return stages
@@ -0,0 +1,271 @@
+# backend/app/core/load_shedding.py
+
+"""
+Per-route cost classes with concurrency limits and queue-time based shedding.
+
+Every request is put in a cost class by method and path (``ROUTE_CLASSES``):
+``password`` for bcrypt-bound routes, ``bulk`` for uploads, ``generate`` for
+proposal submission and ``default`` for everything else. A class serves at most
+its concurrency limit of requests at once; the rest wait in a FIFO queue of
+bounded length, and a finishing request hands its slot straight to the oldest
+waiter. Classes do not share slots, so a login storm fills the ``password``
+queue while ``GET /users/me`` keeps being admitted.
+
+How long a request may wait follows CoDel's idea of judging a queue by how long
+it stays non-empty rather than by its length. A class whose queue drained
+within the last ``SHED_INTERVAL_MS`` is absorbing a burst, and arrivals may wait
+up to that interval. A queue that has not drained for a whole interval is
+standing, and arrivals may only wait ``SHED_TARGET_MS``. An arrival is rejected
+at once if its estimated wait (queue position times the measured service time
+over the limit) is already longer than allowed, so shed requests cost almost
+nothing. A full queue answers 429; a wait that is too long, estimated or real,
+answers 503. Both carry a Retry-After for the current backlog.
+
+The target and interval have to be on the scale of a class's service time, or
+its first waiter is already estimated over them. The ``bulk`` class, whose
+requests take seconds, has its own (``SHED_BULK_TARGET_MS`` and
+``SHED_BULK_INTERVAL_MS``); the others share the global ones.
+
+Proposal streams and ``/metrics`` are not limited. Any other streaming
+response, such as ``GET /organizations/{id}/members?stream=true``, holds its
+slot only until its first body chunk is sent, so a slow reader cannot keep a
+slot for the rest of the stream. Queue depth, in-flight requests and shed
+counts per class are published on ``/metrics``.
+"""
+
+import asyncio
+import json
+import math
+import re
+import time
+from collections import deque
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from .config import settings
+from .metrics import Histogram, Sample, register_collector, registry
+
+# (method, path pattern, class) in match order; class None bypasses shedding
+ROUTE_CLASSES: Tuple[Tuple[str, str, Optional[str]], ...] = (
+    ("POST", r"/api/v1/endpoints/users/(login|register)", "password"),
+    ("PATCH", r"/api/v1/endpoints/users/me/password", "password"),
+    ("POST", r"/api/v1/endpoints/(users|organizations|jobs)/bulk", "bulk"),
+    ("POST", r"/api/v1/endpoints/users/me/resume", "bulk"),
+    ("POST", r"/api/v1/endpoints/proposals/?", "generate"),
+    ("GET", r"/api/v1/endpoints/proposals/[^/]+/stream", None),
+    ("GET", r"/metrics", None),
+)
+
+shed_queue_wait = registry.add(Histogram(
+    "load_shed_queue_wait_seconds", "Time admitted requests waited for a slot in their cost class", ("cost_class",)
+))
+
+
+class Shed(Exception):
+    def __init__(self, reason: str, status_code: int, retry_after: int):
+        super().__init__(reason)
+        self.reason = reason
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class CostClass:
+    """
+    Concurrency limit and wait queue of one class of routes. Used from a single
+    event loop, so no locking is needed.
+    """
+
+    def __init__(self, name: str, limit: int, max_queue: int, target: float, interval: float):
+        self.name = name
+        self.limit = max(1, limit)
+        self.max_queue = max(0, max_queue)
+        self.target = target
+        self.interval = interval
+        self.in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_empty = time.monotonic()
+        self._avg_seconds = 0.0
+        self.admitted = 0
+        self.shed = {"full": 0, "early": 0, "timeout": 0}
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def overloaded(self, now: float) -> bool:
+        """Whether the queue has stayed non-empty for a whole interval."""
+        return bool(self._waiters) and now - self._last_empty >= self.interval
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain."""
+        backlog = self.in_flight + len(self._waiters)
+        return max(1, math.ceil(backlog * self._avg_seconds / self.limit))
+
+    def _reject(self, reason: str) -> Shed:
+        self.shed[reason] += 1
+        status_code = 429 if reason == "full" else 503
+        return Shed(reason, status_code, self.retry_after())
+
+    async def acquire(self) -> float:
+        """Waits for a slot and returns how long that took; raises ``Shed`` instead."""
+        now = time.monotonic()
+        if not self._waiters:
+            self._last_empty = now
+            if self.in_flight < self.limit:
+                self.in_flight += 1
+                self.admitted += 1
+                return 0.0
+        if len(self._waiters) >= self.max_queue:
+            raise self._reject("full")
+        allowed = self.target if self.overloaded(now) else self.interval
+        if (len(self._waiters) + 1) * self._avg_seconds / self.limit > allowed:
+            raise self._reject("early")
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        expiry = asyncio.get_running_loop().call_later(allowed, self._expire, waiter)
+        try:
+            granted = await waiter
+        except asyncio.CancelledError:
+            # The client went away: give back a slot handed over meanwhile
+            if waiter.done() and not waiter.cancelled() and waiter.result():
+                self.release(0.0, record=False)
+            else:
+                self._discard(waiter)
+            raise
+        finally:
+            expiry.cancel()
+        if not granted:
+            raise self._reject("timeout")
+        return time.monotonic() - now
+
+    def _expire(self, waiter: asyncio.Future):
+        if not waiter.done():
+            self._discard(waiter)
+            waiter.set_result(False)
+
+    def _discard(self, waiter: asyncio.Future):
+        try:
+            self._waiters.remove(waiter)
+        except ValueError:
+            pass
+        if not self._waiters:
+            self._last_empty = time.monotonic()
+
+    def release(self, held: float, record: bool = True):
+        """Frees a slot after a request held it for ``held`` seconds, handing it to the oldest waiter."""
+        if record:
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * held if self._avg_seconds else held
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not self._waiters:
+                self._last_empty = time.monotonic()
+            if not waiter.done():
+                waiter.set_result(True)
+                self.admitted += 1
+                return
+        self.in_flight -= 1
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queue_depth": len(self._waiters),
+            "overloaded": int(self.overloaded(time.monotonic())),
+            "admitted": self.admitted,
+            **{f"shed_{reason}": count for reason, count in self.shed.items()},
+        }
+
+
+class LoadShedder:
+    def __init__(self, classes: Dict[str, CostClass], rules: Iterable[Tuple[str, str, Optional[str]]] = ROUTE_CLASSES):
+        self.classes = classes
+        self.rules = [(method, re.compile(pattern), name) for method, pattern, name in rules]
+
+    @classmethod
+    def from_settings(cls) -> "LoadShedder":
+        target = settings.SHED_TARGET_MS
+        interval = settings.SHED_INTERVAL_MS
+        # (concurrency, queue length, target ms, interval ms) per class
+        limits = {
+            "password": (settings.SHED_PASSWORD_CONCURRENCY, settings.SHED_PASSWORD_QUEUE, target, interval),
+            "bulk": (settings.SHED_BULK_CONCURRENCY, settings.SHED_BULK_QUEUE,
+                     settings.SHED_BULK_TARGET_MS, settings.SHED_BULK_INTERVAL_MS),
+            "generate": (settings.SHED_GENERATE_CONCURRENCY, settings.SHED_GENERATE_QUEUE, target, interval),
+            "default": (settings.SHED_DEFAULT_CONCURRENCY, settings.SHED_DEFAULT_QUEUE, target, interval),
+        }
+        return cls({
+            name: CostClass(name, limit, max_queue, class_target / 1000, class_interval / 1000)
+            for name, (limit, max_queue, class_target, class_interval) in limits.items()
+        })
+
+    def classify(self, method: str, path: str) -> Optional[CostClass]:
+        for rule_method, pattern, name in self.rules:
+            if method == rule_method and pattern.fullmatch(path):
+                return self.classes[name] if name else None
+        return self.classes["default"]
+
+    def collect(self) -> Iterable[Sample]:
+        stats = {name: cost_class.stats() for name, cost_class in self.classes.items()}
+        for key in next(iter(stats.values()), {}):
+            kind = "counter" if key == "admitted" or key.startswith("shed_") else "gauge"
+            name = f"load_shed_{key}_total" if kind == "counter" else f"load_shed_{key}"
+            samples = [({"cost_class": cost_class}, values[key]) for cost_class, values in stats.items()]
+            yield name, kind, f"Load shedding per cost class: {key.replace('_', ' ')}", samples
+
+
+load_shedder = LoadShedder.from_settings()
+register_collector(load_shedder.collect)
+
+
+class LoadSheddingMiddleware:
+    """ASGI middleware admitting each request through its cost class."""
+
+    def __init__(self, app, shedder: Optional[LoadShedder] = None):
+        self.app = app
+        self.shedder = shedder or load_shedder
+
+    async def __call__(self, scope, receive, send):
+        cost_class = self.shedder.classify(scope["method"], scope["path"]) if scope["type"] == "http" else None
+        if cost_class is None:
+            await self.app(scope, receive, send)
+            return
+
+        try:
+            waited = await cost_class.acquire()
+        except Shed as shed:
+            await _send_shed(send, shed)
+            return
+        if settings.METRICS_ENABLED:
+            shed_queue_wait.observe(waited, cost_class.name)
+        started = time.monotonic()
+        released = False
+
+        async def send_releasing(message):
+            nonlocal released
+            await send(message)
+            # A body sent in parts is a stream: the rest is paced by the client, not by us
+            if not released and message["type"] == "http.response.body" and message.get("more_body"):
+                released = True
+                cost_class.release(time.monotonic() - started)
+
+        try:
+            await self.app(scope, receive, send_releasing)
+        finally:
+            if not released:
+                cost_class.release(time.monotonic() - started)
+
+
+async def _send_shed(send, shed: Shed):
+    detail = "Too many requests are queued, please retry shortly" if shed.reason == "full" \
+        else "The server is overloaded, please retry shortly"
+    body = json.dumps({"detail": detail}).encode()
+    await send({
+        "type": "http.response.start",
+        "status": shed.status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(shed.retry_after).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,285 @@
+# backend/app/core/metrics.py
+
+"""
+In-process metrics with Prometheus text exposition.
+
+A small, dependency-free registry of counters, gauges and histograms:
+
+* ``MetricsMiddleware`` records per-route request latency and in-flight counts.
+* ``MongoCommandTimer`` is a pymongo ``CommandListener`` that times every
+  command by collection and command name.
+* ``span(name)`` times a named block of code, e.g. bcrypt, embedding or LLM calls.
+* ``register_collector`` lets modules publish values they already keep, such as
+  cache statistics, which are read only when ``/metrics`` is scraped.
+
+Recording is a dict lookup, a bisect and a few additions under a lock. With
+``METRICS_ENABLED`` off, nothing is installed and ``span`` does not read the clock.
+"""
+
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from pymongo import monitoring
+
+from .config import settings
+
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# A collected sample: (metric name, metric type, help, [(labels, value), ...])
+Sample = Tuple[str, str, str, List[Tuple[Dict[str, str], float]]]
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple[str, ...]) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, help, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, *labels: str, amount: float = 1.0):
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        with self._lock:
+            items = list(self._values.items())
+        for labels, value in items:
+            yield f"{self.name}{_format_labels(self._labels(labels))} {_format_value(value)}"
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, *labels: str, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, help, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [per-bucket counts (non-cumulative, last is +Inf), sum, count]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *labels: str):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> Iterable[str]:
+        yield from super().render()
+        with self._lock:
+            items = [(labels, list(series[0]), series[1], series[2]) for labels, series in self._series.items()]
+        for labels, counts, total, count in items:
+            base = self._labels(labels)
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield f"{self.name}_bucket{_format_labels({**base, 'le': _format_value(bound)})} {cumulative}"
+            yield f"{self.name}_sum{_format_labels(base)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(base)} {count}"
+
+
+class Registry:
+    def __init__(self):
+        self._metrics: List[_Metric] = []
+        self._collectors: List[Callable[[], Iterable[Sample]]] = []
+
+    def add(self, metric: _Metric) -> _Metric:
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, collector: Callable[[], Iterable[Sample]]):
+        self._collectors.append(collector)
+
+    def render(self) -> str:
+        lines: List[str] = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+        for collector in self._collectors:
+            for name, kind, help, samples in collector():
+                lines.append(f"# HELP {name} {help}")
+                lines.append(f"# TYPE {name} {kind}")
+                for labels, value in samples:
+                    lines.append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+
+registry = Registry()
+
+http_request_duration = registry.add(Histogram(
+    "http_request_duration_seconds", "HTTP request latency by route template", ("method", "route", "status")
+))
+http_requests_in_flight = registry.add(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served"
+))
+mongodb_command_duration = registry.add(Histogram(
+    "mongodb_command_duration_seconds", "MongoDB command latency", ("collection", "command")
+))
+mongodb_command_failures = registry.add(Counter(
+    "mongodb_command_failures_total", "MongoDB commands that returned an error", ("collection", "command")
+))
+span_duration = registry.add(Histogram(
+    "span_duration_seconds", "Latency of named operations such as bcrypt, embedding and LLM calls", ("span",)
+))
+
+
+def register_collector(collector: Callable[[], Iterable[Sample]]):
+    """Publishes values computed at scrape time; see ``Sample`` for the shape."""
+    registry.register_collector(collector)
+
+
+def stats_collector(prefix: str, help: str, get_stats: Callable[[], Optional[dict]]):
+    """
+    Exposes every numeric entry of a ``stats()`` dict as a gauge named
+    ``<prefix>_<key>``. ``get_stats`` may return None when the component has not
+    been created yet.
+    """
+    def collect() -> Iterable[Sample]:
+        stats = get_stats()
+        if not stats:
+            return
+        for key, value in stats.items():
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                yield f"{prefix}_{key}", "gauge", f"{help}: {key.replace('_', ' ')}", [({}, value)]
+
+    register_collector(collect)
+
+
+def record_span(name: str, seconds: float):
+    """Records a duration measured by the caller, e.g. time to first token."""
+    if settings.METRICS_ENABLED:
+        span_duration.observe(seconds, name)
+
+
+@contextmanager
+def span(name: str):
+    """Records the duration of the enclosed block under ``span_duration_seconds{span=name}``."""
+    if not settings.METRICS_ENABLED:
+        yield
+        return
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        span_duration.observe(time.perf_counter() - started, name)
+
+
+class MongoCommandTimer(monitoring.CommandListener):
+    """
+    Times every MongoDB command. The collection is only available on the started
+    event, so it is remembered by request id until the command finishes.
+    """
+
+    def __init__(self):
+        self._pending: Dict[Tuple[object, int], Tuple[str, str]] = {}
+
+    def started(self, event):
+        target = event.command.get(event.command_name)
+        collection = target if isinstance(target, str) else "-"
+        self._pending[(event.connection_id, event.request_id)] = (collection, event.command_name)
+
+    def _finish(self, event) -> Tuple[str, str]:
+        labels = self._pending.pop((event.connection_id, event.request_id), ("-", event.command_name))
+        mongodb_command_duration.observe(event.duration_micros / 1e6, *labels)
+        return labels
+
+    def succeeded(self, event):
+        self._finish(event)
+
+    def failed(self, event):
+        mongodb_command_failures.inc(*self._finish(event))
+
+
+def route_template(scope) -> str:
+    """
+    The matched route as a template, e.g. ``/api/v1/endpoints/organizations/{org_id}``.
+    Path parameter values are swapped back for their names, which works however
+    routers are nested.
+    """
+    if "endpoint" not in scope:
+        return "unmatched"
+    params = scope.get("path_params")
+    if not params:
+        return scope["path"]
+    names = {str(value): f"{{{name}}}" for name, value in params.items()}
+    return "/".join(names.get(segment, segment) for segment in scope["path"].split("/"))
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware recording latency per (method, route template, status) and
+    the number of requests in flight. Unmatched paths share one label value so
+    scanners cannot blow up the series count.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        http_requests_in_flight.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            http_requests_in_flight.dec()
+            http_request_duration.observe(
+                time.perf_counter() - started, scope["method"], route_template(scope), str(status_code)
+            )
+
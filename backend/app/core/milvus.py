@@ -0,0 +1,445 @@
+# backend/app/core/milvus.py
+
+"""
+Vector store used for proposal retrieval.
+
+``MilvusVectorStore`` talks to the Milvus server provisioned by docker-compose.
+``LocalVectorStore`` is a drop-in replacement that keeps vectors in a contiguous
+float32 NumPy matrix (optionally memory-mapped from disk) and answers queries by
+exact brute-force search, so retrieval can be developed and benchmarked without
+a server, and serves as ground truth when measuring Milvus recall.
+
+Both backends partition vectors by organization: searches pass ``org_id`` and only
+see that organization's vectors. Passing ``user_id`` as well narrows a search to
+records whose ``metadata["user_id"]`` matches, inside the search itself.
+"""
+
+import asyncio
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+from .config import settings
+
+DEFAULT_PARTITION = "_default"
+
+
+@dataclass
+class VectorRecord:
+    id: str
+    vector: Sequence[float]
+    org_id: Optional[str] = None
+    metadata: dict = field(default_factory=dict)
+
+
+@dataclass
+class SearchHit:
+    id: str
+    # Higher is always better; L2 distances are reported negated.
+    score: float
+    metadata: dict = field(default_factory=dict)
+
+
+def _batched(items: Sequence, size: int) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+class VectorStore(ABC):
+    """
+    Minimal async interface shared by the vector store backends.
+    """
+
+    def __init__(self, dim: int, metric: str = "COSINE"):
+        self.dim = dim
+        self.metric = metric.upper()
+
+    @abstractmethod
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        """Inserts or replaces records by id; returns the number written."""
+
+    @abstractmethod
+    async def search(
+        self,
+        vectors: Sequence[Sequence[float]],
+        top_k: int = 10,
+        org_id: Optional[str] = None,
+        user_id: Optional[str] = None,
+    ) -> List[List[SearchHit]]:
+        """Returns the ``top_k`` hits for each query vector."""
+
+    @abstractmethod
+    async def delete(self, ids: Sequence[str]) -> int:
+        """Removes records by id; returns the number removed."""
+
+    async def close(self):
+        pass
+
+
+class LocalVectorStore(VectorStore):
+    """
+    Exact in-process vector search over a contiguous float32 matrix.
+
+    Rows live in ``self._matrix[:self._count]``; capacity grows geometrically so
+    upserts are amortized O(1). Deleting a row moves the last row into its slot
+    to keep the matrix dense. With the COSINE metric rows are normalized on
+    insert so search is a single matrix product.
+    """
+
+    def __init__(self, dim: int, metric: str = "COSINE", capacity: int = 1024):
+        super().__init__(dim, metric)
+        self._matrix = np.zeros((max(1, capacity), dim), dtype=np.float32)
+        self._count = 0
+        self._ids: List[str] = []
+        self._orgs: List[str] = []
+        self._metadata: List[dict] = []
+        self._row_of: Dict[str, int] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._row_of
+
+    @property
+    def matrix(self) -> np.ndarray:
+        """The live (count x dim) view of stored vectors."""
+        return self._matrix[:self._count]
+
+    def _prepare(self, vectors) -> np.ndarray:
+        array = np.ascontiguousarray(vectors, dtype=np.float32)
+        if array.ndim == 1:
+            array = array.reshape(1, -1)
+        if array.shape[1] != self.dim:
+            raise ValueError(f"Expected vectors of dimension {self.dim}, got {array.shape[1]}")
+        if self.metric == "COSINE":
+            norms = np.linalg.norm(array, axis=1, keepdims=True)
+            norms[norms == 0] = 1.0
+            array = array / norms
+        return array
+
+    def _ensure_capacity(self, needed: int):
+        if needed <= self._matrix.shape[0] and self._matrix.flags.writeable:
+            return
+        new_capacity = max(needed, self._matrix.shape[0] * 2)
+        grown = np.zeros((new_capacity, self.dim), dtype=np.float32)
+        grown[:self._count] = self._matrix[:self._count]
+        self._matrix = grown
+
+    def upsert_sync(self, records: Sequence[VectorRecord]) -> int:
+        if not records:
+            return 0
+        vectors = self._prepare([record.vector for record in records])
+        with self._lock:
+            self._ensure_capacity(self._count + len(records))
+            for record, vector in zip(records, vectors):
+                row = self._row_of.get(record.id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._row_of[record.id] = row
+                    self._ids.append(record.id)
+                    self._orgs.append(record.org_id or DEFAULT_PARTITION)
+                    self._metadata.append(record.metadata)
+                else:
+                    self._orgs[row] = record.org_id or DEFAULT_PARTITION
+                    self._metadata[row] = record.metadata
+                self._matrix[row] = vector
+        return len(records)
+
+    def search_sync(self, vectors, top_k: int = 10, org_id: Optional[str] = None,
+                    user_id: Optional[str] = None) -> List[List[SearchHit]]:
+        queries = self._prepare(vectors)
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return [[] for _ in range(len(queries))]
+            matrix = self._matrix[:count]
+            if self.metric == "L2":
+                # -(|q|^2 - 2 q.x + |x|^2); |q|^2 is constant per query and dropped
+                scores = 2.0 * (queries @ matrix.T) - np.einsum("ij,ij->i", matrix, matrix)[None, :]
+            else:
+                scores = queries @ matrix.T
+
+            if org_id is not None:
+                mask = np.fromiter((org == org_id for org in self._orgs), dtype=bool, count=count)
+                scores = np.where(mask[None, :], scores, -np.inf)
+            if user_id is not None:
+                mask = np.fromiter(
+                    (metadata.get("user_id") == user_id for metadata in self._metadata), dtype=bool, count=count
+                )
+                scores = np.where(mask[None, :], scores, -np.inf)
+
+            k = min(top_k, count)
+            top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+            results = []
+            for query_index, candidates in enumerate(top):
+                candidate_scores = scores[query_index, candidates]
+                order = np.argsort(-candidate_scores)
+                hits = []
+                for position in order:
+                    score = float(candidate_scores[position])
+                    if score == -np.inf:
+                        continue
+                    row = int(candidates[position])
+                    if self.metric == "L2":
+                        score = score - float(queries[query_index] @ queries[query_index])
+                    hits.append(SearchHit(self._ids[row], score, self._metadata[row]))
+                results.append(hits)
+            return results
+
+    def delete_sync(self, ids: Sequence[str]) -> int:
+        removed = 0
+        with self._lock:
+            self._ensure_capacity(self._count)
+            for record_id in ids:
+                row = self._row_of.pop(record_id, None)
+                if row is None:
+                    continue
+                last = self._count - 1
+                if row != last:
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = self._ids[last]
+                    self._orgs[row] = self._orgs[last]
+                    self._metadata[row] = self._metadata[last]
+                    self._row_of[self._ids[row]] = row
+                self._ids.pop()
+                self._orgs.pop()
+                self._metadata.pop()
+                self._count -= 1
+                removed += 1
+        return removed
+
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        return await asyncio.to_thread(self.upsert_sync, records)
+
+    async def search(self, vectors, top_k: int = 10, org_id: Optional[str] = None,
+                     user_id: Optional[str] = None) -> List[List[SearchHit]]:
+        return await asyncio.to_thread(self.search_sync, vectors, top_k, org_id, user_id)
+
+    async def delete(self, ids: Sequence[str]) -> int:
+        return await asyncio.to_thread(self.delete_sync, ids)
+
+    def save(self, path: str):
+        """
+        Writes ``<path>.npy`` (the matrix) and ``<path>.json`` (ids, orgs, metadata).
+        """
+        with self._lock:
+            np.save(f"{path}.npy", self.matrix)
+            with open(f"{path}.json", "w") as handle:
+                json.dump(
+                    {"dim": self.dim, "metric": self.metric, "ids": self._ids, "orgs": self._orgs, "metadata": self._metadata},
+                    handle,
+                )
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "LocalVectorStore":
+        """
+        Loads a store written by ``save``. With ``mmap`` the matrix is mapped
+        read-only, so large stores open instantly and share pages between
+        processes; the first write copies it into memory.
+        """
+        with open(f"{path}.json") as handle:
+            meta = json.load(handle)
+        store = cls(meta["dim"], meta["metric"], capacity=1)
+        store._matrix = np.load(f"{path}.npy", mmap_mode="r" if mmap else None)
+        store._count = store._matrix.shape[0]
+        store._ids = meta["ids"]
+        store._orgs = meta["orgs"]
+        store._metadata = meta["metadata"]
+        store._row_of = {record_id: row for row, record_id in enumerate(store._ids)}
+        return store
+
+
+# One pymilvus client per URI per process; pymilvus clients are thread-safe.
+_milvus_clients: Dict[str, object] = {}
+_milvus_clients_lock = threading.Lock()
+
+
+def _get_milvus_client(uri: str, token: Optional[str] = None):
+    from pymilvus import MilvusClient
+
+    with _milvus_clients_lock:
+        client = _milvus_clients.get(uri)
+        if client is None:
+            client = MilvusClient(uri=uri, token=token or "")
+            _milvus_clients[uri] = client
+        return client
+
+
+class MilvusVectorStore(VectorStore):
+    """
+    Milvus-backed store. pymilvus is blocking, so every call runs in a worker
+    thread; upserts are sent in ``batch_size`` chunks and each organization gets
+    its own partition so searches only scan that tenant's segments.
+    """
+
+    def __init__(
+        self,
+        collection_name: str,
+        dim: int,
+        metric: str = "COSINE",
+        uri: Optional[str] = None,
+        index_type: Optional[str] = None,
+        search_params: Optional[dict] = None,
+        batch_size: Optional[int] = None,
+    ):
+        super().__init__(dim, metric)
+        self.collection_name = collection_name
+        self.uri = uri or settings.MILVUS_URI
+        self.index_type = (index_type or settings.MILVUS_INDEX_TYPE).upper()
+        self.search_params = search_params or self.default_search_params(self.index_type)
+        self.batch_size = batch_size or settings.VECTOR_UPSERT_BATCH_SIZE
+        self._client = None
+        self._partitions: set = set()
+        self._ready = asyncio.Lock()
+
+    @staticmethod
+    def default_search_params(index_type: str) -> dict:
+        if index_type == "HNSW":
+            return {"ef": settings.MILVUS_SEARCH_EF}
+        if index_type.startswith("IVF"):
+            return {"nprobe": settings.MILVUS_SEARCH_NPROBE}
+        return {}
+
+    def _index_params(self, client):
+        params = client.prepare_index_params()
+        build = {"M": 16, "efConstruction": 200} if self.index_type == "HNSW" else {"nlist": 1024}
+        params.add_index(field_name="vector", index_type=self.index_type, metric_type=self.metric, params=build)
+        return params
+
+    def _create_collection(self):
+        from pymilvus import DataType
+
+        # self._client marks the store ready, so it is only set once the collection exists
+        client = _get_milvus_client(self.uri, settings.MILVUS_TOKEN)
+        if not client.has_collection(self.collection_name):
+            schema = client.create_schema(auto_id=False, enable_dynamic_field=False)
+            schema.add_field("id", DataType.VARCHAR, is_primary=True, max_length=128)
+            schema.add_field("vector", DataType.FLOAT_VECTOR, dim=self.dim)
+            schema.add_field("org_id", DataType.VARCHAR, max_length=64)
+            schema.add_field("metadata", DataType.JSON)
+            client.create_collection(self.collection_name, schema=schema, index_params=self._index_params(client))
+        self._partitions = set(client.list_partitions(self.collection_name))
+        self._client = client
+
+    async def _ensure_ready(self):
+        if self._client is not None:
+            return
+        async with self._ready:
+            if self._client is None:
+                await asyncio.to_thread(self._create_collection)
+
+    @staticmethod
+    def partition_for(org_id: Optional[str]) -> str:
+        return f"org_{org_id}" if org_id else DEFAULT_PARTITION
+
+    def _ensure_partition(self, partition: str):
+        if partition not in self._partitions:
+            if not self._client.has_partition(self.collection_name, partition):
+                self._client.create_partition(self.collection_name, partition)
+            self._partitions.add(partition)
+
+    def _upsert_sync(self, records: Sequence[VectorRecord]) -> int:
+        by_partition: Dict[str, List[dict]] = {}
+        for record in records:
+            by_partition.setdefault(self.partition_for(record.org_id), []).append({
+                "id": record.id,
+                "vector": [float(value) for value in record.vector],
+                "org_id": record.org_id or "",
+                "metadata": record.metadata,
+            })
+        written = 0
+        for partition, rows in by_partition.items():
+            self._ensure_partition(partition)
+            for batch in _batched(rows, self.batch_size):
+                self._client.upsert(self.collection_name, data=list(batch), partition_name=partition)
+                written += len(batch)
+        return written
+
+    def _search_sync(self, vectors, top_k: int, org_id: Optional[str],
+                     user_id: Optional[str] = None) -> List[List[SearchHit]]:
+        partitions = [self.partition_for(org_id)] if org_id else None
+        if partitions and partitions[0] not in self._partitions:
+            # Another process (e.g. scripts/ingest_projects.py) may have created it since
+            if not self._client.has_partition(self.collection_name, partitions[0]):
+                return [[] for _ in vectors]
+            self._partitions.add(partitions[0])
+        raw = self._client.search(
+            self.collection_name,
+            data=[[float(value) for value in vector] for vector in vectors],
+            limit=top_k,
+            partition_names=partitions,
+            filter=f'metadata["user_id"] == {json.dumps(user_id)}' if user_id is not None else "",
+            output_fields=["metadata"],
+            search_params={"metric_type": self.metric, "params": self.search_params},
+        )
+        results = []
+        for hits in raw:
+            results.append([
+                SearchHit(
+                    hit["id"],
+                    -hit["distance"] if self.metric == "L2" else hit["distance"],
+                    hit.get("entity", {}).get("metadata") or {},
+                )
+                for hit in hits
+            ])
+        return results
+
+    async def upsert(self, records: Sequence[VectorRecord]) -> int:
+        if not records:
+            return 0
+        await self._ensure_ready()
+        return await asyncio.to_thread(self._upsert_sync, records)
+
+    async def search(self, vectors, top_k: int = 10, org_id: Optional[str] = None,
+                     user_id: Optional[str] = None) -> List[List[SearchHit]]:
+        await self._ensure_ready()
+        return await asyncio.to_thread(self._search_sync, vectors, top_k, org_id, user_id)
+
+    async def delete(self, ids: Sequence[str]) -> int:
+        await self._ensure_ready()
+        result = await asyncio.to_thread(self._client.delete, self.collection_name, ids=list(ids))
+        return result.get("delete_count", len(ids)) if isinstance(result, dict) else len(ids)
+
+    async def close(self):
+        if self._client is None:
+            return
+        client, self._client = self._client, None
+        # Clients are shared per URI, so the next store for it must build a new one
+        with _milvus_clients_lock:
+            if _milvus_clients.get(self.uri) is client:
+                del _milvus_clients[self.uri]
+        await asyncio.to_thread(client.close)
+
+
+_stores: Dict[str, VectorStore] = {}
+
+
+def get_vector_store(collection_name: str, dim: Optional[int] = None) -> VectorStore:
+    """
+    Returns the process-wide store for ``collection_name`` using the backend
+    selected by ``VECTOR_STORE_BACKEND`` ("milvus" or "local"). A local store
+    is loaded from ``LOCAL_VECTOR_PATH/<collection>`` when that file exists.
+    """
+    store = _stores.get(collection_name)
+    if store is not None:
+        return store
+
+    dim = dim or settings.EMBEDDING_DIM
+    if settings.VECTOR_STORE_BACKEND == "local":
+        path = os.path.join(settings.LOCAL_VECTOR_PATH, collection_name) if settings.LOCAL_VECTOR_PATH else None
+        if path and os.path.exists(f"{path}.npy"):
+            store = LocalVectorStore.load(path, mmap=True)
+        else:
+            store = LocalVectorStore(dim)
+    else:
+        store = MilvusVectorStore(collection_name, dim)
+    _stores[collection_name] = store
+    return store
@@ -0,0 +1,46 @@
+# backend/app/core/pagination.py
+
+import base64
+import binascii
+from typing import Any, Tuple
+import bson
+from bson import ObjectId
+from bson.errors import InvalidBSON, InvalidId
+from fastapi import HTTPException, status
+
+def encode_cursor(last_id: ObjectId) -> str:
+    """
+    Encodes the last ``_id`` of a page as an opaque, URL-safe cursor.
+    """
+    return base64.urlsafe_b64encode(ObjectId(last_id).binary).decode("ascii").rstrip("=")
+
+def decode_cursor(cursor: str) -> ObjectId:
+    """
+    Decodes a cursor produced by ``encode_cursor``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        return ObjectId(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (binascii.Error, InvalidId, TypeError, ValueError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+def encode_keyset_cursor(sort_value, last_id: ObjectId) -> str:
+    """
+    Encodes the sort key and ``_id`` of the last row of a page, for pages ordered
+    by another field (a date or a relevance score) with ``_id`` as tie-breaker.
+    """
+    raw = bson.encode({"v": sort_value, "i": ObjectId(last_id)})
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def decode_keyset_cursor(cursor: str) -> Tuple[Any, ObjectId]:
+    """
+    Decodes a cursor produced by ``encode_keyset_cursor`` into ``(sort_value, _id)``.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        fields = bson.decode(base64.urlsafe_b64decode(padded.encode("ascii")))
+        if not isinstance(fields.get("i"), ObjectId) or "v" not in fields:
+            raise ValueError("cursor is missing its keys")
+        return fields["v"], fields["i"]
+    except (binascii.Error, InvalidBSON, TypeError, ValueError, IndexError):
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
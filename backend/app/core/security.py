@@ -1,7 +1,15 @@
+import asyncio
+import math
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional
+from fastapi import HTTPException, status
 from passlib.context import CryptContext
 from datetime import datetime, timedelta, timezone
 from jose import jwt, JWTError
 from .config import settings
+from .metrics import register_collector, span
 
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -22,6 +30,129 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     return pwd_context.verify(plain_password, hashed_password)
 
+class PasswordHashingExecutor:
+    """
+    Runs bcrypt hashing and verification off the event loop.
+
+    Work is handed to a bounded thread (or process) pool. Admission is capped at
+    ``max_workers + max_queue`` in-flight calls; anything beyond that is rejected
+    with a 503 and a Retry-After estimated from recent hash durations, so a login
+    burst cannot pile up unbounded work behind the pool.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, kind: str = "thread"):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.kind = kind
+        self._executor: Optional[Executor] = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._avg_seconds = 0.1
+        self.rejected = 0
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    if self.kind == "process":
+                        self._executor = ProcessPoolExecutor(max_workers=self.max_workers)
+                    else:
+                        self._executor = ThreadPoolExecutor(
+                            max_workers=self.max_workers,
+                            thread_name_prefix="password-hash",
+                        )
+        return self._executor
+
+    def retry_after(self) -> int:
+        """Seconds until the current backlog is expected to drain."""
+        return max(1, math.ceil(self._in_flight * self._avg_seconds / self.max_workers))
+
+    async def run(self, fn, *args):
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Authentication service is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+
+        self._in_flight += 1
+        started = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            with span(f"password.{fn.__name__}"):
+                return await loop.run_in_executor(self._get_executor(), fn, *args)
+        finally:
+            self._in_flight -= 1
+            # Exponential moving average keeps Retry-After tied to the real cost factor.
+            self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.perf_counter() - started)
+
+    async def map(self, fn, items: list) -> list:
+        """
+        Runs ``fn(item)`` for every item, at most ``max_workers`` at a time. Meant
+        for bulk work: it bypasses admission control but still counts towards
+        ``in_flight``, so interactive callers see the pool as busy.
+        """
+        loop = asyncio.get_running_loop()
+        executor = self._get_executor()
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def one(item):
+            async with semaphore:
+                self._in_flight += 1
+                try:
+                    with span(f"password.{fn.__name__}"):
+                        return await loop.run_in_executor(executor, fn, item)
+                finally:
+                    self._in_flight -= 1
+
+        return await asyncio.gather(*(one(item) for item in items))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_executor = PasswordHashingExecutor(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_QUEUE_SIZE,
+    kind=settings.PASSWORD_HASH_EXECUTOR,
+)
+
+def _collect_password_executor():
+    yield "password_executor_in_flight", "gauge", "bcrypt calls running or queued", [({}, password_executor.in_flight)]
+    yield "password_executor_capacity", "gauge", "bcrypt calls admitted before shedding", [({}, password_executor.capacity)]
+    yield "password_executor_rejected_total", "counter", "bcrypt calls rejected with 503", [({}, password_executor.rejected)]
+
+register_collector(_collect_password_executor)
+
+async def hash_password_async(password: str) -> str:
+    """
+    Hashes a password on the password executor without blocking the event loop.
+    """
+    return await password_executor.run(hash_password, password)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    """
+    Verifies a password on the password executor without blocking the event loop.
+    """
+    return await password_executor.run(verify_password, plain_password, hashed_password)
+
+async def hash_passwords_async(passwords: list) -> list:
+    """
+    Hashes many passwords in parallel on the password executor.
+    """
+    return await password_executor.map(hash_password, passwords)
+
 def create_access_token(data: dict):
     """Creates a JWT access token with an expiration time."""
     to_encode = data.copy()
@@ -0,0 +1,81 @@
+# backend/app/core/serialization.py
+
+"""
+Single-pass response serialization.
+
+Returning a model from a route that declares ``response_model`` makes FastAPI
+validate it a second time and then walk it with ``jsonable_encoder`` before
+encoding. Routes that build their response from a Mongo document instead
+validate it once through a ``Serializer`` and return its ``response``: the
+validated model is encoded straight to JSON bytes by pydantic-core, and the
+declared ``response_model`` is left in place for the OpenAPI schema only.
+Everything else (plain dicts, error bodies) goes through ``MongoJSONResponse``,
+which encodes with orjson.
+"""
+
+from typing import Any, Generic, Optional, Type, TypeVar
+
+import orjson
+from bson import ObjectId
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+
+from .metrics import span
+
+T = TypeVar("T")
+
+
+# Used by orjson and as pydantic-core's fallback, e.g. for an ObjectId inside a ``dict`` field
+def _default(value: Any) -> Any:
+    if isinstance(value, ObjectId):
+        return str(value)
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", by_alias=True)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """orjson encoding that also understands ObjectId and pydantic models."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+class MongoJSONResponse(JSONResponse):
+    """JSON response rendered with orjson; the application's default response class."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class Serializer(Generic[T]):
+    """
+    Validates documents into ``model`` and renders responses from them. The
+    TypeAdapter is built once, at import time of the module that declares the
+    serializer.
+    """
+
+    def __init__(self, model: Type[T]):
+        self.model = model
+        self.adapter = TypeAdapter(model)
+        self._is_class = isinstance(model, type)
+        self._span = f"serialize.{getattr(model, '__name__', 'response')}"
+
+    def validate(self, document: Any) -> T:
+        return self.adapter.validate_python(document)
+
+    def _validated(self, value: Any) -> T:
+        # Already-validated models (e.g. the cached current user) are not validated again
+        if self._is_class and isinstance(value, self.model):
+            return value
+        return self.validate(value)
+
+    def dump(self, value: Any) -> Any:
+        """Plain Python data for ``value``."""
+        return self.adapter.dump_python(self._validated(value), by_alias=True)
+
+    def dumps(self, value: Any) -> bytes:
+        """JSON bytes for ``value``."""
+        with span(self._span):
+            return self.adapter.dump_json(self._validated(value), by_alias=True, fallback=_default)
+
+    def response(self, value: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+        return Response(self.dumps(value), status_code=status_code, headers=headers, media_type="application/json")
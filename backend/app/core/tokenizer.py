@@ -0,0 +1,99 @@
+# backend/app/core/tokenizer.py
+
+"""
+Local token counting for prompt budgets.
+
+The default ``regex`` tokenizer needs no downloads: it splits text the way
+GPT-style byte-pair encoders pre-tokenize it (words with their leading space,
+digit groups of up to three, punctuation runs, whitespace) and charges long
+words and punctuation runs by length, since BPE breaks those into several
+pieces. It approximates the model's count and errs on the high side, which is
+the safe direction for a budget. ``PROMPT_TOKENIZER=tiktoken`` counts exactly
+with the optional ``tiktoken`` package; offline, that needs its encoding files
+already in ``TIKTOKEN_CACHE_DIR``.
+
+Counts from different tokenizers are not comparable, so anything that stores
+them should also store ``Tokenizer.name``.
+"""
+
+import re
+import threading
+from typing import Optional
+
+from .config import settings
+
+_PIECE_RE = re.compile(r"'(?:s|t|re|ve|m|ll|d)\b| ?[^\W\d_]+| ?\d{1,3}| ?(?:[^\s\w]|_)+|\s+", re.IGNORECASE)
+# Pieces up to this long (leading space included) are usually one BPE token
+_WORD_CHARS = 8
+
+
+class Tokenizer:
+    name = "regex-v1"
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        total = 0
+        for piece in _PIECE_RE.findall(text):
+            stripped = piece.lstrip(" ")
+            if not stripped or stripped[0].isspace():
+                total += 1
+            elif stripped[0].isalpha():
+                total += 1 if len(piece) <= _WORD_CHARS else (len(piece) + 4) // 5
+            elif stripped[0].isdigit():
+                total += 1
+            else:
+                total += (len(stripped) + 1) // 2
+        return total
+
+
+class TiktokenTokenizer(Tokenizer):
+    def __init__(self, model: str):
+        import tiktoken
+
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+        self.name = f"tiktoken-{self._encoding.name}"
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=())) if text else 0
+
+
+_tokenizer: Optional[Tokenizer] = None
+_lock = threading.Lock()
+
+
+def get_tokenizer() -> Tokenizer:
+    """The process-wide tokenizer selected by ``PROMPT_TOKENIZER`` ("regex" or "tiktoken")."""
+    global _tokenizer
+    if _tokenizer is None:
+        with _lock:
+            if _tokenizer is None:
+                if settings.PROMPT_TOKENIZER == "tiktoken":
+                    _tokenizer = TiktokenTokenizer(settings.LLM_MODEL)
+                else:
+                    _tokenizer = Tokenizer()
+    return _tokenizer
+
+
+def count_tokens(text: str) -> int:
+    return get_tokenizer().count(text)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """The longest whole-word prefix of ``text`` within ``max_tokens``, with an ellipsis if cut."""
+    tokenizer = get_tokenizer()
+    if tokenizer.count(text) <= max_tokens:
+        return text
+    words = text.split()
+    low, high = 0, len(words)
+    # Largest word count whose prefix, ellipsis included, still fits
+    while low < high:
+        middle = (low + high + 1) // 2
+        if tokenizer.count(" ".join(words[:middle]) + "…") <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return " ".join(words[:low]) + "…" if low else ""
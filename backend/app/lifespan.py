@@ -0,0 +1,128 @@
+# backend/app/lifespan.py
+
+"""
+Per-worker startup and shutdown.
+
+Importing the application only builds routes and settings: the Mongo client
+does not connect until first used, and NumPy, the embedding backend, the LLM
+client and the vector store are imported by the code paths that need them.
+``lifespan`` runs once per worker process, after the server has forked, and is
+where connections, indexes and background workers are set up.
+
+``WARMUP`` names optional hooks that load heavy components before the first
+request instead of on it, trading a slower start for a faster first call:
+
+* ``password``: starts every password hashing worker.
+* ``embedder``: creates the embedding backend and embeds one string.
+* ``matcher``: builds the in-memory job matcher from all freelancers.
+* ``llm``: creates the LLM client.
+* ``vectors``: opens the project vector store.
+* ``resume``: starts every resume parser process.
+"""
+
+import logging
+import sys
+import time
+from contextlib import asynccontextmanager
+from typing import Awaitable, Callable, Dict
+
+from fastapi import FastAPI
+
+from .core.config import settings
+from .core.database import client, create_db_indexes
+from .core.security import hash_passwords_async, password_executor
+from .services.proposal_service import get_proposal_service
+from .services.resume_service import parser_pool
+
+logger = logging.getLogger(__name__)
+
+
+async def _warm_password():
+    await hash_passwords_async(["warm-up"] * password_executor.max_workers)
+
+
+async def _warm_embedder():
+    from .services.embedding_service import get_embedder
+
+    await get_embedder().embed(["warm-up"])
+
+
+async def _warm_matcher():
+    from .services.job_service import load_matcher
+
+    await load_matcher()
+
+
+async def _warm_llm():
+    from .services.ai_agent_service import get_llm
+
+    get_llm()
+
+
+async def _warm_vectors():
+    from .core.milvus import get_vector_store
+
+    get_vector_store(settings.PROJECT_VECTOR_COLLECTION)
+
+
+async def _warm_resume_parser():
+    await parser_pool.warm_up()
+
+
+WARMUPS: Dict[str, Callable[[], Awaitable[None]]] = {
+    "password": _warm_password,
+    "embedder": _warm_embedder,
+    "matcher": _warm_matcher,
+    "llm": _warm_llm,
+    "vectors": _warm_vectors,
+    "resume": _warm_resume_parser,
+}
+
+
+async def run_warmups(names: str):
+    """
+    Runs the comma-separated warm-up hooks in order. A failing hook is logged
+    and skipped: the component is then loaded on first use, as without warm-up.
+    """
+    for name in filter(None, (name.strip() for name in names.split(","))):
+        hook = WARMUPS.get(name)
+        if hook is None:
+            logger.warning("Unknown warm-up %r; expected one of %s", name, ", ".join(WARMUPS))
+            continue
+        started = time.perf_counter()
+        try:
+            await hook()
+        except Exception:
+            logger.exception("Warm-up %r failed", name)
+        else:
+            logger.info("Warm-up %r took %.0f ms", name, (time.perf_counter() - started) * 1000)
+
+
+async def _close_vector_stores():
+    # Only stores that were opened; never imports the vector backend just to close it
+    milvus = sys.modules.get(f"{__package__}.core.milvus")
+    if milvus is None:
+        return
+    for store in list(milvus._stores.values()):
+        await store.close()
+    milvus._stores.clear()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print("Connecting to MongoDB...")
+    await create_db_indexes()
+    proposal_service = get_proposal_service() if settings.PROPOSAL_RUN_WORKERS_IN_API else None
+    if proposal_service is not None:
+        proposal_service.start()
+    await run_warmups(settings.WARMUP)
+
+    yield
+
+    print("Disconnecting from MongoDB...")
+    if proposal_service is not None:
+        await proposal_service.stop()
+    await _close_vector_stores()
+    client.close()
+    password_executor.shutdown()
+    parser_pool.shutdown()
@@ -1,11 +1,10 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from .core.config import settings
-from .core.database import client, create_db_indexes
-from .api.v1.endpoints.users import router as users_router
-from .api.v1.endpoints.organizations import router as organizations_router
-from dotenv import load_dotenv
-
-load_dotenv()
+from .core.load_shedding import LoadSheddingMiddleware
+from .core.metrics import MetricsMiddleware, registry
+from .core.serialization import MongoJSONResponse
+from .lifespan import lifespan
 
 # Import routers
 from .api.v1 import api_router
@@ -13,21 +12,24 @@ from .api.v1 import api_router
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version="1.0.0",
+    default_response_class=MongoJSONResponse,
+    lifespan=lifespan,
 )
 
-@app.on_event("startup")
-async def startup_db_client():
-    print("Connecting to MongoDB...")
-    await create_db_indexes()
+# Added first so it runs inside the metrics middleware and shed responses are timed too
+if settings.SHED_ENABLED:
+    app.add_middleware(LoadSheddingMiddleware)
+
+if settings.METRICS_ENABLED:
+    app.add_middleware(MetricsMiddleware)
 
-@app.on_event("shutdown")
-async def shutdown_db_client():
-    print("Disconnecting from MongoDB...")
-    client.close()
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics():
+        return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
 
 # Include API routers
 app.include_router(api_router, prefix="/api/v1")
 
 @app.get("/")
 async def root():
-    return {"message": "AI Proposal Agent API is running!"}
\ No newline at end of file
+    return {"message": "AI Proposal Agent API is running!"}
@@ -0,0 +1,519 @@
+# backend/app/services/ai_agent_service.py
+
+"""
+The AI agent that writes proposals.
+
+LLM access goes through a small streaming interface so the proposal workers can
+forward tokens as they arrive. ``OpenAILLM`` streams chat completions from the
+OpenAI API; ``FakeLLM`` produces deterministic text with configurable latency so
+the whole generation pipeline can be load-tested offline.
+
+Before prompting, ``retrieve_context`` picks the freelancer's past projects and
+experience most relevant to the job: a BM25 keyword search, which catches exact
+tech-stack terms, and a vector search, which catches paraphrases, run
+concurrently and are merged by reciprocal rank fusion. A leg still running when
+``RETRIEVAL_BUDGET_MS`` runs out is cancelled and the other leg's ranking is used.
+The prompt's freelancer part is then assembled from the precomputed profile
+digest to fit ``PROMPT_PROFILE_TOKEN_BUDGET`` tokens.
+"""
+
+import asyncio
+import hashlib
+import logging
+import random
+import re
+import time
+from collections import OrderedDict, defaultdict, deque
+from dataclasses import dataclass
+from typing import AsyncIterator, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from ..core.bm25 import BM25Index
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.metrics import record_span, span, stats_collector
+from ..core.milvus import LocalVectorStore, VectorRecord, get_vector_store
+from ..core.tokenizer import count_tokens
+from .embedding_service import get_embedder
+from .profile_digest import current_hash, digest_for, entry_line, fit_digest, profile_entries
+
+logger = logging.getLogger(__name__)
+
+PROMPT_TEMPLATE_VERSION = "proposal-v1"
+
+SYSTEM_PROMPT = (
+    "You are an expert freelance proposal writer. Write a concise, specific proposal "
+    "that connects the freelancer's real experience to the client's job post. "
+    "Do not invent experience the freelancer does not have."
+)
+
+
+class LLMBackend:
+    """
+    Base class for chat models. ``stream`` yields text fragments as they are generated.
+    """
+
+    model_name: str = "base"
+
+    async def stream(self, system: str, prompt: str) -> AsyncIterator[str]:
+        raise NotImplementedError
+        yield  # pragma: no cover
+
+    async def complete(self, system: str, prompt: str) -> str:
+        return "".join([token async for token in self.stream(system, prompt)])
+
+
+class FakeLLM(LLMBackend):
+    """
+    Offline model: waits ``first_token_latency`` seconds, then emits ``tokens``
+    words, ``token_latency`` seconds apart. Output is seeded by the prompt so the
+    same prompt always yields the same proposal.
+    """
+
+    _WORDS = (
+        "I have delivered similar projects and can start immediately. My approach "
+        "focuses on clear milestones, clean code, thorough testing and frequent "
+        "communication so you always know where things stand."
+    ).split()
+
+    def __init__(self, first_token_latency: float = 0.2, token_latency: float = 0.01, tokens: int = 120):
+        self.model_name = "fake-llm"
+        self.first_token_latency = first_token_latency
+        self.token_latency = token_latency
+        self.tokens = tokens
+
+    async def stream(self, system: str, prompt: str) -> AsyncIterator[str]:
+        seed = int.from_bytes(hashlib.sha256(prompt.encode("utf-8")).digest()[:8], "little")
+        rng = random.Random(seed)
+        if self.first_token_latency:
+            await asyncio.sleep(self.first_token_latency)
+        for index in range(self.tokens):
+            if index and self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            yield ("" if index == 0 else " ") + rng.choice(self._WORDS)
+
+
+class OpenAILLM(LLMBackend):
+    """
+    Streaming chat completions from OpenAI. The SDK is imported on first use.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, temperature: float = 0.4):
+        self.model_name = model_name or settings.LLM_MODEL
+        self.temperature = temperature
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI()
+        return self._client
+
+    async def stream(self, system: str, prompt: str) -> AsyncIterator[str]:
+        response = await self._get_client().chat.completions.create(
+            model=self.model_name,
+            temperature=self.temperature,
+            stream=True,
+            messages=[{"role": "system", "content": system}, {"role": "user", "content": prompt}],
+        )
+        async for chunk in response:
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
+
+
+_llm: Optional[LLMBackend] = None
+
+
+def get_llm() -> LLMBackend:
+    """
+    Returns the process-wide model selected by ``LLM_BACKEND`` ("openai" or "fake").
+    """
+    global _llm
+    if _llm is None:
+        if settings.LLM_BACKEND == "fake":
+            _llm = FakeLLM(settings.FAKE_LLM_FIRST_TOKEN_LATENCY, settings.FAKE_LLM_TOKEN_LATENCY)
+        else:
+            _llm = OpenAILLM()
+    return _llm
+
+
+@dataclass
+class ContextItem:
+    id: str
+    # "experience" or "project"
+    kind: str
+    text: str
+    score: float = 0.0
+    # Retrieval legs that ranked the item
+    sources: Tuple[str, ...] = ()
+
+    def prompt_line(self) -> str:
+        return entry_line(self.kind, self.text)
+
+
+def profile_items(user: dict) -> Dict[str, Tuple[str, str]]:
+    """
+    The freelancer's past work as ``{doc_id: (kind, text)}``, in profile order.
+    Project ids and text match what ``scripts/ingest_projects.py`` writes to the
+    vector store, so vector hits map back to these items.
+    """
+    user_id = str(user.get("_id", ""))
+    return {f"{user_id}:{key}": entry for key, entry in profile_entries(user).items()}
+
+
+def _profile_section(user: dict, context: Optional[Sequence[ContextItem]] = None,
+                     budget: Optional[int] = None) -> List[str]:
+    budget = settings.PROMPT_PROFILE_TOKEN_BUDGET if budget is None else budget
+    # Context ids are "<user_id>:<entry key>"
+    keys = None if context is None else [item.id.partition(":")[2] for item in context]
+    return fit_digest(digest_for(user), budget, keys)
+
+
+def build_prompt(user: dict, job: dict, context: Optional[Sequence[ContextItem]] = None,
+                 budget: Optional[int] = None) -> str:
+    """
+    Renders the user prompt for a proposal from the freelancer and the job post.
+    The freelancer part comes from the profile digest and stays within
+    ``budget`` tokens (``PROMPT_PROFILE_TOKEN_BUDGET`` by default). With
+    ``context``, only those items of past work are listed, in that order;
+    otherwise all of it is, most recent experience first.
+    """
+    lines = ["## Job post", f"Title: {job.get('job_title')}"]
+    if job.get("client_name"):
+        lines.append(f"Client: {job['client_name']}")
+    if job.get("job_skills"):
+        lines.append("Required skills: " + ", ".join(job["job_skills"]))
+    lines += ["Description:", job.get("job_description") or "", "", "## Freelancer"]
+    lines += _profile_section(user, context, budget)
+    lines += ["", f"Write the proposal in a {job.get('tone') or 'professional'} tone."]
+    return "\n".join(lines)
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count of ``text`` with the local tokenizer."""
+    return count_tokens(text)
+
+
+def job_text(job: dict) -> str:
+    """The part of a proposal request that varies between near-identical job posts."""
+    skills = ", ".join(job.get("job_skills") or [])
+    return f"{job.get('job_title') or ''}\n{skills}\n{job.get('job_description') or ''}\n{job.get('tone') or ''}"
+
+
+def cache_scope(user: dict, job: dict) -> str:
+    """
+    Tenant boundary for semantic matches: the organization and freelancer, plus
+    the profile digest hash so a profile edit never reuses older proposals.
+    """
+    profile_hash = current_hash(user)[:16]
+    user_id = job.get("user_id") or str(user.get("_id", ""))
+    return f"{job.get('org_id') or '-'}:{user_id}:{profile_hash}"
+
+
+class CompletionCache:
+    """
+    Two-level cache of LLM completions.
+
+    Level one is an exact match on a hash of (model, prompt template version,
+    system prompt, rendered prompt, scope). Level two, when enabled, embeds the
+    job text and looks for the nearest earlier job within the same scope; a
+    neighbour at or above ``threshold`` cosine similarity reuses its completion.
+    Entries expire after ``ttl`` seconds and the least recently used are evicted
+    beyond ``maxsize``. Each scope's vectors live in their own store; at most
+    ``max_scopes`` stores are kept, least recently written first out, and a
+    store expires ``ttl`` after its last write, as its entries do. Vectors whose
+    completion has gone are pruned on the next write to their scope or when a
+    lookup finds them, and a scope left empty is dropped.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, semantic: bool = False, threshold: float = 0.95,
+                 max_semantic_per_scope: int = 500, max_scopes: int = 1000):
+        self.entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.semantic = semantic
+        self.threshold = threshold
+        self.max_semantic_per_scope = max_semantic_per_scope
+        # scope -> (vector store, entry keys in insertion order)
+        self._scopes = TTLCache(maxsize=max_scopes, ttl=ttl)
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self.bypassed = 0
+        self.tokens_saved = 0
+
+    @staticmethod
+    def exact_key(model_name: str, system: str, prompt: str, scope: str) -> str:
+        material = "\0".join((model_name, PROMPT_TEMPLATE_VERSION, system, prompt, scope))
+        return hashlib.sha256(material.encode("utf-8")).hexdigest()
+
+    async def _embed(self, text: str):
+        return (await get_embedder().embed([text]))[0]
+
+    async def lookup(self, model_name: str, system: str, prompt: str, scope: str, semantic_text: str) -> Optional[str]:
+        key = self.exact_key(model_name, system, prompt, scope)
+        completion = self.entries.get(key, count=False)
+        if completion is not None:
+            self.exact_hits += 1
+            self.tokens_saved += estimate_tokens(completion)
+            return completion
+
+        scoped = self._scopes.get(scope, count=False) if self.semantic else None
+        store = scoped[0] if scoped is not None else None
+        if store is not None and len(store):
+            hits = store.search_sync(await self._embed(semantic_text), top_k=1)[0]
+            if hits and hits[0].score >= self.threshold:
+                neighbour = hits[0]
+                if neighbour.metadata.get("model") == model_name:
+                    completion = self.entries.get(neighbour.id, count=False)
+                    if completion is not None:
+                        self.semantic_hits += 1
+                        self.tokens_saved += estimate_tokens(completion)
+                        return completion
+                    self._forget(scope, scoped, [neighbour.id])
+
+        self.misses += 1
+        return None
+
+    async def store(self, model_name: str, system: str, prompt: str, scope: str, semantic_text: str, completion: str):
+        key = self.exact_key(model_name, system, prompt, scope)
+        self.entries.set(key, completion)
+        if not self.semantic:
+            return
+        vector = await self._embed(semantic_text)
+        scoped = self._scopes.get(scope, count=False)
+        if scoped is None:
+            scoped = (LocalVectorStore(len(vector), "COSINE", capacity=16), deque())
+        store, keys = scoped
+        gone = [other for other in keys if other != key and other not in self.entries]
+        if gone:
+            self._forget(scope, scoped, gone)
+        if key not in store:
+            keys.append(key)
+        store.upsert_sync([VectorRecord(key, vector, metadata={"model": model_name})])
+        while len(keys) > self.max_semantic_per_scope:
+            store.delete_sync([keys.popleft()])
+        # Re-set on every write so the scope lives as long as its newest entry
+        self._scopes.set(scope, scoped)
+
+    def _forget(self, scope: str, scoped: tuple, keys_gone: List[str]):
+        store, keys = scoped
+        store.delete_sync(keys_gone)
+        gone = set(keys_gone)
+        remaining = [key for key in keys if key not in gone]
+        keys.clear()
+        keys.extend(remaining)
+        if not keys:
+            self._scopes.pop(scope)
+
+    def stats(self) -> dict:
+        lookups = self.exact_hits + self.semantic_hits + self.misses
+        return {
+            "lookups": lookups,
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "misses": self.misses,
+            "bypassed": self.bypassed,
+            "hit_rate": round((self.exact_hits + self.semantic_hits) / lookups, 4) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "entries": len(self.entries),
+            "semantic_scopes": len(self._scopes),
+        }
+
+
+_completion_cache: Optional[CompletionCache] = None
+
+stats_collector(
+    "llm_completion_cache", "LLM completion cache",
+    lambda: _completion_cache.stats() if _completion_cache is not None else None,
+)
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    Returns the process-wide completion cache, or None when ``LLM_CACHE_ENABLED`` is off.
+    """
+    global _completion_cache
+    if _completion_cache is None and settings.LLM_CACHE_ENABLED:
+        _completion_cache = CompletionCache(
+            maxsize=settings.LLM_CACHE_SIZE,
+            ttl=settings.LLM_CACHE_TTL_SECONDS,
+            semantic=settings.LLM_SEMANTIC_CACHE_ENABLED,
+            threshold=settings.LLM_SEMANTIC_CACHE_THRESHOLD,
+            max_scopes=settings.LLM_SEMANTIC_CACHE_MAX_SCOPES,
+        )
+    return _completion_cache
+
+
+def reciprocal_rank_fusion(
+    rankings: Mapping[str, Sequence[str]], k: int = 60
+) -> List[Tuple[str, float, Tuple[str, ...]]]:
+    """
+    Merges ranked id lists: each id scores ``sum(1 / (k + rank))`` over the
+    lists containing it (rank starts at 1). Returns ``(id, score, sources)``
+    best first, where ``sources`` names the lists that ranked the id.
+    """
+    scores: Dict[str, float] = {}
+    sources: Dict[str, List[str]] = defaultdict(list)
+    for name, ranking in rankings.items():
+        for rank, doc_id in enumerate(ranking, start=1):
+            scores[doc_id] = scores.get(doc_id, 0.0) + 1.0 / (k + rank)
+            sources[doc_id].append(name)
+    ordered = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    return [(doc_id, score, tuple(sources[doc_id])) for doc_id, score in ordered]
+
+
+# Keyword indexes per organization (or per freelancer without one), least recently used evicted first
+_keyword_indexes: "OrderedDict[str, BM25Index]" = OrderedDict()
+
+_retrieval_stats = {
+    "requests": 0, "skipped": 0,
+    "bm25_timeouts": 0, "bm25_failures": 0, "vector_timeouts": 0, "vector_failures": 0,
+}
+stats_collector("retrieval", "Proposal context retrieval", lambda: _retrieval_stats)
+
+
+def _keyword_index(scope: str) -> BM25Index:
+    index = _keyword_indexes.get(scope)
+    if index is None:
+        index = _keyword_indexes[scope] = BM25Index()
+        while len(_keyword_indexes) > settings.RETRIEVAL_MAX_INDEXES:
+            _keyword_indexes.popitem(last=False)
+    else:
+        _keyword_indexes.move_to_end(scope)
+    return index
+
+
+async def _keyword_leg(scope: str, user_id: str, items: Dict[str, Tuple[str, str]], query: str,
+                       depth: int) -> List[str]:
+    """
+    Runs inline on the event loop without awaiting anything, so the retrieval
+    budget cannot cut it short: once started it finishes, and its ranking is
+    used even when that took longer than the budget. It stays cheap because it
+    only re-indexes this freelancer's changed items and scores the query terms'
+    postings. It is not moved to a thread because ``BM25Index`` is shared per
+    organization and not thread-safe.
+    """
+    with span("retrieval.bm25"):
+        index = _keyword_index(scope)
+        # Re-indexes only items whose text changed since the last proposal
+        index.sync_owner(user_id, {doc_id: text for doc_id, (_, text) in items.items()})
+        return [doc_id for doc_id, _ in index.search(query, depth, owner=user_id)]
+
+
+async def _vector_leg(org_id: Optional[str], user_id: str, items: Dict[str, Tuple[str, str]], query: str,
+                      depth: int) -> List[str]:
+    with span("retrieval.vector"):
+        vector = (await get_embedder().embed([query]))[0]
+        store = get_vector_store(settings.PROJECT_VECTOR_COLLECTION)
+        # Filtered to this freelancer inside the search; over-fetch only because items span several chunks
+        hits = (await store.search(
+            [vector], top_k=depth * settings.RETRIEVAL_VECTOR_OVERSAMPLE, org_id=org_id, user_id=user_id
+        ))[0]
+    ranked: List[str] = []
+    for hit in hits:
+        doc_id = hit.id.rsplit(":", 1)[0]  # chunk id -> item id
+        if doc_id in items and doc_id not in ranked:
+            ranked.append(doc_id)
+    return ranked[:depth]
+
+
+async def retrieve_context(user: dict, job: dict, top_k: Optional[int] = None, budget_ms: Optional[float] = None,
+                           legs: Sequence[str] = ("bm25", "vector")) -> List[ContextItem]:
+    """
+    The ``top_k`` items of the freelancer's past work most relevant to ``job``.
+
+    Profiles with no more than ``top_k`` items are returned whole, in profile
+    order, without searching. When the legs rank fewer than ``top_k`` items (no
+    leg finished within the budget, or few matches), the rest is filled from
+    the profile in order. Only the vector leg can be cut off by the budget; the
+    keyword leg runs inline and always finishes.
+    """
+    top_k = top_k or settings.RETRIEVAL_TOP_K
+    budget = (settings.RETRIEVAL_BUDGET_MS if budget_ms is None else budget_ms) / 1000
+    items = profile_items(user)
+    query = job_text(job).strip()
+    _retrieval_stats["requests"] += 1
+    if len(items) <= top_k or not query:
+        _retrieval_stats["skipped"] += 1
+        return [ContextItem(doc_id, kind, text) for doc_id, (kind, text) in list(items.items())[:top_k]]
+
+    user_id = str(user.get("_id", ""))
+    org_id = user.get("org_id")
+    depth = top_k * 3
+    runners = {
+        "bm25": lambda: _keyword_leg(org_id or f"user:{user_id}", user_id, items, query, depth),
+        "vector": lambda: _vector_leg(org_id, user_id, items, query, depth),
+    }
+    tasks = {name: asyncio.ensure_future(runners[name]()) for name in legs}
+    with span("retrieval.total"):
+        done, pending = await asyncio.wait(tasks.values(), timeout=budget)
+
+    rankings: Dict[str, List[str]] = {}
+    for name, task in tasks.items():
+        if task in pending:
+            task.cancel()
+            _retrieval_stats[f"{name}_timeouts"] += 1
+        elif task.exception() is not None:
+            _retrieval_stats[f"{name}_failures"] += 1
+            logger.warning("Retrieval leg %s failed: %r", name, task.exception())
+        else:
+            rankings[name] = task.result()
+
+    fused = reciprocal_rank_fusion(rankings, settings.RETRIEVAL_RRF_K)[:top_k]
+    context = [ContextItem(doc_id, *items[doc_id], score=score, sources=sources) for doc_id, score, sources in fused]
+    # Fewer matches than top_k: fill up with the rest of the profile, in order
+    ranked = {item.id for item in context}
+    for doc_id, (kind, text) in items.items():
+        if len(context) >= top_k:
+            break
+        if doc_id not in ranked:
+            context.append(ContextItem(doc_id, kind, text))
+    return context
+
+
+_REPLAY_PIECES = re.compile(r"\S+\s*|\s+")
+
+
+async def _timed_stream(llm: LLMBackend, prompt: str) -> AsyncIterator[str]:
+    """``llm.stream`` that records time to first token and to completion."""
+    started = time.perf_counter()
+    first = True
+    async for token in llm.stream(SYSTEM_PROMPT, prompt):
+        if first:
+            record_span("llm.first_token", time.perf_counter() - started)
+            first = False
+        yield token
+    record_span("llm.completion", time.perf_counter() - started)
+
+
+async def generate_proposal(user: dict, job: dict, use_cache: bool = True) -> AsyncIterator[str]:
+    """
+    Streams a proposal for ``job`` written on behalf of ``user``. Cached
+    completions are replayed word by word; ``use_cache=False`` skips the lookup
+    but still refreshes the cache with the new completion.
+    """
+    llm = get_llm()
+    context = await retrieve_context(user, job) if settings.RETRIEVAL_ENABLED else None
+    prompt = build_prompt(user, job, context)
+    cache = get_completion_cache()
+    if cache is None:
+        async for token in _timed_stream(llm, prompt):
+            yield token
+        return
+
+    scope = cache_scope(user, job)
+    semantic_text = job_text(job)
+    if use_cache:
+        with span("llm.cache_lookup"):
+            cached = await cache.lookup(llm.model_name, SYSTEM_PROMPT, prompt, scope, semantic_text)
+        if cached is not None:
+            for piece in _REPLAY_PIECES.findall(cached):
+                yield piece
+            return
+    else:
+        cache.bypassed += 1
+
+    pieces: List[str] = []
+    async for token in _timed_stream(llm, prompt):
+        pieces.append(token)
+        yield token
+    await cache.store(llm.model_name, SYSTEM_PROMPT, prompt, scope, semantic_text, "".join(pieces))
@@ -0,0 +1,322 @@
+# backend/app/services/embedding_service.py
+
+"""
+Text embedding backends shared by project ingestion and the AI agent.
+
+``OpenAIEmbedder`` calls the OpenAI embeddings API. ``FakeEmbedder`` is a
+deterministic, offline stand-in based on feature hashing: texts that share words
+get similar vectors, which is enough to exercise retrieval end to end and to
+measure pipeline throughput without a model.
+"""
+
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.metrics import span, stats_collector
+
+_TOKEN_RE = re.compile(r"[a-z0-9][a-z0-9+#.]*")
+
+
+def normalize_text(text: str) -> str:
+    """Collapses whitespace and case so trivially different texts embed identically."""
+    return " ".join(text.lower().split())
+
+
+def chunk_text(text: str, max_chars: int = 1000, overlap: int = 100) -> List[str]:
+    """
+    Splits ``text`` into chunks of at most ``max_chars`` characters, breaking on
+    whitespace where possible and repeating ``overlap`` characters between chunks.
+    """
+    text = " ".join(text.split())
+    if len(text) <= max_chars:
+        return [text] if text else []
+
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + max_chars)
+        if end < len(text):
+            split_at = text.rfind(" ", start + max_chars // 2, end)
+            if split_at != -1:
+                end = split_at
+        chunks.append(text[start:end].strip())
+        if end >= len(text):
+            break
+        start = max(end - overlap, start + 1)
+    return [chunk for chunk in chunks if chunk]
+
+
+class Embedder:
+    """
+    Base class for embedding backends. ``embed`` returns a float32 matrix with one
+    row per input text.
+    """
+
+    model_name: str = "base"
+    dim: int = 0
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        raise NotImplementedError
+
+
+class FakeEmbedder(Embedder):
+    """
+    Deterministic feature-hashing embedder with optional simulated latency.
+    """
+
+    def __init__(self, dim: Optional[int] = None, latency: float = 0.0):
+        self.dim = dim or settings.EMBEDDING_DIM
+        self.latency = latency
+        self.model_name = f"fake-hash-{self.dim}"
+
+    def embed_sync(self, texts: Sequence[str]) -> np.ndarray:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for token in _TOKEN_RE.findall(text.lower()):
+                digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+                bucket = int.from_bytes(digest[:4], "little") % self.dim
+                sign = 1.0 if digest[4] & 1 else -1.0
+                matrix[row, bucket] += sign
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return matrix / norms
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        with span("embedding.model"):
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            return self.embed_sync(texts)
+
+
+class OpenAIEmbedder(Embedder):
+    """
+    Embeddings from the OpenAI API. The client is imported and created lazily so
+    processes that never embed do not pay for the import.
+    """
+
+    def __init__(self, model_name: Optional[str] = None, dim: Optional[int] = None):
+        self.model_name = model_name or settings.EMBEDDING_MODEL
+        self.dim = dim or settings.EMBEDDING_DIM
+        self._client = None
+
+    def _get_client(self):
+        if self._client is None:
+            from openai import AsyncOpenAI
+
+            self._client = AsyncOpenAI()
+        return self._client
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        with span("embedding.model"):
+            response = await self._get_client().embeddings.create(model=self.model_name, input=list(texts))
+        return np.asarray([item.embedding for item in response.data], dtype=np.float32)
+
+
+def embedding_key(model_name: str, text: str) -> bytes:
+    """Content address of an embedding: hash of the model name and normalized text."""
+    return hashlib.sha256(f"{model_name}\0{normalize_text(text)}".encode("utf-8")).digest()
+
+
+class SQLiteEmbeddingStore:
+    """
+    On-disk embedding tier. Vectors are stored as raw float32 blobs keyed by
+    ``embedding_key``; once the file holds more than ``max_bytes`` of vectors the
+    least recently used rows are deleted.
+    """
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            " key BLOB PRIMARY KEY, vector BLOB NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS embeddings_accessed ON embeddings (accessed_at)")
+        self._bytes = self._conn.execute("SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings").fetchone()[0]
+
+    @property
+    def bytes_stored(self) -> int:
+        return self._bytes
+
+    def get_many(self, keys: Sequence[bytes]) -> Dict[bytes, np.ndarray]:
+        found: Dict[bytes, np.ndarray] = {}
+        if not keys:
+            return found
+        with self._lock:
+            # SQLite caps bound parameters, so look keys up in slices
+            for start in range(0, len(keys), 500):
+                chunk = list(keys[start:start + 500])
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[bytes(key)] = np.frombuffer(blob, dtype=np.float32)
+                if rows:
+                    self._conn.execute(
+                        f"UPDATE embeddings SET accessed_at = ? WHERE key IN ({placeholders})",
+                        [time.time(), *chunk],
+                    )
+        return found
+
+    def put_many(self, items: Dict[bytes, np.ndarray]):
+        if not items:
+            return
+        now = time.time()
+        with self._lock:
+            added = 0
+            self._conn.execute("BEGIN")
+            try:
+                for key, vector in items.items():
+                    blob = np.ascontiguousarray(vector, dtype=np.float32).tobytes()
+                    previous = self._conn.execute(
+                        "SELECT LENGTH(vector) FROM embeddings WHERE key = ?", (key,)
+                    ).fetchone()
+                    self._conn.execute(
+                        "INSERT OR REPLACE INTO embeddings (key, vector, accessed_at) VALUES (?, ?, ?)",
+                        (key, blob, now),
+                    )
+                    added += len(blob) - (previous[0] if previous else 0)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                # Otherwise the connection stays inside the failed transaction and every later BEGIN fails
+                self._conn.execute("ROLLBACK")
+                raise
+            self._bytes += added
+            if self._bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Trim to 90% of the budget so eviction does not run on every insert.
+        target = int(self.max_bytes * 0.9)
+        while self._bytes > target:
+            rows = self._conn.execute(
+                "SELECT key, LENGTH(vector) FROM embeddings ORDER BY accessed_at LIMIT 1000"
+            ).fetchall()
+            if not rows:
+                break
+            freed = 0
+            doomed = []
+            for key, size in rows:
+                doomed.append(key)
+                freed += size
+                if self._bytes - freed <= target:
+                    break
+            self._conn.executemany("DELETE FROM embeddings WHERE key = ?", [(key,) for key in doomed])
+            self._bytes -= freed
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+class CachedEmbedder(Embedder):
+    """
+    Wraps an embedder with a content-addressed cache: an in-process LRU tier in
+    front of an optional on-disk tier. A batch is resolved against both tiers
+    first and only the misses (deduplicated) are sent to the model.
+    """
+
+    def __init__(self, embedder: Embedder, memory_items: int, disk: Optional[SQLiteEmbeddingStore] = None):
+        self.embedder = embedder
+        self.model_name = embedder.model_name
+        self.dim = embedder.dim
+        self.memory = TTLCache(maxsize=memory_items, ttl=float("inf"))
+        self.disk = disk
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    async def embed(self, texts: Sequence[str]) -> np.ndarray:
+        keys = [embedding_key(self.model_name, text) for text in texts]
+        vectors: Dict[bytes, np.ndarray] = {}
+
+        for key in set(keys):
+            vector = self.memory.get(key, count=False)
+            if vector is not None:
+                vectors[key] = vector
+        self.memory_hits += sum(1 for key in keys if key in vectors)
+
+        pending = [key for key in dict.fromkeys(keys) if key not in vectors]
+        if pending and self.disk is not None:
+            with span("embedding.disk_cache"):
+                from_disk = await asyncio.to_thread(self.disk.get_many, pending)
+            for key, vector in from_disk.items():
+                vectors[key] = vector
+                self.memory.set(key, vector)
+            self.disk_hits += sum(1 for key in keys if key in from_disk)
+            pending = [key for key in pending if key not in from_disk]
+
+        if pending:
+            pending_set = set(pending)
+            self.misses += sum(1 for key in keys if key in pending_set)
+            text_of = {key: text for key, text in zip(keys, texts)}
+            computed = await self.embedder.embed([text_of[key] for key in pending])
+            fresh = {key: np.asarray(vector, dtype=np.float32) for key, vector in zip(pending, computed)}
+            for key, vector in fresh.items():
+                vectors[key] = vector
+                self.memory.set(key, vector)
+            if self.disk is not None:
+                await asyncio.to_thread(self.disk.put_many, fresh)
+
+        if not keys:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return np.stack([vectors[key] for key in keys])
+
+    def stats(self) -> dict:
+        lookups = self.memory_hits + self.disk_hits + self.misses
+        return {
+            "lookups": lookups,
+            "memory_hits": self.memory_hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+            "memory_items": len(self.memory),
+            "disk_bytes": self.disk.bytes_stored if self.disk is not None else 0,
+        }
+
+
+_embedder: Optional[Embedder] = None
+
+# Reported once the embedder exists; scraping never creates it
+stats_collector(
+    "embedding_cache", "Embedding cache",
+    lambda: _embedder.stats() if isinstance(_embedder, CachedEmbedder) else None,
+)
+
+
+def get_embedder() -> Embedder:
+    """
+    Returns the process-wide embedder selected by ``EMBEDDING_BACKEND``, wrapped
+    in the embedding cache unless ``EMBEDDING_CACHE_ENABLED`` is off.
+    """
+    global _embedder
+    if _embedder is None:
+        if settings.EMBEDDING_BACKEND == "fake":
+            embedder: Embedder = FakeEmbedder()
+        else:
+            embedder = OpenAIEmbedder()
+        if settings.EMBEDDING_CACHE_ENABLED:
+            disk = None
+            if settings.EMBEDDING_CACHE_PATH:
+                os.makedirs(os.path.dirname(os.path.abspath(settings.EMBEDDING_CACHE_PATH)), exist_ok=True)
+                disk = SQLiteEmbeddingStore(settings.EMBEDDING_CACHE_PATH, settings.EMBEDDING_CACHE_MAX_BYTES)
+            embedder = CachedEmbedder(embedder, settings.EMBEDDING_CACHE_MEMORY_ITEMS, disk)
+        _embedder = embedder
+    return _embedder
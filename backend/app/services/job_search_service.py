@@ -0,0 +1,232 @@
+# backend/app/services/job_search_service.py
+
+"""
+Job search: full-text matching, facet filters and keyset pagination.
+
+Without ``q`` jobs are listed newest first, which the ``recent_jobs`` and
+``job_skills`` indexes serve in order, so a page costs ``limit + 1`` index
+entries however many jobs exist. With ``q`` the ``job_text`` index finds the
+matches and they are ranked by text score. Either way the next page starts
+strictly after the last row of the previous one (its sort key and ``_id``),
+never with ``skip``.
+
+Facet counts (skills, budget range and posting date) are computed by one
+``$facet`` aggregation over at most ``JOB_SEARCH_FACET_SCAN_LIMIT`` matches, the
+most recent or, with ``q``, the first the text index yields. They are only
+requested for the first page of a search.
+
+Rendered pages are kept in a short-TTL per-process cache, and concurrent misses
+for the same page share one query. Inserting jobs clears the cache of the
+process that inserted them; other processes see new jobs once their entries
+expire, after at most ``JOB_SEARCH_CACHE_TTL_SECONDS``.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional, Tuple
+
+from pymongo import DESCENDING
+
+from ..core.cache import TTLCache
+from ..core.config import settings
+from ..core.database import jobs_collection
+from ..core.metrics import stats_collector
+from ..core.pagination import decode_keyset_cursor, encode_keyset_cursor
+
+# Budget facet: (lower bound, label); a job falls in the bucket of its upper budget
+BUDGET_BUCKETS = ((0, "0-100"), (100, "100-500"), (500, "500-1000"), (1000, "1000-5000"),
+                  (5000, "5000-10000"), (10000, "10000+"))
+# Posting date facet and filter values, in days
+POSTED_WITHIN_DAYS = (1, 7, 30)
+SKILL_FACET_SIZE = 20
+
+RECENT_SORT = (("created_at", DESCENDING), ("_id", DESCENDING))
+
+search_cache = TTLCache(maxsize=settings.JOB_SEARCH_CACHE_SIZE, ttl=settings.JOB_SEARCH_CACHE_TTL_SECONDS)
+stats_collector("job_search_cache", "Job search result cache", search_cache.stats)
+
+# Bumped by every invalidation, so a query that started before it is not cached after it
+_generation = 0
+_pending: Dict[Hashable, "asyncio.Future[bytes]"] = {}
+
+
+@dataclass(frozen=True)
+class JobSearch:
+    q: Optional[str] = None
+    skills: Tuple[str, ...] = ()
+    budget_min: Optional[float] = None
+    budget_max: Optional[float] = None
+    posted_within_days: Optional[int] = None
+
+    @classmethod
+    def create(cls, q: Optional[str] = None, skills: Optional[List[str]] = None, budget_min: Optional[float] = None,
+               budget_max: Optional[float] = None, posted_within_days: Optional[int] = None) -> "JobSearch":
+        """Normalized parameters, so equivalent searches share cache entries."""
+        q = " ".join((q or "").split()) or None
+        skills = tuple(sorted({skill.strip() for skill in skills or [] if skill.strip()}))
+        return cls(q, skills, budget_min, budget_max, posted_within_days)
+
+    def filter(self, now: datetime) -> dict:
+        query: dict = {}
+        if self.q:
+            query["$text"] = {"$search": self.q}
+        if self.skills:
+            query["skills"] = {"$all": list(self.skills)}
+        # A job matches a budget range when its own range overlaps it
+        if self.budget_min is not None:
+            query["budget_max"] = {"$gte": self.budget_min}
+        if self.budget_max is not None:
+            query["budget_min"] = {"$lte": self.budget_max}
+        if self.posted_within_days is not None:
+            query["created_at"] = {"$gte": now - timedelta(days=self.posted_within_days)}
+        return query
+
+
+def _naive_utc(value: datetime) -> datetime:
+    # The driver returns naive UTC datetimes unless the client is tz_aware
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+def _after(sort_field: str, value, last_id) -> dict:
+    """Rows strictly after ``(value, last_id)`` in descending ``(sort_field, _id)`` order."""
+    return {"$or": [{sort_field: {"$lt": value}}, {sort_field: value, "_id": {"$lt": last_id}}]}
+
+
+async def search_page(search: JobSearch, limit: int, cursor: Optional[str] = None) -> dict:
+    """
+    One page of matching jobs: ``{"items": [...], "next_cursor": ...}``. Items are
+    raw documents, with ``score`` added when searching with ``q``.
+    """
+    now = datetime.now(timezone.utc)
+    query = search.filter(now)
+    after = decode_keyset_cursor(cursor) if cursor else None
+
+    if search.q:
+        pipeline = [{"$match": query}, {"$addFields": {"score": {"$meta": "textScore"}}}]
+        if after:
+            pipeline.append({"$match": _after("score", *after)})
+        pipeline += [{"$sort": {"score": -1, "_id": -1}}, {"$limit": limit + 1}]
+        jobs = await jobs_collection.aggregate(pipeline).to_list(length=limit + 1)
+        sort_field = "score"
+    else:
+        if after:
+            query = {"$and": [query, _after("created_at", *after)]} if query else _after("created_at", *after)
+        jobs = await jobs_collection.find(query).sort(list(RECENT_SORT)).to_list(length=limit + 1)
+        sort_field = "created_at"
+
+    next_cursor = None
+    if len(jobs) > limit:
+        jobs = jobs[:limit]
+        next_cursor = encode_keyset_cursor(jobs[-1].get(sort_field), jobs[-1]["_id"])
+    return {"items": jobs, "next_cursor": next_cursor}
+
+
+def facet_pipeline(search: JobSearch, now: datetime, scan_limit: int) -> list:
+    pipeline: list = [{"$match": search.filter(now)}]
+    if not search.q:
+        pipeline.append({"$sort": dict(RECENT_SORT)})
+    pipeline += [
+        {"$limit": scan_limit},
+        {"$project": {"skills": 1, "budget_min": 1, "budget_max": 1, "created_at": 1}},
+        {"$facet": {
+            "skills": [
+                {"$unwind": "$skills"},
+                {"$group": {"_id": "$skills", "count": {"$sum": 1}}},
+                {"$sort": {"count": -1, "_id": 1}},
+                {"$limit": SKILL_FACET_SIZE},
+            ],
+            "budget": [{"$bucket": {
+                "groupBy": {"$ifNull": ["$budget_max", "$budget_min"]},
+                "boundaries": [bound for bound, _ in BUDGET_BUCKETS] + [float("inf")],
+                "default": "unspecified",
+            }}],
+            "posted": [{"$bucket": {
+                "groupBy": "$created_at",
+                "boundaries": [now - timedelta(days=days) for days in sorted(POSTED_WITHIN_DAYS, reverse=True)]
+                + [now + timedelta(days=1)],
+                "default": "older",
+            }}],
+            "total": [{"$count": "count"}],
+        }},
+    ]
+    return pipeline
+
+
+async def search_facets(search: JobSearch, scan_limit: Optional[int] = None) -> dict:
+    """Facet counts for ``search``, shaped like ``JobFacets``."""
+    # Naive UTC in whole seconds, the form bucket bounds come back in from BSON's millisecond dates
+    now = datetime.now(timezone.utc).replace(microsecond=0, tzinfo=None)
+    scan_limit = scan_limit or settings.JOB_SEARCH_FACET_SCAN_LIMIT
+    results = await jobs_collection.aggregate(
+        facet_pipeline(search, now, scan_limit), allowDiskUse=True
+    ).to_list(length=1)
+    facets = results[0] if results else {}
+
+    budget_counts = {bucket["_id"]: bucket["count"] for bucket in facets.get("budget", [])}
+    budget = [
+        {"value": label, "count": budget_counts[bound]} for bound, label in BUDGET_BUCKETS if bound in budget_counts
+    ]
+    if "unspecified" in budget_counts:
+        budget.append({"value": "unspecified", "count": budget_counts["unspecified"]})
+
+    # Buckets are disjoint date ranges keyed by their lower bound; the facet
+    # reports cumulative "posted within N days" counts
+    posted_counts = {_naive_utc(bucket["_id"]): bucket["count"] for bucket in facets.get("posted", [])
+                     if isinstance(bucket["_id"], datetime)}
+    posted, running = [], 0
+    for days in sorted(POSTED_WITHIN_DAYS):
+        running += posted_counts.get(now - timedelta(days=days), 0)
+        posted.append({"value": str(days), "count": running})
+
+    total = facets["total"][0]["count"] if facets.get("total") else 0
+    return {
+        "skills": [{"value": str(bucket["_id"]), "count": bucket["count"]} for bucket in facets.get("skills", [])],
+        "budget": budget,
+        "posted": posted,
+        "total": total,
+        "truncated": total >= scan_limit,
+    }
+
+
+async def search_jobs(search: JobSearch, limit: int, cursor: Optional[str] = None) -> dict:
+    """A page of results; the first page also carries facet counts, fetched concurrently."""
+    if cursor:
+        return await search_page(search, limit, cursor)
+    page, facets = await asyncio.gather(search_page(search, limit), search_facets(search))
+    return {**page, "facets": facets}
+
+
+def invalidate_job_search():
+    """Drops every cached search page; called after jobs are inserted."""
+    global _generation
+    _generation += 1
+    search_cache.clear()
+
+
+async def cached_search(key: Hashable, render: Callable[[], Awaitable[bytes]]) -> bytes:
+    """
+    The cached response body for ``key``, rendering it on a miss. Callers that
+    miss while the same key is being rendered wait for that render instead of
+    querying again.
+    """
+    body = search_cache.get(key)
+    if body is not None:
+        return body
+
+    pending = _pending.get(key)
+    if pending is None:
+        generation = _generation
+
+        async def fill() -> bytes:
+            try:
+                body = await render()
+                if generation == _generation:
+                    search_cache.set(key, body)
+                return body
+            finally:
+                _pending.pop(key, None)
+
+        pending = _pending[key] = asyncio.ensure_future(fill())
+    # One caller disconnecting must not cancel the render the others wait on
+    return await asyncio.shield(pending)
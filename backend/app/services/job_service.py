@@ -0,0 +1,165 @@
+# backend/app/services/job_service.py
+
+"""
+Job-to-freelancer matching, served by ``GET /jobs/{job_id}/matches``.
+
+Freelancers are scored by ``skill_matcher.SkillMatcher``, which is built from
+every active freelancer on first use and kept current as profiles change. The
+matcher, NumPy and the embedding backend are imported only when matching is
+first used, so processes that only serve auth and profile traffic never load
+them.
+
+The matcher lives in each process's memory. ``refresh_user`` keeps only the
+process that served the write current: other API workers see the edit when
+they next build their matcher, at restart. Matching runs from that snapshot,
+so results can lag profile edits made through other workers until then.
+
+Profile embeddings are truncated to ``MATCH_EMBEDDING_DIM`` dimensions and
+re-normalized (text-embedding-3 models are trained so that prefixes remain
+meaningful), which keeps the matrix small enough to scan 100k freelancers in a
+few milliseconds.
+"""
+
+import asyncio
+import re
+from typing import TYPE_CHECKING, List, Optional, Sequence, Set
+
+from bson import ObjectId
+
+from ..core.config import settings
+from ..core.database import users_collection
+
+if TYPE_CHECKING:
+    from .skill_matcher import Match, SkillMatcher
+
+_SKILL_PUNCTUATION = re.compile(r"[^a-z0-9+#]+")
+
+
+def normalize_skill(name: str) -> str:
+    """
+    Canonical form of a skill name: "React.js", "react js" and "ReactJS" all
+    become "reactjs".
+    """
+    return _SKILL_PUNCTUATION.sub("", (name or "").lower())
+
+
+def profile_text(user: dict) -> str:
+    """
+    The text embedded for a freelancer: headline, bio, skills, job titles and projects.
+    """
+    profile = user.get("profile") or {}
+    parts = [profile.get("headline") or "", profile.get("bio") or ""]
+    parts.append(", ".join(skill.get("skill_name", "") for skill in user.get("skills") or []))
+    parts.extend(item.get("job_title", "") for item in user.get("experience") or [])
+    parts.extend(
+        f"{item.get('project_title', '')} {item.get('description') or ''}" for item in user.get("projects") or []
+    )
+    return "\n".join(part for part in parts if part)
+
+
+def user_skills(user: dict) -> Set[str]:
+    return {normalize_skill(skill.get("skill_name", "")) for skill in user.get("skills") or []} - {""}
+
+
+_matcher: Optional["SkillMatcher"] = None
+_matcher_loaded = False
+_matcher_loading = asyncio.Lock()
+
+# Fields whose change affects a freelancer's match profile
+MATCH_FIELDS = ("profile", "skills", "experience", "projects", "is_deleted", "role")
+
+
+def get_matcher() -> "SkillMatcher":
+    """The process-wide matcher, created empty on first call."""
+    global _matcher
+    if _matcher is None:
+        from .skill_matcher import SkillMatcher
+
+        _matcher = SkillMatcher(settings.MATCH_EMBEDDING_DIM)
+    return _matcher
+
+
+async def index_user(user: dict):
+    """
+    Embeds one freelancer and upserts them into the matcher, or removes them if
+    they are no longer a matchable freelancer.
+    """
+    from .embedding_service import get_embedder
+
+    user_id = str(user["_id"])
+    matcher = get_matcher()
+    if user.get("is_deleted") or (user.get("role") or "freelancer") != "freelancer":
+        matcher.remove(user_id)
+        return
+    vectors = await get_embedder().embed([profile_text(user) or user.get("email", "")])
+    matcher.upsert(user_id, vectors[0], user_skills(user))
+
+
+async def load_matcher(batch_size: int = 256) -> "SkillMatcher":
+    """
+    Builds the matcher from every active freelancer on first use. Later profile
+    edits keep it current through ``refresh_user``. Users without a role count
+    as freelancers, as in ``index_user``.
+    """
+    from .embedding_service import get_embedder
+
+    global _matcher_loaded
+    matcher = get_matcher()
+    if _matcher_loaded:
+        return matcher
+    async with _matcher_loading:
+        if _matcher_loaded:
+            return matcher
+        embedder = get_embedder()
+        projection = {"profile": 1, "skills": 1, "experience": 1, "projects": 1, "email": 1}
+        cursor = users_collection.find(
+            {"is_deleted": {"$ne": True}, "role": {"$in": ["freelancer", None, ""]}}, projection
+        ).batch_size(batch_size)
+        batch: List[dict] = []
+
+        async def flush():
+            vectors = await embedder.embed([profile_text(user) or user.get("email", "") for user in batch])
+            for user, vector in zip(batch, vectors):
+                matcher.upsert(str(user["_id"]), vector, user_skills(user))
+            batch.clear()
+
+        async for user in cursor:
+            batch.append(user)
+            if len(batch) >= batch_size:
+                await flush()
+        if batch:
+            await flush()
+        _matcher_loaded = True
+    return matcher
+
+
+async def refresh_user(user: dict):
+    """
+    Incrementally updates this process's matcher after a profile write. Does
+    nothing until the matcher has been loaded, since the initial load reads
+    current data. Other processes are not notified.
+    """
+    if _matcher_loaded:
+        await index_user(user)
+
+
+async def refresh_user_by_id(user_id: str):
+    """
+    Like ``refresh_user`` for writes that did not read the full document back,
+    such as item-level profile edits.
+    """
+    if _matcher_loaded:
+        user = await users_collection.find_one({"_id": ObjectId(user_id)})
+        if user is not None:
+            await index_user(user)
+
+
+async def match_freelancers(job_text: str, job_skills: Sequence[str], top_k: int = 50) -> List["Match"]:
+    """
+    Top ``top_k`` freelancers for a job description and its required skills.
+    """
+    from .embedding_service import get_embedder
+
+    matcher = await load_matcher()
+    vectors = await get_embedder().embed([job_text])
+    return matcher.match(vectors[0], job_skills, top_k=top_k)
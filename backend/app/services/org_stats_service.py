@@ -0,0 +1,183 @@
+# backend/app/services/org_stats_service.py
+
+"""
+Materialized per-organization dashboard statistics.
+
+Each organization has one ``org_stats`` document, ``_id`` = org id, kept current
+at write time with ``$inc``:
+
+* ``members``: active (not deleted) users whose ``org_id`` is the organization.
+* ``applied``, ``generated``, ``won``, ``lost``: lifetime proposal counters.
+  A proposal is applied when it is submitted, generated when a worker completes
+  it, and won or lost when its outcome is recorded.
+* ``weeks.<ISO week>``: the same proposal counters bucketed by the week of the
+  event (``created_at``, ``completed_at`` or ``outcome_at``), e.g.
+  ``weeks.2026-W42.applied``.
+
+The dashboard reads one document by ``_id``, projected to the weeks it shows.
+Counter updates are best effort: a failed ``$inc`` is logged and never fails the
+write that caused it. ``scripts/rebuild_org_stats.py`` recomputes every
+document from ``users`` and ``proposals``, reports drift and can repair it.
+"""
+
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from ..core.database import org_stats_collection, proposals_collection, users_collection
+
+logger = logging.getLogger(__name__)
+
+PROPOSAL_COUNTERS = ("applied", "generated", "won", "lost")
+COUNTERS = ("members",) + PROPOSAL_COUNTERS
+OUTCOMES = ("won", "lost")
+
+
+def week_key(moment: datetime) -> str:
+    """ISO week bucket of ``moment``, e.g. "2026-W42"."""
+    year, week, _ = moment.isocalendar()
+    return f"{year}-W{week:02d}"
+
+
+def recent_weeks(weeks: int, now: Optional[datetime] = None) -> List[str]:
+    """The last ``weeks`` ISO week keys, oldest first, ending with the current week."""
+    now = now or datetime.now(timezone.utc)
+    return [week_key(now - timedelta(weeks=offset)) for offset in range(weeks - 1, -1, -1)]
+
+
+async def record(org_id: Optional[str], at: Optional[datetime] = None, **deltas: int):
+    """
+    Adds ``deltas`` (counter name to amount) to ``org_id``'s statistics.
+    Proposal counters are also added to the bucket of the week of ``at``.
+    """
+    deltas = {name: amount for name, amount in deltas.items() if amount}
+    if not org_id or not deltas:
+        return
+    increments = dict(deltas)
+    bucket = week_key(at or datetime.now(timezone.utc))
+    for name, amount in deltas.items():
+        if name in PROPOSAL_COUNTERS:
+            increments[f"weeks.{bucket}.{name}"] = amount
+    try:
+        await org_stats_collection.update_one(
+            {"_id": org_id},
+            {"$inc": increments, "$set": {"updated_at": datetime.now(timezone.utc)}},
+            upsert=True,
+        )
+    except Exception:
+        logger.exception("Could not update org_stats for %s; rebuild_org_stats.py will repair it", org_id)
+
+
+def is_member(user: Optional[dict]) -> bool:
+    return bool(user and user.get("org_id") and not user.get("is_deleted"))
+
+
+async def record_membership_change(before: Optional[dict], after: Optional[dict]):
+    """Moves one member between organizations when ``org_id`` or ``is_deleted`` changed."""
+    old_org = before.get("org_id") if is_member(before) else None
+    new_org = after.get("org_id") if is_member(after) else None
+    if old_org != new_org:
+        await record(old_org, members=-1)
+        await record(new_org, members=1)
+
+
+async def record_outcome_change(org_id: Optional[str], before: Optional[str], before_at: Optional[datetime],
+                                after: Optional[str], after_at: Optional[datetime]):
+    """
+    Applies a proposal's outcome change, e.g. from none to "won" or "won" to
+    "lost". The old outcome leaves the week it was counted in.
+    """
+    if before == after and before_at and after_at and week_key(before_at) == week_key(after_at):
+        return
+    if before in OUTCOMES:
+        await record(org_id, at=before_at, **{before: -1})
+    if after in OUTCOMES:
+        await record(org_id, at=after_at, **{after: 1})
+
+
+async def get_org_stats(org_id: str, weeks: int = 12) -> dict:
+    """
+    Dashboard statistics for ``org_id`` with the last ``weeks`` weekly buckets,
+    zero-filled. One point read on ``_id``.
+    """
+    keys = recent_weeks(weeks)
+    projection = {name: 1 for name in COUNTERS}
+    projection.update({f"weeks.{key}": 1 for key in keys})
+    projection["updated_at"] = 1
+    document = await org_stats_collection.find_one({"_id": org_id}, projection) or {}
+
+    buckets = document.get("weeks") or {}
+    totals = {name: document.get(name, 0) for name in COUNTERS}
+    decided = totals["won"] + totals["lost"]
+    return {
+        "org_id": org_id,
+        **totals,
+        "win_rate": round(totals["won"] / decided, 4) if decided else None,
+        "weekly": [
+            {"week": key, **{name: (buckets.get(key) or {}).get(name, 0) for name in PROPOSAL_COUNTERS}}
+            for key in keys
+        ],
+        "updated_at": document.get("updated_at"),
+    }
+
+
+def _week_expression(field: str) -> dict:
+    """Aggregation expression for ``week_key`` of a date field."""
+    return {"$dateToString": {"format": "%G-W%V", "date": f"${field}"}}
+
+
+async def compute_org_stats(org_ids: Optional[List[str]] = None) -> Dict[str, dict]:
+    """
+    Recomputes statistics from the source collections, as ``{org_id: document}``
+    with the same counters and buckets ``record`` maintains.
+    """
+    stats: Dict[str, dict] = {}
+
+    def entry(org_id: str) -> dict:
+        return stats.setdefault(org_id, {**{name: 0 for name in COUNTERS}, "weeks": {}})
+
+    member_match = {"org_id": {"$in": org_ids} if org_ids else {"$type": "string"}, "is_deleted": {"$ne": True}}
+    async for row in users_collection.aggregate([
+        {"$match": member_match},
+        {"$group": {"_id": "$org_id", "members": {"$sum": 1}}},
+    ]):
+        if row["_id"]:
+            entry(row["_id"])["members"] = row["members"]
+
+    proposal_match = {"org_id": {"$in": org_ids} if org_ids else {"$type": "string"}}
+    events = (
+        ("applied", "created_at", {}),
+        ("generated", "completed_at", {"status": "completed"}),
+        ("won", "outcome_at", {"outcome": "won"}),
+        ("lost", "outcome_at", {"outcome": "lost"}),
+    )
+    for name, date_field, condition in events:
+        pipeline = [
+            {"$match": {**proposal_match, **condition, date_field: {"$type": "date"}}},
+            {"$group": {"_id": {"org": "$org_id", "week": _week_expression(date_field)}, "count": {"$sum": 1}}},
+        ]
+        async for row in proposals_collection.aggregate(pipeline, allowDiskUse=True):
+            org_id, week = row["_id"]["org"], row["_id"]["week"]
+            if not org_id:
+                continue
+            document = entry(org_id)
+            document[name] += row["count"]
+            document["weeks"].setdefault(week, {})[name] = row["count"]
+    return stats
+
+
+def drift(expected: dict, stored: Optional[dict]) -> Dict[str, tuple]:
+    """Fields whose stored value differs from the recomputed one, as ``{field: (stored, expected)}``."""
+    stored = stored or {}
+    differences = {}
+    for name in COUNTERS:
+        if stored.get(name, 0) != expected.get(name, 0):
+            differences[name] = (stored.get(name, 0), expected.get(name, 0))
+    stored_weeks, expected_weeks = stored.get("weeks") or {}, expected.get("weeks") or {}
+    for week in sorted(stored_weeks.keys() | expected_weeks.keys()):
+        for name in PROPOSAL_COUNTERS:
+            have = (stored_weeks.get(week) or {}).get(name, 0)
+            want = (expected_weeks.get(week) or {}).get(name, 0)
+            if have != want:
+                differences[f"weeks.{week}.{name}"] = (have, want)
+    return differences
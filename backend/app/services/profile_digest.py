@@ -0,0 +1,251 @@
+# backend/app/services/profile_digest.py
+
+"""
+Precomputed, token-counted profile digests for proposal prompts.
+
+A digest is the freelancer part of a prompt, condensed and already tokenized:
+name, headline, bio (cut to ``PROFILE_DIGEST_BIO_TOKENS``), the
+``PROFILE_DIGEST_MAX_SKILLS`` most endorsed skills, experience most recent
+first, and projects. Each line is stored with its token count, so the prompt
+builder fits a budget by adding up numbers instead of tokenizing text.
+
+Digests live on the user document as ``profile_digest`` and are rebuilt in the
+background after writes to the fields they are made from. ``hash`` covers those
+fields, the digest format and the tokenizer, so a digest that no longer matches
+its user (a write that skipped the rebuild, a tokenizer change) is detected on
+read and computed on the fly instead of being used. A digest also records the
+user ``version`` it was built at and its format: while both still match, it is
+trusted without hashing the profile again.
+"""
+
+import hashlib
+import json
+import logging
+import re
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from bson import ObjectId
+
+from ..core.config import settings
+from ..core.database import users_collection
+from ..core.metrics import stats_collector
+from ..core.tokenizer import get_tokenizer, truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+DIGEST_VERSION = 1
+
+# User fields a digest is made from; a write to any of them rebuilds it
+DIGEST_FIELDS = ("first_name", "last_name", "profile", "skills", "experience", "projects")
+DIGEST_PROJECTION = {
+    **{field: 1 for field in DIGEST_FIELDS},
+    "version": 1, "profile_digest.hash": 1, "profile_digest.version": 1, "profile_digest.format": 1,
+}
+
+# Times refresh_digest re-reads a user whose version moved under it
+REFRESH_ATTEMPTS = 3
+
+# Lines every prompt starts with, in budget priority order
+HEADER_PRIORITY = ("name", "headline", "skills", "bio")
+HEADER_ORDER = ("name", "headline", "bio", "skills")
+
+_stats = {"hits": 0, "computed": 0, "rebuilt": 0, "unchanged": 0, "skipped": 0}
+stats_collector("profile_digest", "Profile digest reads and background rebuilds", lambda: dict(_stats))
+
+
+def profile_entries(user: dict) -> Dict[str, Tuple[str, str]]:
+    """
+    The freelancer's past work as ``{key: (kind, text)}`` in profile order, with
+    keys like "experience:<item_id>" that are unique within the user.
+    """
+    entries: Dict[str, Tuple[str, str]] = {}
+    for index, item in enumerate(user.get("experience") or []):
+        text = f"{item.get('job_title')} at {item.get('company_name')}"
+        entries[f"experience:{item.get('item_id') or index}"] = ("experience", text)
+    for index, project in enumerate(user.get("projects") or []):
+        text = f"{project.get('project_title') or ''}\n{project.get('description') or ''}".strip()
+        if text:
+            entries[f"project:{project.get('item_id') or index}"] = ("project", text)
+    return entries
+
+
+def entry_line(kind: str, text: str) -> str:
+    text = text.replace("\n", " - ")
+    return f"{kind.capitalize()}: {text}"
+
+
+def digest_format() -> list:
+    """Everything besides the profile that a digest depends on."""
+    return [
+        DIGEST_VERSION, get_tokenizer().name, settings.PROFILE_DIGEST_MAX_SKILLS, settings.PROFILE_DIGEST_BIO_TOKENS
+    ]
+
+
+def source_hash(user: dict) -> str:
+    """Hash of everything a digest of ``user`` depends on."""
+    source = {field: user.get(field) for field in DIGEST_FIELDS}
+    source["_format"] = digest_format()
+    encoded = json.dumps(source, sort_keys=True, default=str, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def _built_at_version(user: dict) -> bool:
+    """Whether the stored digest was built from this very version of the user."""
+    stored = user.get("profile_digest") or {}
+    return (
+        user.get("version") is not None
+        and stored.get("version") == user.get("version")
+        and stored.get("format") == digest_format()
+    )
+
+
+def current_hash(user: dict) -> str:
+    """``source_hash(user)``, taken from the stored digest while it is at the user's version."""
+    if _built_at_version(user) and user["profile_digest"].get("hash"):
+        return user["profile_digest"]["hash"]
+    return source_hash(user)
+
+
+_YEAR_MONTH = re.compile(r"(\d{4})(?:-(\d{1,2}))?")
+
+
+def _date_key(value: Optional[str]) -> Tuple[int, int]:
+    match = _YEAR_MONTH.search(value or "")
+    if match is None:
+        return (0, 0)
+    return (int(match.group(1)), int(match.group(2) or 0))
+
+
+def _recency(item: dict) -> tuple:
+    current = bool(item.get("is_current")) or not item.get("end_date")
+    return (current, _date_key(item.get("end_date")), _date_key(item.get("start_date")))
+
+
+def build_digest(user: dict, digest_hash: Optional[str] = None) -> dict:
+    """Computes the digest of ``user``, which needs at least the ``DIGEST_FIELDS``."""
+    tokenizer = get_tokenizer()
+    profile = user.get("profile") or {}
+    header: Dict[str, str] = {}
+    name = " ".join(part for part in (user.get("first_name"), user.get("last_name")) if part)
+    if name:
+        header["name"] = f"Name: {name}"
+    if profile.get("headline"):
+        header["headline"] = f"Headline: {profile['headline']}"
+    if profile.get("bio"):
+        bio = truncate_to_tokens(profile["bio"], settings.PROFILE_DIGEST_BIO_TOKENS)
+        if bio:
+            header["bio"] = f"Bio: {bio}"
+    skills = [skill for skill in user.get("skills") or [] if skill.get("skill_name")]
+    # Most endorsed first; ties keep profile order
+    skills.sort(key=lambda skill: -(skill.get("endorsements") or 0))
+    if skills:
+        header["skills"] = "Skills: " + ", ".join(
+            skill["skill_name"] for skill in skills[:settings.PROFILE_DIGEST_MAX_SKILLS]
+        )
+
+    lines = [{"id": key, "text": header[key]} for key in HEADER_ORDER if key in header]
+    entries = profile_entries(user)
+    experience = list(enumerate(user.get("experience") or []))
+    experience.sort(key=lambda pair: _recency(pair[1]), reverse=True)
+    for index, item in experience:
+        key = f"experience:{item.get('item_id') or index}"
+        lines.append({"id": key, "text": entry_line(*entries[key])})
+    for key, (kind, text) in entries.items():
+        if kind == "project":
+            lines.append({"id": key, "text": entry_line(kind, text)})
+    for line in lines:
+        line["tokens"] = tokenizer.count(line["text"])
+
+    return {
+        "hash": digest_hash or source_hash(user),
+        "version": user.get("version"),
+        "format": digest_format(),
+        "tokenizer": tokenizer.name,
+        "lines": lines,
+        "tokens": sum(line["tokens"] for line in lines),
+        "built_at": datetime.now(timezone.utc),
+    }
+
+
+def digest_for(user: dict) -> dict:
+    """
+    The user's stored digest if it is current, else one computed now. The
+    profile is only hashed when the user's version moved past the digest's.
+    """
+    digest_hash = current_hash(user)
+    stored = user.get("profile_digest")
+    if stored and stored.get("hash") == digest_hash and stored.get("lines") is not None:
+        _stats["hits"] += 1
+        return stored
+    _stats["computed"] += 1
+    return build_digest(user, digest_hash)
+
+
+def fit_digest(digest: dict, budget: int, entry_keys: Optional[Iterable[str]] = None) -> List[str]:
+    """
+    Prompt lines from ``digest`` totalling at most ``budget`` tokens, counting
+    one per line break. Header lines go first in ``HEADER_PRIORITY`` order, then
+    past work: the entries in ``entry_keys`` in that order if given (e.g. the
+    retrieved context), otherwise all of it in digest order. A line that does
+    not fit is skipped so shorter ones after it can still be used.
+    """
+    by_id = {line["id"]: line for line in digest["lines"]}
+    if entry_keys is None:
+        entry_keys = [line["id"] for line in digest["lines"] if line["id"] not in HEADER_ORDER]
+    chosen = set()
+    used = 0
+    for key in (*HEADER_PRIORITY, *entry_keys):
+        line = by_id.get(key)
+        if line is None or key in chosen:
+            continue
+        cost = line["tokens"] + 1
+        if used + cost <= budget:
+            chosen.add(key)
+            used += cost
+    order = [key for key in HEADER_ORDER if key in chosen]
+    order += [key for key in entry_keys if key in chosen and key not in HEADER_ORDER]
+    return [by_id[key]["text"] for key in dict.fromkeys(order)]
+
+
+def digest_update(user: dict) -> Optional[Tuple[dict, str]]:
+    """
+    ``($set, outcome)`` bringing the stored digest of ``user`` (read with
+    ``DIGEST_PROJECTION``) up to date, or None if it already is. A digest whose
+    content still matches only has its version moved along.
+    """
+    if _built_at_version(user):
+        return None
+    stored = user.get("profile_digest") or {}
+    digest_hash = source_hash(user)
+    if stored.get("hash") != digest_hash:
+        return {"profile_digest": build_digest(user, digest_hash)}, "rebuilt"
+    return {"profile_digest.version": user.get("version"), "profile_digest.format": digest_format()}, "unchanged"
+
+
+async def refresh_digest(user_id: str):
+    """
+    Rebuilds and stores a user's digest after a profile write. The write is
+    conditional on the version read; when any other write (a password change,
+    another edit) bumps the version in between, the user is read again and
+    the digest recomputed, up to ``REFRESH_ATTEMPTS`` times.
+    """
+    try:
+        for _ in range(REFRESH_ATTEMPTS):
+            user = await users_collection.find_one({"_id": ObjectId(user_id)}, DIGEST_PROJECTION)
+            if user is None:
+                return
+            pending = digest_update(user)
+            if pending is None:
+                _stats["unchanged"] += 1
+                return
+            update, outcome = pending
+            result = await users_collection.update_one(
+                {"_id": user["_id"], "version": user.get("version")}, {"$set": update}
+            )
+            if result.matched_count:
+                _stats[outcome] += 1
+                return
+        _stats["skipped"] += 1
+    except Exception:
+        logger.exception("Could not rebuild the profile digest of %s; prompts compute it until the next edit", user_id)
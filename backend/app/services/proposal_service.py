@@ -0,0 +1,556 @@
+# backend/app/services/proposal_service.py
+
+"""
+Background proposal generation.
+
+``POST /proposals`` stores a queued proposal document and hands it to a broker;
+a pool of async workers claims jobs, streams tokens from the AI agent and writes
+the finished proposal back to the ``proposals`` collection.
+
+Two brokers are available:
+
+- ``MongoBroker`` (default) uses the ``proposals`` collection itself as the queue.
+  Workers claim jobs atomically with ``find_one_and_update`` and hold a lease that
+  they renew while generating, so jobs from a crashed worker are picked up again.
+  Workers can run inside the API processes or as a separate process:
+  ``python -m app.services.proposal_service``.
+- ``LocalBroker`` dispatches through an in-process ``asyncio.Queue``. It needs no
+  polling and is meant for single-process deployments and load tests.
+
+Each process runs at most ``PROPOSAL_ORG_CONCURRENCY`` jobs of one organization
+at a time. The limit is counted per process, not across the deployment: with N
+processes running workers an organization can have up to N times that many jobs
+generating at once. ``PROPOSAL_MAX_QUEUED_PER_ORG``, checked in MongoDB, is the
+deployment-wide bound on what an organization can have waiting.
+
+Tokens reach SSE clients through the in-process ``TokenHub`` when the job runs in
+the same process as the request; otherwise the stream endpoint falls back to
+polling the document, which workers flush every ``PROPOSAL_FLUSH_INTERVAL``.
+"""
+
+import asyncio
+import logging
+import os
+import socket
+import time
+from collections import defaultdict, deque
+from datetime import datetime, timedelta, timezone
+from typing import AsyncIterator, Deque, Dict, List, Optional, Set, Tuple
+
+from bson import ObjectId
+from pymongo import ReturnDocument
+
+from ..core.config import settings
+from ..core.database import proposals_collection, users_collection
+from . import org_stats_service
+
+logger = logging.getLogger(__name__)
+
+# Lifecycle of a proposal generation job
+PROPOSAL_QUEUED = "queued"
+PROPOSAL_RUNNING = "running"
+PROPOSAL_COMPLETED = "completed"
+PROPOSAL_FAILED = "failed"
+TERMINAL_STATUSES = (PROPOSAL_COMPLETED, PROPOSAL_FAILED)
+# Hub event ending a subscription whose job continues elsewhere
+HANDED_OFF = "handed_off"
+
+# Fields a worker needs from the freelancer's document to write a proposal
+USER_PROMPT_PROJECTION = {
+    "first_name": 1, "last_name": 1, "org_id": 1, "profile": 1,
+    "skills": 1, "experience": 1, "projects": 1, "profile_digest": 1, "version": 1,
+}
+
+
+class LeaseLost(Exception):
+    """Raised when a job's claim is no longer this worker's, e.g. after its lease expired."""
+
+
+class ProposalQueueFull(Exception):
+    """Raised when accepting another job would exceed the queue limits."""
+
+    def __init__(self, retry_after: int):
+        super().__init__("Proposal queue is full")
+        self.retry_after = retry_after
+
+
+def _now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class TokenHub:
+    """
+    In-process fan-out of generated tokens to stream subscribers. Tokens are
+    buffered per job so late subscribers replay what they missed; finished jobs
+    are forgotten after ``retain_seconds``.
+    """
+
+    def __init__(self, retain_seconds: float = 30.0):
+        self.retain_seconds = retain_seconds
+        self._buffers: Dict[str, List[str]] = {}
+        self._subscribers: Dict[str, List[asyncio.Queue]] = defaultdict(list)
+        self._finished: Dict[str, Tuple[float, str, Optional[str]]] = {}
+
+    def open(self, job_id: str):
+        self._buffers[job_id] = []
+        self._finished.pop(job_id, None)
+
+    def publish(self, job_id: str, token: str):
+        buffer = self._buffers.get(job_id)
+        if buffer is None:
+            return
+        buffer.append(token)
+        for queue in self._subscribers.get(job_id, ()):
+            queue.put_nowait(("token", token))
+
+    def close(self, job_id: str, status: str, error: Optional[str] = None):
+        self._finished[job_id] = (time.monotonic(), status, error)
+        for queue in self._subscribers.pop(job_id, ()):
+            queue.put_nowait((status, error))
+        self._expire()
+
+    def hand_off(self, job_id: str):
+        """
+        Ends the job's subscriptions without a status: the job went back to the
+        queue or to another worker, and subscribers carry on polling MongoDB.
+        """
+        for queue in self._subscribers.pop(job_id, ()):
+            queue.put_nowait((HANDED_OFF, None))
+        self._buffers.pop(job_id, None)
+        self._finished.pop(job_id, None)
+
+    def _expire(self):
+        cutoff = time.monotonic() - self.retain_seconds
+        for job_id, (finished_at, _, _) in list(self._finished.items()):
+            if finished_at < cutoff:
+                del self._finished[job_id]
+                self._buffers.pop(job_id, None)
+
+    def knows(self, job_id: str) -> bool:
+        return job_id in self._buffers
+
+    async def subscribe(self, job_id: str) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """
+        Yields ("token", text) events, then one (status, error) event.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for token in self._buffers.get(job_id, ()):
+            queue.put_nowait(("token", token))
+        finished = self._finished.get(job_id)
+        if finished is not None:
+            queue.put_nowait((finished[1], finished[2]))
+        else:
+            self._subscribers[job_id].append(queue)
+        try:
+            while True:
+                kind, data = await queue.get()
+                yield kind, data
+                if kind != "token":
+                    return
+        finally:
+            subscribers = self._subscribers.get(job_id)
+            if subscribers and queue in subscribers:
+                subscribers.remove(queue)
+
+
+class MongoBroker:
+    """
+    Uses the proposals collection as a durable queue shared by all processes.
+    """
+
+    def __init__(self, collection, lease_seconds: float, poll_interval: float, max_queued_per_org: int):
+        self.collection = collection
+        self.lease_seconds = lease_seconds
+        self.poll_interval = poll_interval
+        self.max_queued_per_org = max_queued_per_org
+
+    async def check_capacity(self, org_key: str):
+        queued = await self.collection.count_documents(
+            {"queue_key": org_key, "status": PROPOSAL_QUEUED}, limit=self.max_queued_per_org
+        )
+        if queued >= self.max_queued_per_org:
+            raise ProposalQueueFull(retry_after=max(1, int(self.poll_interval * 4)))
+
+    async def submit(self, document: dict):
+        pass  # the inserted document is the queue entry
+
+    async def claim(self, worker_id: str, exclude_keys: Set[str]) -> Optional[dict]:
+        now = _now()
+        query = {
+            "$or": [
+                {"status": PROPOSAL_QUEUED},
+                # Jobs whose worker stopped renewing its lease
+                {"status": PROPOSAL_RUNNING, "lease_expires_at": {"$lt": now}},
+            ]
+        }
+        if exclude_keys:
+            query["queue_key"] = {"$nin": list(exclude_keys)}
+        job = await self.collection.find_one_and_update(
+            query,
+            {
+                "$set": {
+                    "status": PROPOSAL_RUNNING,
+                    "worker_id": worker_id,
+                    "started_at": now,
+                    "lease_expires_at": now + timedelta(seconds=self.lease_seconds),
+                },
+                "$inc": {"attempts": 1},
+            },
+            sort=[("created_at", 1)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if job is None:
+            await asyncio.sleep(self.poll_interval)
+        return job
+
+    async def release(self, job: dict, worker_id: str):
+        """Hands a claimed job back to the queue without counting the attempt."""
+        await self.collection.update_one(
+            {"_id": job["_id"], "status": PROPOSAL_RUNNING, "worker_id": worker_id},
+            {"$set": {"status": PROPOSAL_QUEUED}, "$unset": {"lease_expires_at": ""}, "$inc": {"attempts": -1}},
+        )
+
+
+class LocalBroker:
+    """
+    In-process dispatch through a bounded ``asyncio.Queue``. Queued jobs live only
+    in memory, so this broker suits single-process deployments and load tests.
+    """
+
+    def __init__(self, max_queued_per_org: int, maxsize: int = 0):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=maxsize)
+        self.max_queued_per_org = max_queued_per_org
+        self._queued_per_key: Dict[str, int] = defaultdict(int)
+
+    async def check_capacity(self, org_key: str):
+        if self.queue.full() or self._queued_per_key[org_key] >= self.max_queued_per_org:
+            raise ProposalQueueFull(retry_after=1)
+
+    async def submit(self, document: dict):
+        try:
+            self.queue.put_nowait(document)
+        except asyncio.QueueFull:
+            raise ProposalQueueFull(retry_after=1)
+        self._queued_per_key[document["queue_key"]] += 1
+
+    async def claim(self, worker_id: str, exclude_keys: Set[str]) -> Optional[dict]:
+        try:
+            document = await asyncio.wait_for(self.queue.get(), timeout=1.0)
+        except asyncio.TimeoutError:
+            return None
+        self._queued_per_key[document["queue_key"]] -= 1
+        return document
+
+
+def queue_key(user_id: str, org_id: Optional[str]) -> str:
+    """Concurrency bucket for a job: the organization, or the user if they have none."""
+    return f"org:{org_id}" if org_id else f"user:{user_id}"
+
+
+class ProposalService:
+    """
+    Submits proposal jobs and runs the worker pool that completes them.
+    """
+
+    def __init__(
+        self,
+        proposals=None,
+        users=None,
+        broker=None,
+        hub: Optional[TokenHub] = None,
+        concurrency: Optional[int] = None,
+        per_org_limit: Optional[int] = None,
+        flush_interval: Optional[float] = None,
+    ):
+        self.proposals = proposals if proposals is not None else proposals_collection
+        self.users = users if users is not None else users_collection
+        self.broker = broker or _default_broker(self.proposals)
+        self.hub = hub or TokenHub()
+        self.concurrency = concurrency or settings.PROPOSAL_WORKER_CONCURRENCY
+        self.per_org_limit = per_org_limit or settings.PROPOSAL_ORG_CONCURRENCY
+        self.flush_interval = flush_interval if flush_interval is not None else settings.PROPOSAL_FLUSH_INTERVAL
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}"
+        self._running_per_key: Dict[str, int] = defaultdict(int)
+        # Jobs claimed from a LocalBroker while their org was at its limit. A
+        # MongoBroker job in that position goes back to the queue instead, since
+        # its lease would expire while parked and another worker would run it too
+        self._parked: Dict[str, Deque[dict]] = defaultdict(deque)
+        self._tasks: List[asyncio.Task] = []
+        self.completed = 0
+        self.failed = 0
+
+    async def submit(self, user_id: str, org_id: Optional[str], job: dict) -> dict:
+        """
+        Stores a queued proposal and hands it to the broker. Raises
+        ``ProposalQueueFull`` when the caller's organization has too many waiting.
+        """
+        key = queue_key(user_id, org_id)
+        await self.broker.check_capacity(key)
+        document = {
+            **job,
+            "user_id": user_id,
+            "org_id": org_id,
+            "queue_key": key,
+            "status": PROPOSAL_QUEUED,
+            "content": "",
+            "attempts": 0,
+            "created_at": _now(),
+        }
+        result = await self.proposals.insert_one(document)
+        document["_id"] = result.inserted_id
+        try:
+            await self.broker.submit(document)
+        except ProposalQueueFull:
+            await self.proposals.delete_one({"_id": result.inserted_id})
+            raise
+        await org_stats_service.record(org_id, at=document["created_at"], applied=1)
+        return document
+
+    # Worker pool
+
+    def start(self):
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._worker_loop()) for _ in range(self.concurrency)]
+            logger.info("Started %d proposal workers (%s)", self.concurrency, type(self.broker).__name__)
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def _saturated_keys(self) -> Set[str]:
+        return {key for key, running in self._running_per_key.items() if running >= self.per_org_limit}
+
+    async def _next_job(self) -> Optional[dict]:
+        for key, parked in self._parked.items():
+            if parked and self._running_per_key[key] < self.per_org_limit:
+                return parked.popleft()
+        job = await self.broker.claim(self.worker_id, self._saturated_keys())
+        if job is not None and self._running_per_key[job["queue_key"]] >= self.per_org_limit:
+            if isinstance(self.broker, MongoBroker):
+                await self.broker.release(job, self.worker_id)
+                await asyncio.sleep(self.broker.poll_interval)
+            else:
+                self._parked[job["queue_key"]].append(job)
+            return None
+        return job
+
+    async def _worker_loop(self):
+        while True:
+            try:
+                job = await self._next_job()
+                if job is not None:
+                    await self._run(job)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Proposal worker loop error")
+                await asyncio.sleep(1.0)
+
+    def _claim_filter(self, job: dict) -> dict:
+        """
+        Matches the job only while this claim of it is still current. Every claim
+        counts an attempt, so ``attempts`` tells apart two claims by one process.
+        """
+        return {"_id": job["_id"], "status": PROPOSAL_RUNNING, "worker_id": self.worker_id,
+                "attempts": job.get("attempts")}
+
+    async def _run(self, job: dict):
+        job_id = str(job["_id"])
+        key = job["queue_key"]
+        self._running_per_key[key] += 1
+        self.hub.open(job_id)
+        content: List[str] = []
+        try:
+            if job.get("status") != PROPOSAL_RUNNING:
+                await self.proposals.update_one(
+                    {"_id": job["_id"]},
+                    {"$set": {"status": PROPOSAL_RUNNING, "worker_id": self.worker_id, "started_at": _now()}, "$inc": {"attempts": 1}},
+                )
+                job = {**job, "status": PROPOSAL_RUNNING, "attempts": (job.get("attempts") or 0) + 1}
+            await self._generate_leased(job, content)
+            completed_at = _now()
+            # Only the current claim completes the job, so it counts towards the stats once
+            result = await self.proposals.update_one(
+                self._claim_filter(job),
+                {"$set": {"status": PROPOSAL_COMPLETED, "content": "".join(content), "completed_at": completed_at},
+                 "$unset": {"lease_expires_at": ""}},
+            )
+            if not result.matched_count:
+                raise LeaseLost()
+            await org_stats_service.record(job.get("org_id"), at=completed_at, generated=1)
+            self.completed += 1
+            self.hub.close(job_id, PROPOSAL_COMPLETED)
+        except LeaseLost:
+            logger.warning("Lost the lease on proposal %s; another worker has taken it over", job_id)
+            self.hub.hand_off(job_id)
+        except asyncio.CancelledError:
+            # Shutting down: hand the job back for another worker
+            await self.proposals.update_one(
+                self._claim_filter(job),
+                {"$set": {"status": PROPOSAL_QUEUED, "content": ""}, "$unset": {"lease_expires_at": ""}},
+            )
+            self.hub.hand_off(job_id)
+            raise
+        except Exception as exc:
+            logger.exception("Proposal %s failed", job_id)
+            result = await self.proposals.update_one(
+                self._claim_filter(job),
+                {"$set": {"status": PROPOSAL_FAILED, "error": str(exc), "completed_at": _now()},
+                 "$unset": {"lease_expires_at": ""}},
+            )
+            if result.matched_count:
+                self.failed += 1
+                self.hub.close(job_id, PROPOSAL_FAILED, str(exc))
+            else:
+                self.hub.hand_off(job_id)
+        finally:
+            self._running_per_key[key] -= 1
+            if not self._running_per_key[key]:
+                del self._running_per_key[key]
+
+    async def _generate(self, job: dict, content: List[str]):
+        # Imported on first use so processes that never generate skip the AI stack
+        from .ai_agent_service import generate_proposal
+
+        job_id = str(job["_id"])
+        user = await self.users.find_one({"_id": ObjectId(job["user_id"])}, USER_PROMPT_PROJECTION) or {}
+        last_flush = time.monotonic()
+        async for token in generate_proposal(user, job, use_cache=job.get("use_cache", True)):
+            content.append(token)
+            self.hub.publish(job_id, token)
+            if time.monotonic() - last_flush >= self.flush_interval:
+                last_flush = time.monotonic()
+                await self._flush(job, "".join(content))
+
+    async def _generate_leased(self, job: dict, content: List[str]):
+        """
+        Runs ``_generate`` while a heartbeat renews a MongoBroker lease, including
+        during retrieval and before the first token. Raises ``LeaseLost`` as soon
+        as the lease turns out to be gone, cancelling the generation.
+        """
+        if not isinstance(self.broker, MongoBroker):
+            await self._generate(job, content)
+            return
+        generation = asyncio.ensure_future(self._generate(job, content))
+        heartbeat = asyncio.ensure_future(self._heartbeat(job))
+        try:
+            await asyncio.wait((generation, heartbeat), return_when=asyncio.FIRST_COMPLETED)
+            if not generation.done():
+                heartbeat.result()
+            generation.result()
+        finally:
+            generation.cancel()
+            heartbeat.cancel()
+            await asyncio.gather(generation, heartbeat, return_exceptions=True)
+
+    async def _heartbeat(self, job: dict):
+        """Renews the lease every third of its length; returns by raising ``LeaseLost``."""
+        lease_seconds = self.broker.lease_seconds
+        while True:
+            await asyncio.sleep(lease_seconds / 3)
+            try:
+                result = await self.proposals.update_one(
+                    self._claim_filter(job),
+                    {"$set": {"lease_expires_at": _now() + timedelta(seconds=lease_seconds)}},
+                )
+            except Exception:
+                # The next beat may get through before the lease runs out
+                logger.warning("Could not renew the lease on proposal %s", job["_id"], exc_info=True)
+                continue
+            if not result.matched_count:
+                raise LeaseLost()
+
+    async def _flush(self, job: dict, content: str):
+        result = await self.proposals.update_one(self._claim_filter(job), {"$set": {"content": content}})
+        if not result.matched_count:
+            raise LeaseLost()
+
+    # Streaming
+
+    async def stream(self, proposal_id: str) -> AsyncIterator[Tuple[str, Optional[str]]]:
+        """
+        Yields ("token", text) events for a proposal followed by one terminal
+        (status, error) event. A ("restart", None) event means the job is being
+        generated again by another attempt and the text so far is discarded. Uses the in-process hub when this process is
+        generating the proposal, and polls MongoDB otherwise.
+        """
+        sent = 0
+        while True:
+            if self.hub.knows(proposal_id):
+                # Replayed tokens include whatever was already sent from polling
+                async for kind, data in self.hub.subscribe(proposal_id):
+                    if kind == HANDED_OFF:
+                        break
+                    if kind == "token" and sent:
+                        if len(data) <= sent:
+                            sent -= len(data)
+                            continue
+                        data, sent = data[sent:], 0
+                    yield kind, data
+                else:
+                    return
+                # The job is generated again from the start, by whichever worker claims it
+                yield "restart", None
+                sent = 0
+                continue
+
+            document = await self.proposals.find_one(
+                {"_id": ObjectId(proposal_id)}, {"status": 1, "content": 1, "error": 1}
+            )
+            if document is None:
+                yield PROPOSAL_FAILED, "Proposal not found"
+                return
+            content = document.get("content") or ""
+            if len(content) < sent:
+                yield "restart", None
+                sent = 0
+            if len(content) > sent:
+                yield "token", content[sent:]
+                sent = len(content)
+            if document["status"] in TERMINAL_STATUSES:
+                yield document["status"], document.get("error")
+                return
+            await asyncio.sleep(settings.PROPOSAL_POLL_INTERVAL)
+
+
+def _default_broker(proposals):
+    if settings.PROPOSAL_QUEUE_BACKEND == "local":
+        return LocalBroker(settings.PROPOSAL_MAX_QUEUED_PER_ORG, settings.PROPOSAL_LOCAL_QUEUE_SIZE)
+    return MongoBroker(
+        proposals,
+        lease_seconds=settings.PROPOSAL_LEASE_SECONDS,
+        poll_interval=settings.PROPOSAL_POLL_INTERVAL,
+        max_queued_per_org=settings.PROPOSAL_MAX_QUEUED_PER_ORG,
+    )
+
+
+_service: Optional[ProposalService] = None
+
+
+def get_proposal_service() -> ProposalService:
+    global _service
+    if _service is None:
+        _service = ProposalService()
+    return _service
+
+
+async def run_worker_process():
+    """
+    Runs only the worker pool, for deployments that keep generation out of the
+    API processes. Requires the Mongo broker.
+    """
+    if settings.PROPOSAL_QUEUE_BACKEND != "mongo":
+        raise SystemExit("A separate worker process needs PROPOSAL_QUEUE_BACKEND=mongo")
+    service = get_proposal_service()
+    service.start()
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await service.stop()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
+    asyncio.run(run_worker_process())
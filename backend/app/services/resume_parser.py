@@ -0,0 +1,368 @@
+# backend/app/services/resume_parser.py
+
+"""
+Resume text extraction and structuring, run in parser worker processes.
+
+This module only uses the standard library (plus ``pypdf`` for PDFs, imported
+when a PDF arrives) and never imports the rest of the application, so a freshly
+spawned worker starts in milliseconds.
+
+``parse_resume`` sniffs the file type from its first bytes, extracts plain text
+and maps the education, experience and skills sections onto dictionaries shaped
+like the profile models. Extraction checks a deadline between pages and
+paragraphs, so an oversized document stops with ``ResumeParseTimeout`` instead
+of occupying its worker indefinitely.
+"""
+
+import codecs
+import re
+import time
+import zipfile
+from typing import Dict, List, Optional, Tuple
+from xml.etree import ElementTree
+
+# Bumped whenever parsing changes, so cached results from older versions are ignored
+PARSER_VERSION = 1
+
+MAX_TEXT_CHARS = 200_000
+MAX_DOCX_XML_BYTES = 50 * 1024 * 1024
+MAX_SKILLS = 100
+
+_WORD_NS = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+
+
+class ResumeParseError(ValueError):
+    """The file cannot be read as a resume."""
+
+
+class ResumeParseTimeout(ResumeParseError):
+    """Parsing ran past its deadline."""
+
+
+# Extraction
+
+def sniff_kind(head: bytes) -> str:
+    if head.startswith(b"%PDF-"):
+        return "pdf"
+    if head.startswith(b"PK\x03\x04"):
+        return "docx"
+    if head.startswith((codecs.BOM_UTF8, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)) or b"\x00" not in head:
+        return "text"
+    raise ResumeParseError("Unsupported file type; upload a PDF, DOCX or plain text resume")
+
+
+def _check_deadline(deadline: float):
+    if time.monotonic() > deadline:
+        raise ResumeParseTimeout("Resume took too long to parse")
+
+
+def _pdf_text(path: str, max_pages: int, deadline: float) -> Tuple[List[str], int]:
+    try:
+        from pypdf import PdfReader
+        from pypdf.errors import PdfReadError
+    except ImportError:
+        raise ResumeParseError("PDF resumes need the pypdf package")
+    try:
+        reader = PdfReader(path)
+        pages = []
+        for page in reader.pages[:max_pages]:
+            _check_deadline(deadline)
+            pages.append(page.extract_text() or "")
+        return pages, len(reader.pages)
+    except (PdfReadError, ValueError, KeyError) as exc:
+        if isinstance(exc, ResumeParseError):
+            raise
+        raise ResumeParseError(f"Unreadable PDF: {exc}")
+
+
+def _docx_text(path: str, deadline: float) -> Tuple[List[str], int]:
+    try:
+        with zipfile.ZipFile(path) as archive:
+            info = archive.getinfo("word/document.xml")
+            if info.file_size > MAX_DOCX_XML_BYTES:
+                raise ResumeParseError("DOCX document is too large")
+            paragraphs, parts = [], []
+            with archive.open(info) as document:
+                # Streams the XML so only the current paragraph is held in memory
+                for event, element in ElementTree.iterparse(document, events=("end",)):
+                    if element.tag == f"{_WORD_NS}t":
+                        parts.append(element.text or "")
+                    elif element.tag == f"{_WORD_NS}tab":
+                        parts.append("\t")
+                    elif element.tag == f"{_WORD_NS}p":
+                        paragraphs.append("".join(parts))
+                        parts = []
+                        element.clear()
+                        if len(paragraphs) % 200 == 0:
+                            _check_deadline(deadline)
+            return ["\n".join(paragraphs)], 1
+    except (zipfile.BadZipFile, KeyError, ElementTree.ParseError) as exc:
+        raise ResumeParseError(f"Unreadable DOCX: {exc}")
+
+
+def _plain_text(path: str) -> Tuple[List[str], int]:
+    with open(path, "rb") as handle:
+        data = handle.read(MAX_TEXT_CHARS * 4)
+    if data.startswith((codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)):
+        return [data.decode("utf-16", errors="replace")], 1
+    try:
+        return [data.decode("utf-8-sig")], 1
+    except UnicodeDecodeError:
+        return [data.decode("cp1252", errors="replace")], 1
+
+
+def extract_text(path: str, max_pages: int, deadline: float) -> Tuple[str, str, int]:
+    """``(kind, text, pages)`` of the file at ``path``."""
+    with open(path, "rb") as handle:
+        kind = sniff_kind(handle.read(4096))
+    if kind == "pdf":
+        pages, page_count = _pdf_text(path, max_pages, deadline)
+    elif kind == "docx":
+        pages, page_count = _docx_text(path, deadline)
+    else:
+        pages, page_count = _plain_text(path)
+    return kind, "\n".join(pages), page_count
+
+
+# Structuring
+
+SECTION_HEADINGS = {
+    "education": {"education", "academic background", "education and training", "qualifications"},
+    "experience": {"experience", "work experience", "professional experience", "employment",
+                   "employment history", "work history", "career history"},
+    "skills": {"skills", "technical skills", "core skills", "key skills", "skills and tools", "skills & tools",
+               "technologies", "tools", "competencies", "core competencies"},
+    "other": {"summary", "profile", "about me", "objective", "projects", "certifications", "certificates",
+              "languages", "interests", "hobbies", "references", "awards", "publications", "volunteering",
+              "contact", "personal projects"},
+}
+_HEADING_OF = {heading: section for section, headings in SECTION_HEADINGS.items() for heading in headings}
+
+_MONTHS = {name: index for index, name in enumerate(
+    ("jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"), start=1)}
+_DATE = r"(?:(?:jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+\d{4}|\d{1,2}/\d{4}|(?:19|20)\d{2})"
+_OPEN_END = r"present|current|now|today"
+_RANGE_RE = re.compile(rf"\(?(?P<start>{_DATE})\s*(?:-|–|—|to|until)\s*(?P<end>{_DATE}|{_OPEN_END})\)?", re.I)
+_SINGLE_DATE_RE = re.compile(rf"\(?(?P<date>{_DATE})\)?", re.I)
+_BULLET_RE = re.compile(r"^\s*[•▪◦●*\-–]\s+")
+_SEPARATOR_RE = re.compile(r"\s*(?:\||,|;|\s[-–—]\s|\t)\s*")
+_AT_RE = re.compile(r"\s+(?:at|@)\s+", re.I)
+
+_TITLE_WORDS = re.compile(
+    r"\b(engineer|developer|programmer|manager|designer|consultant|analyst|lead|intern|scientist|architect|"
+    r"director|specialist|freelancer?|contractor|officer|administrator|head|founder|co-founder|cto|ceo|vp|"
+    r"writer|editor|teacher|assistant|researcher|coordinator|associate|technician|owner|partner|principal)\b",
+    re.I,
+)
+_SCHOOL_WORDS = re.compile(r"\b(universi\w*|college|institute|school|academy|polytechnic|polit\w*cnica)\b", re.I)
+_DEGREE_RE = re.compile(
+    r"\b(bachelor(?:'s)?(?:\s+of\s+\w+)?|master(?:'s)?(?:\s+of\s+\w+)?|doctor(?:ate)?(?:\s+of\s+\w+)?|"
+    r"b\.?sc\.?|m\.?sc\.?|b\.?s\.|m\.?s\.|b\.?a\.|m\.?a\.|b\.?eng\.?|m\.?eng\.?|ph\.?d\.?|mba|"
+    r"associate(?:'s)?\s+degree|diploma|certificate|high school diploma|ged)(?=\W|$)",
+    re.I,
+)
+_LEVELS = {"beginner", "basic", "intermediate", "advanced", "expert", "proficient", "fluent", "native"}
+
+
+def _normalize_date(value: str) -> str:
+    """"Jan 2020" -> "2020-01", "3/2019" -> "2019-03", "2018" -> "2018"."""
+    value = value.strip().rstrip(".")
+    month_year = re.match(r"([a-z]+)\.?\s+(\d{4})$", value, re.I)
+    if month_year:
+        month = _MONTHS.get(month_year.group(1)[:3].lower())
+        return f"{month_year.group(2)}-{month:02d}" if month else month_year.group(2)
+    numeric = re.match(r"(\d{1,2})/(\d{4})$", value)
+    if numeric:
+        return f"{numeric.group(2)}-{int(numeric.group(1)):02d}"
+    return value
+
+
+def _heading(line: str) -> Optional[str]:
+    key = line.strip().rstrip(":").strip().lower()
+    if len(key) > 40:
+        return None
+    return _HEADING_OF.get(key)
+
+
+def split_sections(text: str) -> Dict[str, List[str]]:
+    """Non-empty lines of each recognized section, keyed by section name."""
+    sections: Dict[str, List[str]] = {}
+    current = None
+    for raw in text.splitlines():
+        line = raw.strip()
+        if not line:
+            continue
+        section = _heading(line)
+        if section is not None:
+            current = section
+            continue
+        if current and current != "other":
+            sections.setdefault(current, []).append(line)
+    return sections
+
+
+def _parts(text: str) -> List[str]:
+    return [part.strip(" .()") for part in _SEPARATOR_RE.split(text) if part.strip(" .()")]
+
+
+def _title_and_company(header: str, previous: Optional[str]) -> Optional[Tuple[str, str]]:
+    at = _AT_RE.split(header, maxsplit=1)
+    if len(at) == 2 and at[0].strip() and at[1].strip():
+        return at[0].strip(" ,|"), at[1].strip(" ,|")
+    parts = _parts(header)
+    if len(parts) == 1 and previous:
+        parts = _parts(previous) + parts
+    if len(parts) < 2:
+        return None
+    first, second = parts[0], parts[1]
+    if _TITLE_WORDS.search(second) and not _TITLE_WORDS.search(first):
+        return second, first
+    return first, second
+
+
+def parse_experience(lines: List[str]) -> List[dict]:
+    """One entry per line carrying a date range; title and company come from that line or the one above."""
+    entries, previous = [], None
+    for line in lines:
+        if _BULLET_RE.match(line):
+            previous = None
+            continue
+        match = _RANGE_RE.search(line)
+        if match is None:
+            previous = line
+            continue
+        header = (line[:match.start()] + " " + line[match.end():]).strip(" ,|-–—\t")
+        names = _title_and_company(header, previous) if header else (
+            _title_and_company(previous, None) if previous else None
+        )
+        previous = None
+        if names is None:
+            continue
+        end = match.group("end")
+        is_current = end.lower() in _OPEN_END.split("|")
+        entries.append({
+            "job_title": names[0],
+            "company_name": names[1],
+            "start_date": _normalize_date(match.group("start")),
+            "end_date": None if is_current else _normalize_date(end),
+            "is_current": is_current,
+        })
+    return entries
+
+
+def _degree_and_field(part: str) -> Tuple[str, str]:
+    match = _DEGREE_RE.search(part)
+    degree = match.group(0).strip()
+    rest = part[match.end():].strip(" ,.:-")
+    if re.match(r"(?:in|of)\s+", rest, re.I):
+        rest = re.sub(r"^(?:in|of)\s+", "", rest, flags=re.I)
+    field = rest.split(" in ")[-1].strip() if " in " in rest else rest
+    return degree, field
+
+
+def parse_education(lines: List[str]) -> List[dict]:
+    """Groups consecutive lines into entries; a second school or degree starts the next entry."""
+    entries: List[dict] = []
+    current: dict = {}
+
+    def flush():
+        if current.get("school_name") and current.get("degree"):
+            entries.append({
+                "school_name": current["school_name"],
+                "degree": current["degree"],
+                "field_of_study": current.get("field_of_study", ""),
+                "start_date": current.get("start_date", ""),
+                "end_date": current.get("end_date"),
+            })
+        current.clear()
+
+    for line in lines:
+        if _BULLET_RE.match(line):
+            continue
+        dates = {}
+        match = _RANGE_RE.search(line)
+        if match:
+            dates = {"start_date": _normalize_date(match.group("start"))}
+            end = match.group("end")
+            if end.lower() not in _OPEN_END.split("|"):
+                dates["end_date"] = _normalize_date(end)
+            line = line[:match.start()] + " " + line[match.end():]
+        else:
+            single = _SINGLE_DATE_RE.search(line)
+            if single and single.group("date").isdigit():
+                # A lone year is the graduation year
+                dates = {"end_date": single.group("date")}
+                line = line[:single.start()] + " " + line[single.end():]
+
+        others = []
+        for part in _parts(line):
+            if _SCHOOL_WORDS.search(part) and not _DEGREE_RE.search(part):
+                if current.get("school_name"):
+                    flush()
+                current["school_name"] = part
+            elif _DEGREE_RE.search(part):
+                if current.get("degree"):
+                    flush()
+                current["degree"], field = _degree_and_field(part)
+                if field:
+                    current["field_of_study"] = field
+            else:
+                others.append(part)
+        if others and current.get("degree") and not current.get("field_of_study"):
+            current["field_of_study"] = others[0]
+        for key, value in dates.items():
+            current.setdefault(key, value)
+    flush()
+    return entries
+
+
+def parse_skills(lines: List[str]) -> List[dict]:
+    skills, seen = [], set()
+    for line in lines:
+        line = _BULLET_RE.sub("", line)
+        label, colon, rest = line.partition(":")
+        if colon and len(label) <= 25:
+            line = rest
+        for token in re.split(r"\s*(?:,|;|\||•|·|\t)\s*", line):
+            token = token.strip(" .")
+            proficiency = None
+            level = re.match(r"(.+?)\s*\((\w+)\)$", token)
+            if level and level.group(2).lower() in _LEVELS:
+                token, proficiency = level.group(1), level.group(2).lower()
+            if not token or len(token) > 40 or len(token.split()) > 4 or token.lower() in seen:
+                continue
+            seen.add(token.lower())
+            skills.append({"skill_name": token, "proficiency": proficiency})
+            if len(skills) >= MAX_SKILLS:
+                return skills
+    return skills
+
+
+def structure(text: str) -> dict:
+    sections = split_sections(text)
+    return {
+        "education": parse_education(sections.get("education", [])),
+        "experience": parse_experience(sections.get("experience", [])),
+        "skills": parse_skills(sections.get("skills", [])),
+    }
+
+
+def parse_resume(path: str, max_pages: int = 30, timeout: float = 20.0) -> dict:
+    """
+    Extracts and structures the resume at ``path``. Runs in a parser worker;
+    raises ``ResumeParseError`` for unreadable files and ``ResumeParseTimeout``
+    once ``timeout`` seconds have passed.
+    """
+    deadline = time.monotonic() + timeout
+    kind, text, pages = extract_text(path, max_pages, deadline)
+    truncated = pages > max_pages or len(text) > MAX_TEXT_CHARS
+    text = text[:MAX_TEXT_CHARS]
+    _check_deadline(deadline)
+    return {
+        "kind": kind,
+        "pages": pages,
+        "chars": len(text),
+        "truncated": truncated,
+        "parser_version": PARSER_VERSION,
+        **structure(text),
+    }
@@ -0,0 +1,291 @@
+# backend/app/services/resume_service.py
+
+"""
+Resume ingestion: streamed upload, hash-keyed parse cache and a parser pool.
+
+An upload is written chunk by chunk to GridFS (``resume_files``) and to a local
+temporary file while its SHA-256 is computed, so the request body is never held
+in memory whole. Re-uploading a file the same user already stored keeps the
+earlier copy.
+
+Parsing runs in ``ResumeParserPool``, a process pool separate from the password
+workers. At most ``RESUME_PARSE_WORKERS`` documents parse at once and at most
+``RESUME_PARSE_QUEUE_SIZE`` more wait; anything beyond is rejected with a 503
+and Retry-After. Each parse has ``RESUME_PARSE_TIMEOUT_SECONDS``: the worker
+checks the deadline between pages, and a worker that does not return shortly
+after it (stuck inside one page) is killed along with its pool, which is then
+replaced.
+
+Results are stored in ``resumes`` under the file's hash and parser version, so
+uploading a file that was parsed before, by anyone, skips the pool entirely.
+Concurrent uploads of the same file share one parse.
+"""
+
+import asyncio
+import hashlib
+import logging
+import math
+import multiprocessing
+import os
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Optional
+
+from fastapi import HTTPException, status
+
+from ..core.config import settings
+from ..core.database import resume_files, resumes_collection
+from ..core.metrics import span, stats_collector
+from .resume_parser import PARSER_VERSION, ResumeParseError, ResumeParseTimeout, parse_resume
+
+logger = logging.getLogger(__name__)
+
+# How long past its own deadline a worker may run before the pool is killed
+KILL_GRACE_SECONDS = 2.0
+
+
+class ResumeParserPool:
+    """
+    Runs ``parse_resume`` in worker processes with admission control and a
+    per-document time limit. The time limit starts when a worker picks the
+    document up, not while it waits for one.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, timeout: float, max_pages: int):
+        self.max_workers = max(1, max_workers)
+        self.max_queue = max(0, max_queue)
+        self.timeout = timeout
+        self.max_pages = max_pages
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._in_flight = 0
+        self._avg_seconds = 1.0
+        self.parsed = 0
+        self.failed = 0
+        self.timeouts = 0
+        self.rejected = 0
+        self.recycled = 0
+
+    @property
+    def capacity(self) -> int:
+        return self.max_workers + self.max_queue
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    # Spawned workers import only the parser module, not the app or its Mongo client
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                    )
+        return self._executor
+
+    def retry_after(self) -> int:
+        return max(1, math.ceil(self._in_flight * self._avg_seconds / self.max_workers))
+
+    def stats(self) -> dict:
+        return {
+            "in_flight": self._in_flight,
+            "capacity": self.capacity,
+            "parsed": self.parsed,
+            "failed": self.failed,
+            "timeouts": self.timeouts,
+            "rejected": self.rejected,
+            "recycled": self.recycled,
+        }
+
+    async def parse(self, path: str) -> dict:
+        if self._in_flight >= self.capacity:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Resume parsing is busy, please retry shortly",
+                headers={"Retry-After": str(self.retry_after())},
+            )
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_workers)
+
+        self._in_flight += 1
+        try:
+            async with self._slots:
+                started = time.perf_counter()
+                try:
+                    result = await self._run(path)
+                except ResumeParseError:
+                    self.failed += 1
+                    raise
+                self.parsed += 1
+                self._avg_seconds = 0.8 * self._avg_seconds + 0.2 * (time.perf_counter() - started)
+                return result
+        finally:
+            self._in_flight -= 1
+
+    async def _run(self, path: str, retry: bool = True) -> dict:
+        executor = self._get_executor()
+        future = asyncio.get_running_loop().run_in_executor(
+            executor, parse_resume, path, self.max_pages, self.timeout
+        )
+        try:
+            with span("resume.parse"):
+                return await asyncio.wait_for(future, self.timeout + KILL_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            logger.warning("Resume parse exceeded %gs; replacing the parser pool", self.timeout)
+            self._recycle(executor)
+            raise ResumeParseTimeout("Resume took too long to parse")
+        except ResumeParseTimeout:
+            self.timeouts += 1
+            raise
+        except BrokenProcessPool:
+            # Another document's timeout killed the pool under this one
+            self._recycle(executor)
+            if retry:
+                return await self._run(path, retry=False)
+            raise ResumeParseError("Resume parser crashed")
+
+    def _recycle(self, executor: ProcessPoolExecutor):
+        with self._lock:
+            if self._executor is not executor:
+                return
+            self._executor = None
+            self.recycled += 1
+        # ProcessPoolExecutor cannot cancel a running call, so its workers are terminated
+        for process in list((executor._processes or {}).values()):
+            process.terminate()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    async def warm_up(self):
+        """Starts every worker process ahead of the first upload."""
+        executor = self._get_executor()
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(executor, time.sleep, 0.05) for _ in range(self.max_workers)))
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+parser_pool = ResumeParserPool(
+    max_workers=settings.RESUME_PARSE_WORKERS,
+    max_queue=settings.RESUME_PARSE_QUEUE_SIZE,
+    timeout=settings.RESUME_PARSE_TIMEOUT_SECONDS,
+    max_pages=settings.RESUME_MAX_PAGES,
+)
+stats_collector("resume_parser", "Resume parser pool", parser_pool.stats)
+
+_cache_stats = {"hits": 0, "misses": 0}
+stats_collector("resume_cache", "Parsed resume cache", lambda: dict(_cache_stats))
+_pending: Dict[str, "asyncio.Future[dict]"] = {}
+
+
+@dataclass
+class StoredResume:
+    file_id: object
+    sha256: str
+    size: int
+    path: str
+    # False when an earlier identical upload of the same user is reused
+    created: bool = True
+
+
+async def store_upload(chunks: AsyncIterator[bytes], user_id: str, filename: Optional[str],
+                       content_type: Optional[str]) -> StoredResume:
+    """
+    Streams an upload to GridFS and a temporary file, hashing it on the way.
+    Raises 413 past ``RESUME_MAX_BYTES`` and 400 for an empty body.
+    """
+    digest = hashlib.sha256()
+    size = 0
+    metadata = {"user_id": user_id, "content_type": content_type}
+    handle = tempfile.NamedTemporaryFile(prefix="resume-", delete=False)
+    upload = resume_files.open_upload_stream(filename or "resume", metadata=metadata)
+    try:
+        async for chunk in chunks:
+            if not chunk:
+                continue
+            size += len(chunk)
+            if size > settings.RESUME_MAX_BYTES:
+                raise HTTPException(
+                    status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+                    detail=f"Resume is larger than {settings.RESUME_MAX_BYTES} bytes"
+                )
+            digest.update(chunk)
+            handle.write(chunk)
+            await upload.write(chunk)
+        if size == 0:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Resume upload is empty")
+        handle.close()
+        await upload.set("metadata", {**metadata, "sha256": digest.hexdigest(), "size": size})
+        await upload.close()
+    except BaseException:
+        handle.close()
+        os.unlink(handle.name)
+        await upload.abort()
+        raise
+
+    stored = StoredResume(upload._id, digest.hexdigest(), size, handle.name)
+    previous = await resume_files.find(
+        {"metadata.user_id": user_id, "metadata.sha256": stored.sha256, "_id": {"$ne": stored.file_id}},
+        limit=1,
+    ).to_list(length=1)
+    if previous:
+        await resume_files.delete(stored.file_id)
+        stored.file_id = previous[0]._id
+        stored.created = False
+    return stored
+
+
+async def _parse_and_cache(stored: StoredResume) -> dict:
+    try:
+        result = await parser_pool.parse(stored.path)
+        await resumes_collection.replace_one(
+            {"_id": stored.sha256},
+            {"parser_version": PARSER_VERSION, "result": result, "parsed_at": datetime.now(timezone.utc)},
+            upsert=True,
+        )
+        return result
+    finally:
+        _pending.pop(stored.sha256, None)
+        os.unlink(stored.path)
+
+
+async def parse_stored(stored: StoredResume) -> tuple:
+    """``(result, cached)`` for a stored upload; takes ownership of its temporary file."""
+    cached = await resumes_collection.find_one(
+        {"_id": stored.sha256, "parser_version": PARSER_VERSION}, {"result": 1}
+    )
+    pending = _pending.get(stored.sha256)
+    if cached is not None or pending is not None:
+        os.unlink(stored.path)
+        if cached is not None:
+            _cache_stats["hits"] += 1
+            return cached["result"], True
+    else:
+        _cache_stats["misses"] += 1
+        pending = _pending[stored.sha256] = asyncio.ensure_future(_parse_and_cache(stored))
+    # An uploader disconnecting must not cancel the parse others wait on
+    return await asyncio.shield(pending), False
+
+
+async def ingest_resume(chunks: AsyncIterator[bytes], user_id: str, filename: Optional[str] = None,
+                        content_type: Optional[str] = None) -> dict:
+    """
+    Stores and parses an uploaded resume. Raises ``ResumeParseError`` when the
+    file cannot be parsed (``ResumeParseTimeout`` when that took too long); the
+    stored file is then deleted again, as it is when parsing is rejected.
+    """
+    stored = await store_upload(chunks, user_id, filename, content_type)
+    try:
+        result, cached = await parse_stored(stored)
+    except BaseException:
+        if stored.created:
+            await resume_files.delete(stored.file_id)
+        raise
+    return {"file_id": stored.file_id, "sha256": stored.sha256, "size": stored.size, "cached": cached, **result}
@@ -0,0 +1,154 @@
+# backend/app/services/skill_matcher.py
+
+"""
+In-memory freelancer index used by ``job_service``.
+
+``SkillMatcher`` keeps every freelancer as one row of a dense float32 matrix of
+profile embeddings plus an inverted index from normalized skill to matrix rows.
+Scoring a job is one matrix-vector product, a handful of scatter-adds for the
+job's skills, and an ``argpartition`` for the top k; nothing loops over users.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from ..core.config import settings
+from .job_service import normalize_skill
+
+
+@dataclass
+class Match:
+    user_id: str
+    score: float
+    similarity: float
+    skill_overlap: int
+
+
+class SkillMatcher:
+    """
+    In-memory freelancer index. Writes take a lock; reads copy nothing but the
+    top-k results.
+    """
+
+    def __init__(self, dim: int, capacity: int = 1024):
+        self.dim = dim
+        self._matrix = np.zeros((max(1, capacity), dim), dtype=np.float32)
+        self._count = 0
+        self._user_ids: List[str] = []
+        self._row_of: Dict[str, int] = {}
+        self._skills_of: Dict[str, Set[str]] = {}
+        self._rows_by_skill: Dict[str, Set[int]] = {}
+        # Frozen row arrays per skill, rebuilt lazily after a write touches the skill
+        self._skill_arrays: Dict[str, np.ndarray] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _reduce(self, vector) -> np.ndarray:
+        reduced = np.asarray(vector, dtype=np.float32)[:self.dim]
+        norm = float(np.linalg.norm(reduced))
+        return reduced / norm if norm else reduced
+
+    def _index_skills(self, row: int, skills: Iterable[str]):
+        for skill in skills:
+            self._rows_by_skill.setdefault(skill, set()).add(row)
+            self._skill_arrays.pop(skill, None)
+
+    def _unindex_skills(self, row: int, skills: Iterable[str]):
+        for skill in skills:
+            rows = self._rows_by_skill.get(skill)
+            if rows is not None:
+                rows.discard(row)
+                if not rows:
+                    del self._rows_by_skill[skill]
+            self._skill_arrays.pop(skill, None)
+
+    def upsert(self, user_id: str, vector, skills: Iterable[str]):
+        """
+        Adds or replaces a freelancer. Only skills that actually changed touch the
+        inverted index.
+        """
+        reduced = self._reduce(vector)
+        skills = set(skills)
+        with self._lock:
+            row = self._row_of.get(user_id)
+            if row is None:
+                if self._count == self._matrix.shape[0]:
+                    grown = np.zeros((self._matrix.shape[0] * 2, self.dim), dtype=np.float32)
+                    grown[:self._count] = self._matrix[:self._count]
+                    self._matrix = grown
+                row = self._count
+                self._count += 1
+                self._row_of[user_id] = row
+                self._user_ids.append(user_id)
+                previous: Set[str] = set()
+            else:
+                previous = self._skills_of.get(user_id, set())
+            self._matrix[row] = reduced
+            self._unindex_skills(row, previous - skills)
+            self._index_skills(row, skills - previous)
+            self._skills_of[user_id] = skills
+
+    def remove(self, user_id: str):
+        """Drops a freelancer, moving the last row into the freed slot."""
+        with self._lock:
+            row = self._row_of.pop(user_id, None)
+            if row is None:
+                return
+            self._unindex_skills(row, self._skills_of.pop(user_id, set()))
+            last = self._count - 1
+            if row != last:
+                moved = self._user_ids[last]
+                moved_skills = self._skills_of.get(moved, set())
+                self._unindex_skills(last, moved_skills)
+                self._matrix[row] = self._matrix[last]
+                self._user_ids[row] = moved
+                self._row_of[moved] = row
+                self._index_skills(row, moved_skills)
+            self._user_ids.pop()
+            self._count -= 1
+
+    def _rows_for(self, skill: str) -> Optional[np.ndarray]:
+        rows = self._skill_arrays.get(skill)
+        if rows is None:
+            members = self._rows_by_skill.get(skill)
+            if not members:
+                return None
+            rows = np.fromiter(members, dtype=np.int64, count=len(members))
+            self._skill_arrays[skill] = rows
+        return rows
+
+    def match(self, job_vector, job_skills: Sequence[str], top_k: int = 50, skill_weight: Optional[float] = None) -> List[Match]:
+        """
+        Scores every freelancer against a job and returns the best ``top_k``.
+
+        score = (1 - w) * cosine(profile, job) + w * (matched skills / job skills)
+        """
+        weight = settings.MATCH_SKILL_WEIGHT if skill_weight is None else skill_weight
+        query = self._reduce(job_vector)
+        wanted = {normalize_skill(skill) for skill in job_skills} - {""}
+        with self._lock:
+            count = self._count
+            if count == 0:
+                return []
+            similarity = self._matrix[:count] @ query
+            overlap = np.zeros(count, dtype=np.float32)
+            for skill in wanted:
+                rows = self._rows_for(skill)
+                if rows is not None:
+                    overlap[rows] += 1.0
+            scores = (1.0 - weight) * similarity
+            if wanted:
+                scores += (weight / len(wanted)) * overlap
+
+            k = min(top_k, count)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [
+                Match(self._user_ids[row], float(scores[row]), float(similarity[row]), int(overlap[row]))
+                for row in top
+            ]
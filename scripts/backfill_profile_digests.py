@@ -0,0 +1,74 @@
+"""
+Builds the token-counted ``profile_digest`` of every user whose digest is
+missing or stale: users that predate digests, bulk-imported users, and every
+user after a change of ``PROMPT_TOKENIZER`` or the digest settings. Digests
+that are still correct but were built at an older user version only get their
+version updated, so prompts can trust them without hashing the profile.
+
+    python scripts/backfill_profile_digests.py [--batch-size 500] [--dry-run]
+
+Proposal prompts work without a stored digest (they compute one on the fly),
+so this only saves that work. Each digest is written conditionally on the
+user's ``version``; users edited while the backfill runs get their digest from
+the edit itself.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from pymongo import UpdateOne  # noqa: E402
+
+from app.core.database import client, users_collection  # noqa: E402
+from app.services.profile_digest import DIGEST_PROJECTION, digest_update  # noqa: E402
+
+
+async def run(batch_size: int, dry_run: bool):
+    cursor = users_collection.find({"is_deleted": {"$ne": True}}, DIGEST_PROJECTION).batch_size(batch_size)
+    scanned = needing = updated = 0
+    operations = []
+
+    async def flush():
+        nonlocal updated
+        if operations and not dry_run:
+            result = await users_collection.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+        operations.clear()
+
+    async for user in cursor:
+        scanned += 1
+        pending = digest_update(user)
+        if pending is None:
+            continue
+        needing += 1
+        if not dry_run:
+            operations.append(UpdateOne(
+                {"_id": user["_id"], "version": user.get("version")},
+                {"$set": pending[0]},
+            ))
+        if len(operations) >= batch_size:
+            await flush()
+    await flush()
+
+    if dry_run:
+        print(f"users scanned: {scanned}, would update: {needing}")
+    else:
+        print(f"users scanned: {scanned}, updated: {updated}, skipped (edited meanwhile): {needing - updated}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="scan and report without writing")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.batch_size, args.dry_run))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""
+Assigns an ``item_id`` to every profile array entry that predates item-level
+profile editing, so those entries can be updated or removed individually.
+
+    python scripts/backfill_profile_item_ids.py [--batch-size 500] [--dry-run]
+
+Each user is rewritten with one conditional update on its current ``version``;
+users edited while the backfill runs are skipped and picked up by a re-run.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from bson import ObjectId  # noqa: E402
+from pymongo import UpdateOne  # noqa: E402
+
+from app.api.v1.models.user import ProfileSection  # noqa: E402
+from app.core.database import client, users_collection  # noqa: E402
+
+SECTIONS = [section.value for section in ProfileSection]
+
+
+def missing_ids_query() -> dict:
+    return {"$or": [{section: {"$elemMatch": {"item_id": {"$exists": False}}}} for section in SECTIONS]}
+
+
+def backfill(user: dict) -> dict:
+    """The ``$set`` for one user: each affected array with ids filled in."""
+    changes = {}
+    for section in SECTIONS:
+        items = user.get(section) or []
+        if any(not item.get("item_id") for item in items):
+            changes[section] = [
+                item if item.get("item_id") else {**item, "item_id": str(ObjectId())} for item in items
+            ]
+    return changes
+
+
+async def run(batch_size: int, dry_run: bool):
+    projection = {section: 1 for section in SECTIONS}
+    projection["version"] = 1
+    cursor = users_collection.find(missing_ids_query(), projection).batch_size(batch_size)
+    scanned = needing = updated = 0
+    operations = []
+
+    async def flush():
+        nonlocal updated
+        if operations and not dry_run:
+            result = await users_collection.bulk_write(operations, ordered=False)
+            updated += result.modified_count
+        operations.clear()
+
+    async for user in cursor:
+        scanned += 1
+        changes = backfill(user)
+        if changes:
+            needing += 1
+            # A missing version matches null, so never-versioned users are covered too
+            operations.append(UpdateOne(
+                {"_id": user["_id"], "version": user.get("version")},
+                {"$set": changes, "$inc": {"version": 1}},
+            ))
+        if len(operations) >= batch_size:
+            await flush()
+    await flush()
+
+    if dry_run:
+        print(f"users scanned: {scanned}, would update: {needing}")
+    else:
+        print(f"users scanned: {scanned}, updated: {updated}, skipped (edited meanwhile): {needing - updated}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--dry-run", action="store_true", help="scan and report without writing")
+    args = parser.parse_args()
+    try:
+        asyncio.run(run(args.batch_size, args.dry_run))
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Shared helpers for the benchmark scripts.
+
+Importing this module puts ``backend/`` on ``sys.path`` so the scripts can use
+``app.*`` modules when run directly, e.g. ``python scripts/benchmarks/<name>.py``.
+"""
+
+import os
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "backend"))
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of numbers."""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = max(0, min(len(ordered) - 1, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_ms(samples):
+    """p50/p95/p99/max of second-valued samples, in milliseconds."""
+    return {
+        "p50_ms": round(percentile(samples, 50) * 1000, 3),
+        "p95_ms": round(percentile(samples, 95) * 1000, 3),
+        "p99_ms": round(percentile(samples, 99) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3) if samples else 0.0,
+    }
+
+
+def open_database(server=None, name="bench"):
+    """
+    A Motor database for benchmarks: a scratch database on ``server`` if given,
+    otherwise an in-memory stand-in from ``mongomock-motor`` (listed in this
+    directory's requirements.txt).
+    Returns ``(client, db)``.
+    """
+    if server:
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(server)
+        return client, client[name]
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("No --server given and mongomock-motor is not installed "
+                         "(pip install -r scripts/benchmarks/requirements.txt)")
+    client = AsyncMongoMockClient()
+    return client, client[name]
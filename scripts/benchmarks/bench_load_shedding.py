@@ -0,0 +1,161 @@
+"""
+Synthetic overload: ``GET /users/me`` latency while logins saturate the server.
+
+    python scripts/benchmarks/bench_load_shedding.py --login-clients 64 --seconds 10
+    python scripts/benchmarks/bench_load_shedding.py --password-limit 1 2 4
+
+The app runs in-process over ASGI against an in-memory Mongo stand-in (or
+``--server``). ``--login-clients`` clients log in back to back, retrying after
+``--retry-delay`` when shed, which is more than the bcrypt workers can serve.
+The clients share the app's event loop, so rejections are not free for the
+server here: a delay much shorter than Retry-After makes the test measure the
+load generator instead. Meanwhile one
+``GET /users/me`` is sent every ``1 / --me-rate`` seconds whatever happened to
+the previous ones, so slow responses show up as latency instead of fewer
+requests.
+
+``idle`` is ``/users/me`` with no login traffic. ``unlimited`` gives every cost
+class an unbounded limit, as if the shedding middleware were not installed.
+``shed-N`` uses the configured classes with the ``password`` class limited to N
+concurrent requests. Each run reports ``/users/me`` latency and login
+throughput, latency and status codes, including the 429s and 503s shed.
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import time
+
+from _common import open_database, summarize_ms  # also puts backend/ on sys.path
+
+PASSWORD = "overload-password"
+
+
+def configure(args):
+    """Environment for the app, set before any ``app.*`` import reads settings."""
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ.setdefault("EMBEDDING_BACKEND", "fake")
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+    os.environ["PROPOSAL_RUN_WORKERS_IN_API"] = "false"
+    os.environ["SHED_ENABLED"] = "true"
+
+
+def set_limits(password_limit):
+    """``None`` lifts every class limit; otherwise configured limits with ``password_limit``."""
+    from app.core.load_shedding import LoadShedder, load_shedder
+
+    fresh = LoadShedder.from_settings().classes
+    for name, cost_class in fresh.items():
+        if password_limit is None:
+            cost_class.limit = cost_class.max_queue = 10 ** 6
+        elif name == "password":
+            cost_class.limit = password_limit
+    load_shedder.classes = fresh
+
+
+async def overload(http, headers, login_email, args) -> dict:
+    stop, measuring = asyncio.Event(), asyncio.Event()
+    me_latencies, me_statuses = [], collections.Counter()
+    login_latencies, login_statuses = [], collections.Counter()
+
+    async def get_me():
+        started = time.perf_counter()
+        response = await http.get("/api/v1/endpoints/users/me", headers=headers)
+        me_latencies.append(time.perf_counter() - started)
+        me_statuses[str(response.status_code)] += 1
+
+    async def login_client():
+        while not stop.is_set():
+            started = time.perf_counter()
+            response = await http.post(
+                "/api/v1/endpoints/users/login", data={"username": login_email, "password": PASSWORD}
+            )
+            # Only responses within the measured window count
+            if measuring.is_set():
+                login_statuses[str(response.status_code)] += 1
+                if response.status_code == 200:
+                    login_latencies.append(time.perf_counter() - started)
+            if response.status_code != 200:
+                await asyncio.sleep(args.retry_delay)
+
+    clients = [asyncio.create_task(login_client()) for _ in range(args.login_clients)]
+    await asyncio.sleep(args.warmup if args.login_clients else 0)
+    probes = []
+    measuring.set()
+    started = time.perf_counter()
+    while time.perf_counter() - started < args.seconds:
+        probes.append(asyncio.create_task(get_me()))
+        await asyncio.sleep(1 / args.me_rate)
+    await asyncio.gather(*probes)
+    elapsed = time.perf_counter() - started
+    measuring.clear()
+    stop.set()
+    await asyncio.gather(*clients)
+
+    return {
+        "me": {"sent": len(probes), **summarize_ms(me_latencies), "statuses": dict(me_statuses)},
+        "login": {
+            "ok_per_s": round(len(login_latencies) / elapsed, 1),
+            **summarize_ms(login_latencies),
+            "statuses": dict(login_statuses),
+        },
+    }
+
+
+async def run(args) -> dict:
+    import httpx
+    import app.core.database as database
+
+    # Swapped in before the app is imported, since modules import collections by name
+    client, db = open_database(args.server, "bench_load_shedding")
+    database.client, database.db = client, db
+    for name in ("users", "organizations", "jobs", "proposals", "resumes", "org_stats"):
+        setattr(database, f"{name}_collection", db[name])
+    await db.users.drop()
+
+    from app.core.load_shedding import load_shedder
+    from app.main import app
+
+    report = {"cpus": os.cpu_count(), "login_clients": args.login_clients, "me_rate": args.me_rate, "runs": {}}
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://overload") as http:
+        set_limits(None)
+        for email in ("reader@example.com", "login@example.com"):
+            await http.post("/api/v1/endpoints/users/register", json={"email": email, "password": PASSWORD})
+        response = await http.post(
+            "/api/v1/endpoints/users/login", data={"username": "reader@example.com", "password": PASSWORD}
+        )
+        headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+        await http.get("/api/v1/endpoints/users/me", headers=headers)
+
+        idle = argparse.Namespace(**{**vars(args), "login_clients": 0})
+        report["runs"]["idle"] = (await overload(http, headers, "login@example.com", idle))["me"]
+        report["runs"]["unlimited"] = await overload(http, headers, "login@example.com", args)
+        for limit in args.password_limit:
+            set_limits(limit)
+            result = await overload(http, headers, "login@example.com", args)
+            result["password_class"] = load_shedder.classes["password"].stats()
+            report["runs"][f"shed-{limit}"] = result
+
+    await db.users.drop()
+    client.close()
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--login-clients", type=int, default=64)
+    parser.add_argument("--me-rate", type=float, default=50.0, help="GET /users/me per second")
+    parser.add_argument("--seconds", type=float, default=10.0, help="measured duration of each run")
+    parser.add_argument("--warmup", type=float, default=2.0, help="seconds of login load before measuring")
+    parser.add_argument("--retry-delay", type=float, default=1.0, help="seconds a shed login client waits")
+    parser.add_argument("--password-limit", type=int, nargs="+", default=[1, 4], help="password class limits to try")
+    parser.add_argument("--server", help="mongod URI; in-memory stand-in if omitted")
+    args = parser.parse_args()
+    configure(args)
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
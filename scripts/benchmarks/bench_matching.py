@@ -0,0 +1,73 @@
+"""
+Top-k job-to-freelancer matching latency over a synthetic freelancer population.
+
+    python scripts/benchmarks/bench_matching.py --freelancers 100000 --top-k 50
+
+Vectors are random unit vectors of the matcher's dimension; each freelancer gets
+5-20 skills drawn from a Zipf-like vocabulary so popular skills have long
+posting lists, as they do in practice.
+"""
+
+import argparse
+import json
+import time
+
+import numpy as np
+
+from _common import summarize_ms  # also puts backend/ on sys.path
+
+from app.core.config import settings
+from app.services.skill_matcher import SkillMatcher
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--freelancers", type=int, default=100000)
+    parser.add_argument("--dim", type=int, default=settings.MATCH_EMBEDDING_DIM)
+    parser.add_argument("--vocabulary", type=int, default=2000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=50)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(11)
+    vocabulary = [f"skill{i}" for i in range(args.vocabulary)]
+    popularity = 1.0 / np.arange(1, args.vocabulary + 1)
+    popularity /= popularity.sum()
+
+    matcher = SkillMatcher(args.dim, capacity=args.freelancers)
+    vectors = rng.normal(size=(args.freelancers, args.dim)).astype(np.float32)
+    started = time.perf_counter()
+    for i in range(args.freelancers):
+        skills = rng.choice(args.vocabulary, size=rng.integers(5, 21), replace=False, p=popularity)
+        matcher.upsert(f"user{i}", vectors[i], [vocabulary[s] for s in skills])
+    build_seconds = time.perf_counter() - started
+
+    queries = rng.normal(size=(args.queries, args.dim)).astype(np.float32)
+    job_skills = [[vocabulary[s] for s in rng.choice(args.vocabulary, size=8, replace=False, p=popularity)] for _ in range(args.queries)]
+    for query, skills in zip(queries[:5], job_skills[:5]):
+        matcher.match(query, skills, args.top_k)  # warm the per-skill row arrays
+
+    latencies = []
+    for query, skills in zip(queries, job_skills):
+        started = time.perf_counter()
+        matcher.match(query, skills, args.top_k)
+        latencies.append(time.perf_counter() - started)
+
+    update_latencies = []
+    for i in range(200):
+        started = time.perf_counter()
+        matcher.upsert(f"user{i}", vectors[-i - 1], [vocabulary[0], vocabulary[i + 1]])
+        update_latencies.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        "freelancers": args.freelancers,
+        "dim": args.dim,
+        "top_k": args.top_k,
+        "build_seconds": round(build_seconds, 2),
+        "match": summarize_ms(latencies),
+        "incremental_update": summarize_ms(update_latencies),
+    }, indent=2))
+
+
+if __name__ == "__main__":
+    main()
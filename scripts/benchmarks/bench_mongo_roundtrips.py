@@ -0,0 +1,114 @@
+"""
+Counts MongoDB commands issued per request on the registration and update paths.
+
+Requires a reachable mongod; the benchmark uses its own database (dropped at the
+end) so it never touches application data:
+
+    python scripts/benchmarks/bench_mongo_roundtrips.py --server mongodb://localhost:27017
+
+Expected counts on the current tree (the previous tree is shown for reference):
+
+    register_user           1 insert              (was find + insert + find)
+    register_user (dup)     1 insert              (was find)
+    register_organization   1 insert              (was find + insert + find)
+    update_organization     1 findAndModify       (was update + find)
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import os
+import uuid
+
+from _common import BACKEND_DIR  # noqa: F401  (puts backend/ on sys.path)
+from pymongo import monitoring
+
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = collections.Counter()
+
+    def started(self, event):
+        if event.command_name not in ("endSessions", "hello", "isMaster", "ping"):
+            self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", default="mongodb://localhost:27017", help="mongod URI without a database")
+    parser.add_argument("--requests", type=int, default=20)
+    args = parser.parse_args()
+
+    db_name = f"bench_roundtrips_{uuid.uuid4().hex[:8]}"
+    os.environ["MONGO_URI"] = f"{args.server.rstrip('/')}/{db_name}"
+
+    counter = CommandCounter()
+    # Listeners must be registered before the application's client is created.
+    monitoring.register(counter)
+
+    import httpx
+    from app.core.database import client, create_db_indexes
+    from app.main import app
+
+    async def measure(label, send, n):
+        counter.commands.clear()
+        for i in range(n):
+            await send(i)
+        return {
+            "path": label,
+            "requests": n,
+            "commands_per_request": round(sum(counter.commands.values()) / n, 2),
+            "by_command": {name: round(count / n, 2) for name, count in counter.commands.items()},
+        }
+
+    async def run():
+        await create_db_indexes()
+        transport = httpx.ASGITransport(app=app)
+        results = []
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as http:
+            users = "/api/v1/endpoints/users"
+            orgs = "/api/v1/endpoints/organizations"
+
+            async def register(i):
+                await http.post(f"{users}/register", json={"email": f"user{i}@bench.test", "password": "benchmark-pass"})
+
+            async def register_duplicate(i):
+                await http.post(f"{users}/register", json={"email": "user0@bench.test", "password": "benchmark-pass"})
+
+            org_ids = []
+
+            async def register_org(i):
+                response = await http.post(f"{orgs}/register", json={"name": f"Bench Org {i}"})
+                org_ids.append(response.json()["_id"])
+
+            results.append(await measure("register_user", register, args.requests))
+            results.append(await measure("register_user (duplicate)", register_duplicate, args.requests))
+            results.append(await measure("register_organization", register_org, args.requests))
+
+            # update_organization needs a member token for the org being updated
+            await http.post(f"{users}/register", json={"email": "owner@bench.test", "password": "benchmark-pass"})
+            await client.get_database()["users"].update_one({"email": "owner@bench.test"}, {"$set": {"org_id": org_ids[0]}})
+            login = await http.post(f"{users}/login", data={"username": "owner@bench.test", "password": "benchmark-pass"})
+            headers = {"Authorization": f"Bearer {login.json()['access_token']}"}
+            await http.get(f"{users}/me", headers=headers)  # warm the principal cache
+
+            async def update_org(i):
+                await http.patch(f"{orgs}/{org_ids[0]}", json={"description": f"rev {i}"}, headers=headers)
+
+            results.append(await measure("update_organization", update_org, args.requests))
+
+        await client.drop_database(db_name)
+        return results
+
+    print(json.dumps(asyncio.run(run()), indent=2))
+
+
+if __name__ == "__main__":
+    main()
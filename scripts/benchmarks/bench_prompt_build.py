@@ -0,0 +1,73 @@
+"""
+Cost of assembling the freelancer part of a proposal prompt, with and without a
+stored profile digest.
+
+    python scripts/benchmarks/bench_prompt_build.py --items 5 20 60 --budget 600
+
+For each profile size, ``computed`` builds the digest on every prompt (what a
+user without a current ``profile_digest`` costs: truncating the bio, sorting,
+tokenizing every line) and ``stored`` reads a digest built earlier at the
+user's current version, so its hash is trusted, and fits the budget by summing
+stored counts. ``prompt_tokens`` compares
+the profile section listing everything against the budgeted one.
+"""
+
+import argparse
+import json
+import timeit
+
+from _common import summarize_ms  # also puts backend/ on sys.path
+
+from bson import ObjectId
+
+from app.core.tokenizer import count_tokens, get_tokenizer
+from app.services.profile_digest import build_digest, digest_for, fit_digest
+
+
+def make_user(items: int) -> dict:
+    return {
+        "_id": ObjectId(),
+        "version": 7,
+        "first_name": "Dana",
+        "last_name": "Reyes",
+        "profile": {"headline": "Full-stack engineer", "bio": "Ten years of building web platforms for startups. " * 12},
+        "skills": [{"skill_name": f"skill-{i}", "endorsements": i % 7} for i in range(items)],
+        "experience": [
+            {"item_id": str(ObjectId()), "company_name": f"Company {i}", "job_title": "Senior Engineer",
+             "start_date": f"{2000 + i % 25}-01", "end_date": f"{2001 + i % 25}-06"}
+            for i in range(items)
+        ],
+        "projects": [
+            {"item_id": str(ObjectId()), "project_title": f"Project {i}",
+             "description": "Designed and shipped a payments API in Python and PostgreSQL. " * 3}
+            for i in range(items)
+        ],
+    }
+
+
+def measure(callable_, repeat: int) -> dict:
+    samples = timeit.repeat(callable_, number=1, repeat=repeat)
+    return summarize_ms(samples)
+
+
+def main(args):
+    report = {"tokenizer": get_tokenizer().name, "budget": args.budget, "sizes": {}}
+    for items in args.items:
+        user = make_user(items)
+        stored = {**user, "profile_digest": build_digest(user)}
+        full = "\n".join(line["text"] for line in stored["profile_digest"]["lines"])
+        budgeted = "\n".join(fit_digest(stored["profile_digest"], args.budget))
+        report["sizes"][items] = {
+            "computed": measure(lambda: fit_digest(digest_for(user), args.budget), args.repeat),
+            "stored": measure(lambda: fit_digest(digest_for(stored), args.budget), args.repeat),
+            "prompt_tokens": {"everything": count_tokens(full), "budgeted": count_tokens(budgeted)},
+        }
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, nargs="+", default=[5, 20, 60], help="entries per profile array")
+    parser.add_argument("--budget", type=int, default=600, help="profile token budget")
+    parser.add_argument("--repeat", type=int, default=500)
+    main(parser.parse_args())
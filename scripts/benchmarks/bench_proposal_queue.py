@@ -0,0 +1,108 @@
+"""
+Offline load test of the proposal generation pipeline.
+
+Submits proposals from several organizations against the worker pool with the
+fake LLM and reports time to first token, end-to-end latency, throughput and
+how many submissions were turned away by backpressure.
+
+    python scripts/benchmarks/bench_proposal_queue.py --jobs 500 --orgs 20 --workers 16
+    python scripts/benchmarks/bench_proposal_queue.py --broker mongo --server mongodb://localhost:27017
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+from _common import open_database, summarize_ms  # also puts backend/ on sys.path
+
+from app.services import ai_agent_service
+from app.services.ai_agent_service import FakeLLM
+from app.services.proposal_service import LocalBroker, MongoBroker, ProposalQueueFull, ProposalService
+
+
+async def run(args):
+    client, db = open_database(args.server, f"bench_proposals_{uuid.uuid4().hex[:8]}")
+    ai_agent_service._llm = FakeLLM(args.first_token_latency, args.token_latency, args.tokens)
+
+    if args.broker == "mongo":
+        broker = MongoBroker(db.proposals, lease_seconds=60, poll_interval=0.02, max_queued_per_org=args.max_queued)
+    else:
+        broker = LocalBroker(args.max_queued)
+    service = ProposalService(
+        proposals=db.proposals,
+        users=db.users,
+        broker=broker,
+        concurrency=args.workers,
+        per_org_limit=args.org_limit,
+        flush_interval=0.25,
+    )
+    users = [{"_id": uuid.uuid4().hex[:24], "org_id": f"org{i % args.orgs}"} for i in range(args.orgs * 5)]
+    await db.users.insert_many([{**user, "first_name": "Bench"} for user in users])
+    service.start()
+
+    first_token, total, rejected = [], [], 0
+
+    async def one(index: int):
+        nonlocal rejected
+        user = users[index % len(users)]
+        submitted = time.perf_counter()
+        try:
+            document = await service.submit(user["_id"], user["org_id"], {
+                "job_title": f"Job {index}",
+                "job_description": f"Looking for help with project number {index}",
+            })
+        except ProposalQueueFull:
+            rejected += 1
+            return
+        got_first = None
+        async for kind, _ in service.stream(str(document["_id"])):
+            if kind == "token" and got_first is None:
+                got_first = time.perf_counter()
+        first_token.append((got_first or time.perf_counter()) - submitted)
+        total.append(time.perf_counter() - submitted)
+
+    started = time.perf_counter()
+    tasks = []
+    for index in range(args.jobs):
+        tasks.append(asyncio.create_task(one(index)))
+        if args.rate:
+            await asyncio.sleep(1.0 / args.rate)
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - started
+    await service.stop()
+    if args.server:
+        await client.drop_database(db.name)
+
+    return {
+        "broker": args.broker,
+        "jobs": args.jobs,
+        "completed": service.completed,
+        "failed": service.failed,
+        "rejected": rejected,
+        "proposals_per_sec": round(service.completed / elapsed, 2),
+        "time_to_first_token": summarize_ms(first_token),
+        "end_to_end": summarize_ms(total),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--broker", choices=["local", "mongo"], default="local")
+    parser.add_argument("--server", help="mongod URI; defaults to an in-memory stand-in")
+    parser.add_argument("--jobs", type=int, default=200)
+    parser.add_argument("--rate", type=float, default=0, help="submissions per second (0 = all at once)")
+    parser.add_argument("--orgs", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--org-limit", type=int, default=2)
+    parser.add_argument("--max-queued", type=int, default=50)
+    parser.add_argument("--first-token-latency", type=float, default=0.3)
+    parser.add_argument("--token-latency", type=float, default=0.005)
+    parser.add_argument("--tokens", type=int, default=150)
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
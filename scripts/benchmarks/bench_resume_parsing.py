@@ -0,0 +1,181 @@
+"""
+Resume parsing throughput: inline on the event loop versus the parser pool, and
+the cost of a cache hit.
+
+    python scripts/benchmarks/bench_resume_parsing.py --documents 200 --workers 1 2 4
+    python scripts/benchmarks/bench_resume_parsing.py --oversized-pages 3000 --timeout 2
+
+Documents are the fixtures in ``fixtures/resumes`` (PDF, DOCX and text), repeated
+up to ``--documents``. ``inline`` parses them one by one on the event loop, the
+way a handler calling ``parse_resume`` directly would; ``pool-N`` submits them
+all to a ``ResumeParserPool`` with N workers. ``loop_lag`` is how late a 10 ms
+ticker ran meanwhile, i.e. the delay every other request would have seen.
+
+``--oversized-pages`` adds one generated PDF with that many pages and
+``--max-pages`` raised to match, to show it hitting ``--timeout`` while the other
+documents keep flowing. The ``cache`` run parses every distinct fixture once
+through ``parse_stored`` and then again, against ``--server`` or an in-memory
+stand-in.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import time
+
+from _common import open_database, summarize_ms  # also puts backend/ on sys.path
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures", "resumes")
+
+
+def make_pdf(path: str, pages: int, lines_per_page: int = 40):
+    """Writes a plain Helvetica PDF of ``pages`` pages of resume-like text."""
+    # Objects: 1 catalog, 2 page tree, 3 font, then a content stream and a page per page
+    kids = [5 + 2 * number for number in range(pages)]
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"<< /Type /Pages /Kids [%s] /Count %d >>" % (b" ".join(b"%d 0 R" % kid for kid in kids), pages),
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    for number in range(pages):
+        line = f"(Senior Engineer at Example Corp {number}, Jan 2020 - Present) Tj T*"
+        stream = ("BT /F1 10 Tf 12 TL 40 780 Td " + " ".join([line] * lines_per_page) + " ET").encode()
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+        objects.append(b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] /Contents %d 0 R "
+                       b"/Resources << /Font << /F1 3 0 R >> >> >>" % (len(objects)))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n" % number + body + b"\nendobj\n"
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    out += b"".join(b"%010d 00000 n \n" % offset for offset in offsets)
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref)
+    with open(path, "wb") as handle:
+        handle.write(out)
+
+
+async def _ticker(stop: asyncio.Event, samples: list, interval: float = 0.01):
+    while not stop.is_set():
+        expected = time.perf_counter() + interval
+        await asyncio.sleep(interval)
+        samples.append(max(0.0, time.perf_counter() - expected))
+
+
+async def run_inline(paths, args) -> dict:
+    from app.services.resume_parser import ResumeParseError, parse_resume
+
+    stop, lag, latencies, failures = asyncio.Event(), [], [], 0
+    ticker = asyncio.create_task(_ticker(stop, lag))
+    await asyncio.sleep(0)
+    started = time.perf_counter()
+    for path in paths:
+        begun = time.perf_counter()
+        try:
+            parse_resume(path, args.max_pages, args.timeout)
+        except ResumeParseError:
+            failures += 1
+        latencies.append(time.perf_counter() - begun)
+        await asyncio.sleep(0)
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    return {"docs_per_s": round(len(paths) / elapsed, 1), "failures": failures,
+            "latency": summarize_ms(latencies), "loop_lag": summarize_ms(lag)}
+
+
+async def run_pool(paths, workers: int, args) -> dict:
+    from app.services.resume_parser import ResumeParseError
+    from app.services.resume_service import ResumeParserPool
+
+    pool = ResumeParserPool(workers, len(paths), args.timeout, args.max_pages)
+    await pool.warm_up()
+    stop, lag, latencies = asyncio.Event(), [], []
+    ticker = asyncio.create_task(_ticker(stop, lag))
+
+    async def one(path):
+        begun = time.perf_counter()
+        try:
+            await pool.parse(path)
+        except ResumeParseError:
+            pass
+        latencies.append(time.perf_counter() - begun)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(path) for path in paths))
+    elapsed = time.perf_counter() - started
+    stop.set()
+    await ticker
+    pool.shutdown()
+    stats = pool.stats()
+    return {"docs_per_s": round(len(paths) / elapsed, 1), "failures": stats["failed"], "timeouts": stats["timeouts"],
+            "recycled": stats["recycled"], "latency": summarize_ms(latencies), "loop_lag": summarize_ms(lag)}
+
+
+async def run_cache(fixtures, scratch: str, args) -> dict:
+    import hashlib
+
+    from app.services import resume_service
+    from app.services.resume_service import StoredResume, parse_stored
+
+    client, db = open_database(args.server, "bench_resumes")
+    await db.resumes.drop()
+    resume_service.resumes_collection = db.resumes
+    resume_service.parser_pool = resume_service.ResumeParserPool(2, len(fixtures), args.timeout, args.max_pages)
+
+    timings = {"miss": [], "hit": []}
+    for label in ("miss", "hit"):
+        for index, source in enumerate(fixtures):
+            copy = os.path.join(scratch, f"cache-{label}-{index}")
+            shutil.copyfile(source, copy)
+            with open(copy, "rb") as handle:
+                data = handle.read()
+            begun = time.perf_counter()
+            stored = StoredResume(None, hashlib.sha256(data).hexdigest(), len(data), copy)
+            _, cached = await parse_stored(stored)
+            timings[label].append(time.perf_counter() - begun)
+            assert cached == (label == "hit")
+    resume_service.parser_pool.shutdown()
+    await db.resumes.drop()
+    client.close()
+    return {label: summarize_ms(samples) for label, samples in timings.items()}
+
+
+async def main(args):
+    fixtures = sorted(os.path.join(FIXTURES, name) for name in os.listdir(FIXTURES))
+    scratch = tempfile.mkdtemp(prefix="bench-resumes-")
+    try:
+        paths = [fixtures[index % len(fixtures)] for index in range(args.documents)]
+        if args.oversized_pages:
+            oversized = os.path.join(scratch, "oversized.pdf")
+            make_pdf(oversized, args.oversized_pages)
+            args.max_pages = max(args.max_pages, args.oversized_pages)
+            paths.insert(0, oversized)
+
+        report = {"documents": len(paths), "fixtures": [os.path.basename(path) for path in fixtures],
+                  "timeout_s": args.timeout, "cpus": os.cpu_count()}
+        if not args.skip_inline:
+            report["inline"] = await run_inline(paths, args)
+        for workers in args.workers:
+            report[f"pool-{workers}"] = await run_pool(paths, workers, args)
+        report["cache"] = await run_cache(fixtures, scratch, args)
+        print(json.dumps(report, indent=2))
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--documents", type=int, default=200)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4])
+    parser.add_argument("--timeout", type=float, default=20.0, help="per-document parse time limit, seconds")
+    parser.add_argument("--max-pages", type=int, default=30)
+    parser.add_argument("--oversized-pages", type=int, default=0, help="add one generated PDF with this many pages")
+    parser.add_argument("--skip-inline", action="store_true")
+    parser.add_argument("--server", help="mongod URI for the cache run; in-memory stand-in if omitted")
+    asyncio.run(main(parser.parse_args()))
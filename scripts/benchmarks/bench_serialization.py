@@ -0,0 +1,179 @@
+"""
+Per-request CPU cost of rendering user documents, before and after the
+single-pass serializer.
+
+    python scripts/benchmarks/bench_serialization.py --items 60 --requests 2000
+
+Each route is served by a minimal FastAPI app and called directly over ASGI, so
+the numbers cover routing, response validation and encoding but no network.
+"legacy" returns ``UserInDB.model_validate(doc)`` from a route declaring
+``response_model=UserInDB``, which FastAPI validates again before encoding; "fast"
+returns ``Serializer.response(doc)``. The "/me" variants start from an already
+validated model, as ``get_current_user`` provides.
+
+Recent FastAPI releases already encode ``response_model`` routes with
+pydantic-core, so the end-to-end gap depends on the installed version. The
+``components`` section times each step on its own, including the
+``jsonable_encoder`` + ``json.dumps`` path older releases take.
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import timeit
+
+from _common import summarize_ms  # also puts backend/ on sys.path
+
+from bson import ObjectId
+from fastapi import FastAPI
+from fastapi.encoders import jsonable_encoder
+
+from app.api.v1.models.user import UserInDB
+from app.core.serialization import MongoJSONResponse, Serializer, dumps
+
+
+def make_user(items: int) -> dict:
+    """A rich freelancer document with ``items`` entries in each profile array."""
+    return {
+        "_id": ObjectId(),
+        "email": "dana@example.com",
+        "password_hash": "$2b$12$" + "x" * 53,
+        "first_name": "Dana",
+        "last_name": "Reyes",
+        "role": "freelancer",
+        "is_active": True,
+        "org_id": str(ObjectId()),
+        "version": 7,
+        "profile": {
+            "headline": "Full-stack engineer",
+            "bio": "Ten years of building web platforms. " * 10,
+            "hourly_rate": 85.0,
+            "location": "Lisbon",
+        },
+        "skills": [
+            {"skill_name": f"skill-{i}", "endorsements": i, "proficiency": "expert"} for i in range(items)
+        ],
+        "experience": [
+            {
+                "company_name": f"Company {i}",
+                "job_title": "Senior Engineer",
+                "start_date": "2018-01-01",
+                "end_date": "2020-06-30",
+                "is_current": False,
+            }
+            for i in range(items)
+        ],
+        "projects": [
+            {"project_title": f"Project {i}", "description": "Built a data pipeline and dashboards. " * 4}
+            for i in range(items)
+        ],
+        "education": [
+            {"school_name": "University", "degree": "BSc", "field_of_study": "CS", "start_date": "2010-09-01"}
+            for _ in range(max(1, items // 10))
+        ],
+    }
+
+
+def build_apps(document: dict):
+    validated = UserInDB.model_validate(document)
+    serializer = Serializer(UserInDB)
+
+    legacy = FastAPI()
+
+    @legacy.get("/user", response_model=UserInDB)
+    async def legacy_user():
+        return UserInDB.model_validate(document)
+
+    @legacy.get("/me", response_model=UserInDB)
+    async def legacy_me():
+        return validated
+
+    fast = FastAPI(default_response_class=MongoJSONResponse)
+
+    @fast.get("/user", response_model=UserInDB)
+    async def fast_user():
+        return serializer.response(document)
+
+    @fast.get("/me", response_model=UserInDB)
+    async def fast_me():
+        return serializer.response(validated)
+
+    return legacy, fast
+
+
+async def call(app, path: str) -> bytes:
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": path, "raw_path": path.encode(), "root_path": "",
+        "query_string": b"", "headers": [], "client": ("127.0.0.1", 1), "server": ("test", 80),
+    }
+    body = []
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        if message["type"] == "http.response.body":
+            body.append(message.get("body", b""))
+
+    await app(scope, receive, send)
+    return b"".join(body)
+
+
+async def measure(app, path: str, requests: int):
+    for _ in range(50):
+        await call(app, path)
+    samples = []
+    for _ in range(requests):
+        started = time.process_time()
+        await call(app, path)
+        samples.append(time.process_time() - started)
+    return samples
+
+
+def time_components(document: dict, number: int) -> dict:
+    serializer = Serializer(UserInDB)
+    validated = serializer.validate(document)
+    steps = {
+        "validate": lambda: serializer.validate(document),
+        "jsonable_encoder_json_dumps": lambda: json.dumps(jsonable_encoder(validated, by_alias=True)).encode(),
+        "dump_python_orjson": lambda: dumps(serializer.adapter.dump_python(validated, by_alias=True)),
+        "pydantic_core_dump_json": lambda: serializer.dumps(validated),
+    }
+    return {name: round(timeit.timeit(step, number=number) / number * 1000, 3) for name, step in steps.items()}
+
+
+async def run(args):
+    document = make_user(args.items)
+    legacy, fast = build_apps(document)
+
+    legacy_body = json.loads(await call(legacy, "/user"))
+    fast_body = json.loads(await call(fast, "/user"))
+    assert legacy_body == fast_body, "fast path must render the same JSON"
+
+    report = {"items_per_array": args.items, "response_bytes": len(await call(fast, "/user")), "requests": args.requests}
+    for path in ("/user", "/me"):
+        before = await measure(legacy, path, args.requests)
+        after = await measure(fast, path, args.requests)
+        mean_before = sum(before) / len(before)
+        mean_after = sum(after) / len(after)
+        report[path] = {
+            "legacy_cpu": summarize_ms(before),
+            "fast_cpu": summarize_ms(after),
+            "cpu_saved_per_request_ms": round((mean_before - mean_after) * 1000, 3),
+            "speedup": round(mean_before / mean_after, 2) if mean_after else None,
+        }
+    report["components_ms"] = time_components(document, max(100, args.requests // 4))
+    print(json.dumps(report, indent=2))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=60, help="entries in each of skills/experience/projects")
+    parser.add_argument("--requests", type=int, default=2000)
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
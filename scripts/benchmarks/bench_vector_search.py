@@ -0,0 +1,109 @@
+"""
+Recall and latency of vector search, using the local brute-force store as ground truth.
+
+Local only (exact search, so recall is 1.0 by construction; reports latency):
+
+    python scripts/benchmarks/bench_vector_search.py --vectors 100000 --dim 384
+
+Against Milvus, sweeping search parameters for the configured index type:
+
+    python scripts/benchmarks/bench_vector_search.py --milvus --index HNSW --sweep 16,32,64,128
+"""
+
+import argparse
+import asyncio
+import json
+import time
+import uuid
+
+import numpy as np
+
+from _common import summarize_ms  # also puts backend/ on sys.path
+
+from app.core.milvus import LocalVectorStore, MilvusVectorStore, VectorRecord
+
+
+def make_dataset(count: int, dim: int, queries: int, seed: int = 7):
+    # Clustered data is closer to real embeddings than uniform noise.
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(max(1, count // 500), dim)).astype(np.float32)
+    labels = rng.integers(0, len(centers), size=count)
+    data = centers[labels] + 0.3 * rng.normal(size=(count, dim)).astype(np.float32)
+    query_labels = rng.integers(0, len(centers), size=queries)
+    query_vectors = centers[query_labels] + 0.3 * rng.normal(size=(queries, dim)).astype(np.float32)
+    return data, query_vectors
+
+
+async def timed_search(store, queries, top_k):
+    latencies, results = [], []
+    for query in queries:
+        started = time.perf_counter()
+        hits = await store.search([query], top_k=top_k)
+        latencies.append(time.perf_counter() - started)
+        results.append([hit.id for hit in hits[0]])
+    return results, latencies
+
+
+def recall_at_k(truth, found):
+    total = sum(len(set(t) & set(f)) for t, f in zip(truth, found))
+    return total / max(1, sum(len(t) for t in truth))
+
+
+async def run(args):
+    data, queries = make_dataset(args.vectors, args.dim, args.queries)
+    records = [VectorRecord(str(i), data[i]) for i in range(len(data))]
+
+    local = LocalVectorStore(args.dim, args.metric, capacity=len(records))
+    started = time.perf_counter()
+    await local.upsert(records)
+    load_seconds = time.perf_counter() - started
+    truth, latencies = await timed_search(local, queries, args.top_k)
+    report = [{
+        "backend": "local",
+        "vectors": len(records),
+        "load_seconds": round(load_seconds, 3),
+        "recall_at_k": 1.0,
+        "latency": summarize_ms(latencies),
+    }]
+
+    if args.milvus:
+        collection = f"bench_vectors_{uuid.uuid4().hex[:8]}"
+        key = "ef" if args.index.upper() == "HNSW" else "nprobe"
+        for position, value in enumerate(int(v) for v in args.sweep.split(",")):
+            store = MilvusVectorStore(collection, args.dim, args.metric, index_type=args.index, search_params={key: value})
+            if position == 0:
+                started = time.perf_counter()
+                await store.upsert(records)
+                await asyncio.to_thread(store._client.flush, collection)
+                await asyncio.to_thread(store._client.load_collection, collection)
+                load_seconds = time.perf_counter() - started
+            found, latencies = await timed_search(store, queries, args.top_k)
+            report.append({
+                "backend": "milvus",
+                "index": args.index,
+                key: value,
+                "load_seconds": round(load_seconds, 3),
+                "recall_at_k": round(recall_at_k(truth, found), 4),
+                "latency": summarize_ms(latencies),
+            })
+        await asyncio.to_thread(store._client.drop_collection, collection)
+
+    return report
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--vectors", type=int, default=20000)
+    parser.add_argument("--dim", type=int, default=384)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=10)
+    parser.add_argument("--metric", default="COSINE", choices=["COSINE", "IP", "L2"])
+    parser.add_argument("--milvus", action="store_true", help="also benchmark the Milvus server in MILVUS_URI")
+    parser.add_argument("--index", default="HNSW", help="Milvus index type (HNSW, IVF_FLAT, ...)")
+    parser.add_argument("--sweep", default="16,32,64,128", help="ef (HNSW) or nprobe (IVF) values to try")
+    args = parser.parse_args()
+    print(json.dumps(asyncio.run(run(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+"""
+Load test of the API hot paths, run against the FastAPI app in-process.
+
+    python scripts/benchmarks/loadtest.py --server mongodb://localhost:27017 --concurrency 32
+    python scripts/benchmarks/loadtest.py            # in-memory mongomock stand-in
+    python scripts/benchmarks/loadtest.py --baseline benchmark-results/<earlier>.json
+
+Scenarios run one after another, each at ``--concurrency`` concurrent clients:
+``register`` and ``login`` once per user, then ``--requests`` each of
+``GET /users/me``, ``PATCH /users/me``, ``GET /organizations/{id}`` and
+``GET /organizations/{id}/members`` spread across the users. The ``*_revalidate``
+scenarios repeat the two single-document GETs with the ETag from an earlier
+response in If-None-Match, the way a polling dashboard does. Every scenario reports throughput, latency
+percentiles, status codes and MongoDB commands per request.
+
+Results are written as JSON (default ``benchmark-results/loadtest-<commit>-<time>.json``)
+together with the commit, the Mongo backend and the settings that shape
+performance, so runs can be compared between commits. ``--baseline`` prints the
+change against an earlier result file. Against a server the test uses its own
+database and drops it at the end. Numbers from the stand-in are useful for
+comparing commits with each other, not as absolute figures.
+
+The stand-in (``mongomock-motor``) and the in-process client (``httpx``) are
+listed in ``scripts/benchmarks/requirements.txt``; install that file to run
+any benchmark here.
+"""
+
+import argparse
+import asyncio
+import collections
+import datetime
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import uuid
+
+from _common import BACKEND_DIR, summarize_ms  # also puts backend/ on sys.path
+from pymongo import monitoring
+
+COLLECTIONS = ("users", "organizations", "jobs", "proposals", "resumes")
+# Driver housekeeping that is not caused by a request
+IGNORED_COMMANDS = {"endSessions", "hello", "isMaster", "ismaster", "ping", "buildInfo", "saslStart", "saslContinue"}
+
+
+class CommandCounter(monitoring.CommandListener):
+    """Counts commands sent to a real server."""
+
+    def __init__(self):
+        self.count = 0
+
+    def started(self, event):
+        if event.command_name not in IGNORED_COMMANDS:
+            self.count += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+
+class CountingCollection:
+    """
+    Stand-in counterpart of ``CommandCounter``: counts every collection method
+    call, which for the calls the endpoints make is one command each.
+    """
+
+    def __init__(self, collection, counter):
+        self._collection = collection
+        self._counter = counter
+
+    def __getattr__(self, name):
+        attribute = getattr(self._collection, name)
+        if not callable(attribute) or name.startswith("_"):
+            return attribute
+
+        def counted(*args, **kwargs):
+            self._counter.count += 1
+            return attribute(*args, **kwargs)
+
+        return counted
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except (OSError, subprocess.CalledProcessError):
+        return "unknown"
+
+
+def configure(args):
+    """Environment for the app, set before any ``app.*`` import reads settings."""
+    os.environ.setdefault("LLM_BACKEND", "fake")
+    os.environ.setdefault("EMBEDDING_BACKEND", "fake")
+    os.environ.setdefault("EMBEDDING_CACHE_PATH", "")
+    os.environ["PROPOSAL_RUN_WORKERS_IN_API"] = "false"
+    # Register and login run far above the password class limit; overload has its
+    # own benchmark (bench_load_shedding.py)
+    os.environ.setdefault("SHED_ENABLED", "false")
+    if args.server:
+        os.environ["MONGO_URI"] = f"{args.server.rstrip('/')}/loadtest_{uuid.uuid4().hex[:8]}"
+
+
+def install_counter(args):
+    counter = CommandCounter()
+    if args.server:
+        # Listeners must be registered before the application's client is created.
+        monitoring.register(counter)
+        return counter
+
+    try:
+        from mongomock_motor import AsyncMongoMockClient
+    except ImportError:
+        raise SystemExit("No --server given and mongomock-motor is not installed "
+                         "(pip install -r scripts/benchmarks/requirements.txt)")
+    import app.core.database as database
+
+    client = AsyncMongoMockClient()
+    database.client = client
+    database.db = client["loadtest"]
+    for name in COLLECTIONS:
+        setattr(database, f"{name}_collection", CountingCollection(database.db[name], counter))
+    return counter
+
+
+async def run_scenario(counter, send, jobs, concurrency):
+    """Runs ``send(job)`` for every job with ``concurrency`` workers and summarizes it."""
+    queue = collections.deque(jobs)
+    latencies, statuses = [], collections.Counter()
+
+    async def worker():
+        while queue:
+            job = queue.popleft()
+            started = time.perf_counter()
+            try:
+                status = await send(job)
+            except Exception as exc:  # a failed request is a result, not a crash
+                status = type(exc).__name__
+            latencies.append(time.perf_counter() - started)
+            statuses[str(status)] += 1
+
+    commands_before = counter.count
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+    requests = len(latencies)
+    errors = sum(count for status, count in statuses.items() if not status.isdigit() or int(status) >= 400)
+    return {
+        "requests": requests,
+        "errors": errors,
+        "statuses": dict(statuses),
+        "seconds": round(elapsed, 3),
+        "throughput_rps": round(requests / elapsed, 1) if elapsed else 0.0,
+        **summarize_ms(latencies),
+        "mongo_commands_per_request": round((counter.count - commands_before) / requests, 2) if requests else 0.0,
+    }
+
+
+async def run(args, counter):
+    import httpx
+    from app.core.config import settings
+    from app.core.database import client, create_db_indexes, db
+    from app.main import app
+
+    await create_db_indexes()
+    transport = httpx.ASGITransport(app=app)
+    results = {}
+    try:
+        async with httpx.AsyncClient(transport=transport, base_url="http://loadtest") as http:
+            emails = [f"load{i}@example.com" for i in range(args.users)]
+            password = "load-test-password"
+            tokens = {}
+
+            async def register(email):
+                response = await http.post("/api/v1/endpoints/users/register", json={"email": email, "password": password})
+                return response.status_code
+
+            async def login(email):
+                response = await http.post("/api/v1/endpoints/users/login", data={"username": email, "password": password})
+                if response.status_code == 200:
+                    tokens[email] = {"Authorization": f"Bearer {response.json()['access_token']}"}
+                return response.status_code
+
+            results["register"] = await run_scenario(counter, register, emails, args.concurrency)
+            results["login"] = await run_scenario(counter, login, emails, args.concurrency)
+            if not tokens:
+                raise SystemExit(
+                    f"No user could log in (register: {results['register']['statuses']}, "
+                    f"login: {results['login']['statuses']})"
+                )
+
+            # Setup, not measured: one organization with every user as a member
+            organization = await http.post("/api/v1/endpoints/organizations/register", json={"name": f"Load {uuid.uuid4().hex[:6]}"})
+            org_id = organization.json()["_id"]
+            for headers in tokens.values():
+                await http.patch("/api/v1/endpoints/users/me", headers=headers, json={"org_id": org_id})
+
+            users = list(tokens.values())
+            jobs = [users[i % len(users)] for i in range(args.requests)]
+
+            async def get_me(headers):
+                return (await http.get("/api/v1/endpoints/users/me", headers=headers)).status_code
+
+            async def patch_me(headers):
+                body = {"first_name": uuid.uuid4().hex[:8], "org_id": org_id}
+                return (await http.patch("/api/v1/endpoints/users/me", headers=headers, json=body)).status_code
+
+            async def members(headers):
+                url = f"/api/v1/endpoints/organizations/{org_id}/members?limit={args.page_size}"
+                return (await http.get(url, headers=headers)).status_code
+
+            async def get_org(headers):
+                return (await http.get(f"/api/v1/endpoints/organizations/{org_id}")).status_code
+
+            # ETags as a polling client would have kept them from its last full response
+            etags = {}
+
+            async def remember_etag(headers):
+                response = await http.get("/api/v1/endpoints/users/me", headers=headers)
+                etags[headers["Authorization"]] = response.headers.get("etag")
+                return response.status_code
+
+            async def get_me_revalidate(headers):
+                conditional = {**headers, "If-None-Match": etags.get(headers["Authorization"]) or ""}
+                return (await http.get("/api/v1/endpoints/users/me", headers=conditional)).status_code
+
+            async def get_org_revalidate(headers):
+                conditional = {"If-None-Match": etags.get("organization") or ""}
+                return (await http.get(f"/api/v1/endpoints/organizations/{org_id}", headers=conditional)).status_code
+
+            # Warm-up tokens into the principal cache the way steady traffic would
+            await run_scenario(counter, get_me, users, args.concurrency)
+            results["get_me"] = await run_scenario(counter, get_me, jobs, args.concurrency)
+            await run_scenario(counter, remember_etag, users, args.concurrency)
+            results["get_me_revalidate"] = await run_scenario(counter, get_me_revalidate, jobs, args.concurrency)
+            results["get_org"] = await run_scenario(counter, get_org, jobs, args.concurrency)
+            etags["organization"] = (await http.get(f"/api/v1/endpoints/organizations/{org_id}")).headers.get("etag")
+            results["get_org_revalidate"] = await run_scenario(counter, get_org_revalidate, jobs, args.concurrency)
+            results["patch_me"] = await run_scenario(counter, patch_me, jobs, args.concurrency)
+            results["members"] = await run_scenario(counter, members, jobs, args.concurrency)
+    finally:
+        if args.server:
+            await client.drop_database(db.name)
+        client.close()
+
+    return {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "mongo": "server" if args.server else "mongomock",
+            "python": platform.python_version(),
+            "concurrency": args.concurrency,
+            "users": args.users,
+            "requests": args.requests,
+            "page_size": args.page_size,
+            "settings": {
+                key: getattr(settings, key)
+                for key in (
+                    "PASSWORD_HASH_EXECUTOR", "PASSWORD_HASH_WORKERS", "PASSWORD_HASH_QUEUE_SIZE",
+                    "PRINCIPAL_CACHE_SIZE", "PRINCIPAL_CACHE_TTL_SECONDS", "METRICS_ENABLED",
+                    "RESPONSE_CACHE_SIZE", "SHED_ENABLED",
+                )
+            },
+        },
+        "scenarios": results,
+    }
+
+
+def compare(report: dict, baseline_path: str):
+    with open(baseline_path) as handle:
+        baseline = json.load(handle)
+    print(f"\nchange vs {baseline_path} (commit {baseline['meta'].get('commit')}):")
+    print(f"{'scenario':<10} {'rps':>16} {'p50 ms':>18} {'p99 ms':>18} {'cmds/req':>14}")
+    for name, current in report["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if not before:
+            continue
+        cells = []
+        for key in ("throughput_rps", "p50_ms", "p99_ms", "mongo_commands_per_request"):
+            old, new = before.get(key, 0), current.get(key, 0)
+            change = f"{(new - old) / old * 100:+.0f}%" if old else "n/a"
+            cells.append(f"{old:g}->{new:g} {change}")
+        print(f"{name:<10} {cells[0]:>16} {cells[1]:>18} {cells[2]:>18} {cells[3]:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", help="mongod URI without a database; omit to use the in-memory stand-in")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--users", type=int, default=100, help="users registered and logged in (bcrypt bound)")
+    parser.add_argument("--requests", type=int, default=2000, help="requests per read/write scenario")
+    parser.add_argument("--page-size", type=int, default=50, help="limit for the members listing")
+    parser.add_argument("--output", help="result file (default benchmark-results/loadtest-<commit>-<time>.json)")
+    parser.add_argument("--baseline", help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    configure(args)
+    counter = install_counter(args)
+    report = asyncio.run(run(args, counter))
+
+    output = args.output or os.path.join(
+        "benchmark-results",
+        f"loadtest-{report['meta']['commit']}-{datetime.datetime.now().strftime('%Y%m%dT%H%M%S')}.json",
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as handle:
+        json.dump(report, handle, indent=2)
+
+    json.dump(report["scenarios"], sys.stdout, indent=2)
+    print(f"\nwritten to {output}")
+    if args.baseline:
+        compare(report, args.baseline)
+
+
+if __name__ == "__main__":
+    main()
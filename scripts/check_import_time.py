@@ -0,0 +1,93 @@
+"""
+Checks how long ``import app.main`` takes and that it stays free of the AI stack.
+
+    python scripts/check_import_time.py
+    python scripts/check_import_time.py --budget-ms 1500 --top 25
+
+The import runs in a fresh interpreter under ``python -X importtime`` with
+``backend/`` as the working directory, so nothing is cached in-process. The
+total and the slowest modules (by cumulative time) are printed.
+
+Exits with status 1 if the import takes longer than ``--budget-ms`` or loads any
+module listed in ``--forbid``: those are imported on first use, or by the
+warm-up hooks in ``app/lifespan.py``, never by the import itself. Timings vary
+between machines and runs; take the best of ``--runs`` when setting a budget.
+
+This is a script rather than a test because the repository has no test suite
+or runner to hook it into, and the check needs a fresh interpreter anyway. Its
+exit status makes it usable as a CI or pre-deploy step as it is.
+"""
+
+import argparse
+import os
+import re
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend"))
+FORBIDDEN = ("numpy", "openai", "pymilvus", "langchain", "tiktoken", "app.services.ai_agent_service",
+             "app.services.embedding_service", "app.core.milvus", "app.services.skill_matcher")
+
+# "import time: self [us] | cumulative | imported package"
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)")
+
+
+def measure(module: str):
+    """Returns ``{module: (self_us, cumulative_us, depth)}`` for one fresh import."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True,
+    )
+    if result.returncode != 0:
+        raise SystemExit(f"import {module} failed:\n{result.stderr[-2000:]}")
+    modules = {}
+    for line in result.stderr.splitlines():
+        match = LINE.match(line)
+        if match:
+            own, cumulative, indent, name = match.groups()
+            modules[name] = (int(own), int(cumulative), len(indent) // 2)
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--module", default="app.main")
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="maximum cumulative import time")
+    parser.add_argument("--runs", type=int, default=3, help="imports measured; the fastest is reported")
+    parser.add_argument("--top", type=int, default=15, help="slowest top-level imports to list")
+    parser.add_argument("--forbid", nargs="*", default=list(FORBIDDEN),
+                        help="modules (and their submodules) that must not be imported")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(max(1, args.runs))]
+    modules = min(runs, key=lambda run: run.get(args.module, (0, 0, 0))[1])
+    total_ms = modules.get(args.module, (0, 0, 0))[1] / 1000
+
+    # Depth 1 entries are what the module itself imports (directly or first)
+    direct = sorted(
+        ((name, cumulative) for name, (_, cumulative, depth) in modules.items() if depth == 1),
+        key=lambda item: item[1], reverse=True,
+    )
+    print(f"import {args.module}: {total_ms:.0f} ms (best of {len(runs)}), {len(modules)} modules")
+    for name, cumulative in direct[: args.top]:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    forbidden = sorted(
+        name for name in modules
+        if any(name == prefix or name.startswith(prefix + ".") for prefix in args.forbid)
+    )
+    failed = False
+    if forbidden:
+        print(f"FAIL: imports modules that must load lazily: {', '.join(forbidden)}")
+        failed = True
+    if total_ms > args.budget_ms:
+        print(f"FAIL: {total_ms:.0f} ms exceeds the {args.budget_ms:.0f} ms budget")
+        failed = True
+    if not failed:
+        print(f"OK: within {args.budget_ms:.0f} ms and no eagerly imported AI modules")
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
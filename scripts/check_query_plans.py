@@ -0,0 +1,88 @@
+"""
+Checks that every query shape the endpoints issue is served by an index.
+
+Against a local mongod the registered indexes are applied to a scratch database
+and each shape in ``app.core.indexes.QUERY_SHAPES`` is run through ``explain()``:
+
+    python scripts/check_query_plans.py --server mongodb://localhost:27017
+
+With ``--offline`` no server is needed; the index registry is checked by the
+in-process planner in ``app.core.indexes.plan_query`` instead.
+
+Exits with status 1 if any shape resolves to a COLLSCAN.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import uuid
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from app.core.indexes import INDEXES, QUERY_SHAPES, apply_indexes, plan_query, winning_stages  # noqa: E402
+
+
+def check_offline():
+    rows = []
+    for shape in QUERY_SHAPES:
+        stage, index_name = plan_query(shape, INDEXES)
+        rows.append((shape.name, [stage], index_name or "-"))
+    return rows
+
+
+async def check_server(server: str):
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    client = AsyncIOMotorClient(server)
+    db = client[f"query_plans_{uuid.uuid4().hex[:8]}"]
+    rows = []
+    try:
+        await apply_indexes(db, INDEXES)
+        for shape in QUERY_SHAPES:
+            cursor = db[shape.collection].find(shape.filter, shape.projection)
+            if shape.sort:
+                cursor = cursor.sort(list(shape.sort))
+            explained = await cursor.explain()
+            plan = explained.get("queryPlanner", {}).get("winningPlan", {})
+            index_name = _find_index_name(plan)
+            rows.append((shape.name, winning_stages(explained), index_name or "-"))
+    finally:
+        await client.drop_database(db.name)
+        client.close()
+    return rows
+
+
+def _find_index_name(plan):
+    if not isinstance(plan, dict):
+        return None
+    if "indexName" in plan:
+        return plan["indexName"]
+    for child in [plan.get("inputStage"), plan.get("queryPlan"), *plan.get("inputStages", [])]:
+        found = _find_index_name(child)
+        if found:
+            return found
+    return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--server", default="mongodb://localhost:27017", help="mongod URI without a database")
+    parser.add_argument("--offline", action="store_true", help="use the in-process planner instead of a server")
+    args = parser.parse_args()
+
+    rows = check_offline() if args.offline else asyncio.run(check_server(args.server))
+
+    failures = 0
+    for name, stages, index_name in rows:
+        flagged = "COLLSCAN" in stages
+        failures += flagged
+        print(f"{'FAIL' if flagged else 'ok  '}  {name:<32} {' <- '.join(stages):<28} {index_name}")
+
+    if failures:
+        print(f"\n{failures} query shape(s) fall back to a collection scan.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+Finds documents that collide on a field guarded by a unique index and resolves
+them so ``apply_indexes`` can build the index.
+
+    python scripts/dedupe_unique_fields.py [--fix]
+
+Every single-field unique index in ``app.core.indexes.INDEXES`` is checked.
+Within each group of duplicates the oldest document (lowest ``_id``) keeps its
+value and the others are resolved per field:
+
+- ``organizations.name``: renamed to ``"<name> (<_id>)"``, and the
+  organization's version bumped so cached responses are refreshed. Documents
+  without a name get their ``_id`` as name.
+- ``jobs.external_id``: unset, which takes the later posts out of the partial
+  index; they stay searchable but are no longer recognised on re-import.
+- ``users.email``: only reported. Accounts sharing an email have to be merged
+  by hand, since either may own proposals and resumes.
+
+Without ``--fix`` nothing is written. The exit status is 1 while any
+duplicates remain unresolved, so the check can run before a deploy.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from app.core.database import client, db  # noqa: E402
+from app.core.indexes import INDEXES  # noqa: E402
+
+# (collection, field) -> how later duplicates are resolved; None leaves them to an operator
+RESOLUTIONS = {
+    ("organizations", "name"): "rename",
+    ("jobs", "external_id"): "unset",
+    ("users", "email"): None,
+}
+
+
+async def duplicate_groups(collection, field: str, partial_filter):
+    """Yields ``(value, [_id, ...])`` for each value held by more than one document, ids ascending."""
+    pipeline = [
+        {"$match": partial_filter or {}},
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": f"${field}", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}},
+    ]
+    async for group in collection.aggregate(pipeline, allowDiskUse=True):
+        yield group["_id"], group["ids"]
+
+
+async def resolve(collection, field: str, resolution: str, value, duplicate_ids):
+    for document_id in duplicate_ids:
+        if resolution == "rename":
+            renamed = f"{value} ({document_id})" if value else str(document_id)
+            await collection.update_one({"_id": document_id}, {"$set": {field: renamed}, "$inc": {"version": 1}})
+        elif resolution == "unset":
+            await collection.update_one({"_id": document_id}, {"$unset": {field: ""}})
+
+
+async def run(fix: bool) -> int:
+    unresolved = 0
+    for collection_name, specs in INDEXES.items():
+        for spec in specs:
+            if not spec.unique or len(spec.keys) != 1:
+                continue
+            field = spec.keys[0][0]
+            resolution = RESOLUTIONS.get((collection_name, field))
+            collection = db[collection_name]
+            groups = 0
+            async for value, ids in duplicate_groups(collection, field, spec.partial_filter):
+                groups += 1
+                keep, duplicates = ids[0], ids[1:]
+                print(f"{collection_name}.{field} = {value!r}: keeping {keep}, "
+                      f"{len(duplicates)} duplicate(s): {', '.join(map(str, duplicates))}")
+                if fix and resolution:
+                    await resolve(collection, field, resolution, value, duplicates)
+                else:
+                    unresolved += 1
+            action = resolution or "left for manual merge"
+            print(f"{collection_name}.{field}: {groups} duplicated value(s), resolution: {action}")
+
+    if unresolved:
+        print(f"unresolved duplicated values: {unresolved}")
+    return 1 if unresolved else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fix", action="store_true", help="resolve the duplicates that have an automatic resolution")
+    args = parser.parse_args()
+    try:
+        status = asyncio.run(run(args.fix))
+    finally:
+        client.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""
+Bulk-loads freelancers' past projects into the vector store for proposal retrieval.
+
+Documents are streamed from MongoDB (the ``projects`` array on each user), from
+JSONL dumps, or from a synthetic generator. Each document is chunked, embedded in
+batches by a bounded pool of workers and upserted into the project vector
+collection. Progress is checkpointed after every batch, so a crashed run resumes
+after the last fully ingested document instead of re-embedding everything.
+
+    # Everything in MongoDB, resuming from the checkpoint if one exists
+    python scripts/ingest_projects.py --source mongo
+
+    # External dumps; one JSON object per line with user_id, org_id,
+    # project_title and description
+    python scripts/ingest_projects.py --source jsonl dumps/*.jsonl
+
+    # Offline throughput run: fake embedder, in-memory store, no checkpoint
+    python scripts/ingest_projects.py --source synthetic --count 50000 --dry-run
+
+Ingestion only adds and replaces chunks: chunk ``i`` of a document always has the
+id ``<document id>:<i>``. Chunks of projects deleted since an earlier run, and
+the trailing chunks of projects that got shorter, stay in the store until the
+collection is rebuilt (``--restart`` into an emptied collection). Retrieval
+drops hits whose project is no longer in the freelancer's profile, so stale
+chunks cost space and search depth but are never shown.
+
+The first failed batch stops the run: reading the source stops, batches still
+embedding are cancelled, and the error is raised. The checkpoint stays at the
+last batch before the failure, so the next run resumes there.
+"""
+
+import argparse
+import asyncio
+import glob
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, field
+from typing import AsyncIterator, List, Optional
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from app.core.config import settings  # noqa: E402
+from app.core.milvus import LocalVectorStore, VectorRecord, get_vector_store  # noqa: E402
+from app.services.embedding_service import FakeEmbedder, chunk_text, get_embedder  # noqa: E402
+
+
+@dataclass
+class Document:
+    id: str
+    text: str
+    # Resume point in the source; every document with the same position is
+    # ingested before the position is checkpointed.
+    position: object
+    user_id: Optional[str] = None
+    org_id: Optional[str] = None
+    title: Optional[str] = None
+
+
+@dataclass
+class Batch:
+    sequence: int
+    records: List[VectorRecord] = field(default_factory=list)
+    texts: List[str] = field(default_factory=list)
+    documents: int = 0
+    # Last source position fully contained in this batch and the ones before it
+    completed_position: object = None
+
+
+def project_text(project: dict) -> str:
+    title = project.get("project_title") or ""
+    description = project.get("description") or ""
+    return f"{title}\n{description}".strip()
+
+
+async def mongo_documents(after: Optional[str], batch_size: int) -> AsyncIterator[Document]:
+    from bson import ObjectId
+    from app.core.database import users_collection
+
+    query = {"projects.0": {"$exists": True}, "is_deleted": {"$ne": True}}
+    if after:
+        query["_id"] = {"$gt": ObjectId(after)}
+    cursor = users_collection.find(query, {"projects": 1, "org_id": 1}).sort("_id", 1).batch_size(batch_size)
+    async for user in cursor:
+        user_id = str(user["_id"])
+        for index, project in enumerate(user.get("projects") or []):
+            text = project_text(project)
+            if text:
+                # item_id keeps vector ids stable when earlier projects are removed
+                yield Document(
+                    id=f"{user_id}:project:{project.get('item_id') or index}",
+                    text=text,
+                    position=user_id,
+                    user_id=user_id,
+                    org_id=user.get("org_id"),
+                    title=project.get("project_title"),
+                )
+
+
+async def jsonl_documents(paths: List[str], after: Optional[list]) -> AsyncIterator[Document]:
+    start_file, start_line = (after or [None, -1])
+    skipping = start_file is not None
+    for path in paths:
+        if skipping and path != start_file:
+            continue
+        with open(path, encoding="utf-8") as handle:
+            for line_number, line in enumerate(handle):
+                if skipping:
+                    if line_number <= start_line:
+                        continue
+                    skipping = False
+                if not line.strip():
+                    continue
+                record = json.loads(line)
+                text = record.get("text") or project_text(record)
+                if text:
+                    yield Document(
+                        id=str(record.get("id") or f"{os.path.basename(path)}:{line_number}"),
+                        text=text,
+                        position=[path, line_number],
+                        user_id=record.get("user_id"),
+                        org_id=record.get("org_id"),
+                        title=record.get("project_title"),
+                    )
+        skipping = False
+
+
+async def synthetic_documents(count: int, after: Optional[int]) -> AsyncIterator[Document]:
+    stacks = ["react", "django", "fastapi", "kubernetes", "pytorch", "flutter", "golang", "postgres", "aws", "shopify"]
+    verbs = ["built", "migrated", "optimized", "designed", "scaled", "integrated"]
+    for i in range((after or -1) + 1, count):
+        stack = f"{stacks[i % len(stacks)]} and {stacks[(i * 7) % len(stacks)]}"
+        text = (
+            f"Project {i}: {verbs[i % len(verbs)]} a {stack} platform for a client in "
+            f"sector {i % 17}. " + "Delivered features, tests and deployment pipelines. " * (1 + i % 5)
+        )
+        yield Document(id=f"synthetic:{i}", text=text, position=i, user_id=f"user{i % 1000}", org_id=f"org{i % 10}")
+
+
+class Checkpoint:
+    """
+    Persists the resume position atomically (write to a temp file, then rename).
+    """
+
+    def __init__(self, path: Optional[str], source: str):
+        self.path = path
+        self.source = source
+
+    def load(self) -> Optional[dict]:
+        if not self.path or not os.path.exists(self.path):
+            return None
+        with open(self.path) as handle:
+            state = json.load(handle)
+        if state.get("source") != self.source:
+            raise SystemExit(f"Checkpoint {self.path} belongs to source {state.get('source')!r}, not {self.source!r}")
+        return state
+
+    def save(self, position, documents: int, chunks: int):
+        if not self.path:
+            return
+        temporary = f"{self.path}.tmp"
+        with open(temporary, "w") as handle:
+            json.dump({"source": self.source, "position": position, "documents": documents, "chunks": chunks, "updated_at": time.time()}, handle)
+        os.replace(temporary, self.path)
+
+
+class Pipeline:
+    def __init__(self, store, embedder, checkpoint: Checkpoint, batch_size: int, concurrency: int, max_chars: int, overlap: int):
+        self.store = store
+        self.embedder = embedder
+        self.checkpoint = checkpoint
+        self.batch_size = batch_size
+        self.concurrency = concurrency
+        self.max_chars = max_chars
+        self.overlap = overlap
+        self.documents = 0
+        self.chunks = 0
+        self._finished = {}
+        self._error: Optional[BaseException] = None
+        self._next_to_commit = 0
+        self._started = time.perf_counter()
+        self._last_report = self._started
+
+    async def _batches(self, documents: AsyncIterator[Document]) -> AsyncIterator[Batch]:
+        sequence = 0
+        batch = Batch(sequence)
+        current_position = None
+        completed_position = None
+        async for document in documents:
+            if self._error is not None:
+                return
+            if document.position != current_position:
+                completed_position = current_position
+                current_position = document.position
+            batch.documents += 1
+            for index, chunk in enumerate(chunk_text(document.text, self.max_chars, self.overlap)):
+                batch.records.append(VectorRecord(
+                    id=f"{document.id}:{index}",
+                    vector=(),
+                    org_id=document.org_id,
+                    metadata={"user_id": document.user_id, "title": document.title, "chunk": index, "text": chunk},
+                ))
+                batch.texts.append(chunk)
+                if len(batch.records) >= self.batch_size:
+                    batch.completed_position = completed_position
+                    yield batch
+                    sequence += 1
+                    batch = Batch(sequence)
+        # End of stream: the last position is now complete too
+        batch.completed_position = current_position
+        yield batch
+
+    async def _worker(self, queue: asyncio.Queue):
+        while True:
+            batch = await queue.get()
+            try:
+                if batch is None:
+                    return
+                if self._error is not None:
+                    # Keep draining so the producer never blocks until it sees
+                    # the error; nothing past the failed batch gets checkpointed.
+                    continue
+                if batch.texts:
+                    vectors = await self.embedder.embed(batch.texts)
+                    for record, vector in zip(batch.records, vectors):
+                        record.vector = vector
+                    await self.store.upsert(batch.records)
+                self._commit(batch)
+            except Exception as exc:
+                self._error = exc
+            finally:
+                queue.task_done()
+
+    def _commit(self, batch: Batch):
+        # Batches finish out of order; only checkpoint the contiguous prefix.
+        self._finished[batch.sequence] = batch
+        while self._next_to_commit in self._finished:
+            done = self._finished.pop(self._next_to_commit)
+            self._next_to_commit += 1
+            self.documents += done.documents
+            self.chunks += len(done.records)
+            if done.completed_position is not None:
+                self.checkpoint.save(done.completed_position, self.documents, self.chunks)
+        now = time.perf_counter()
+        if now - self._last_report >= 5:
+            self._last_report = now
+            print(f"  {self.documents} docs, {self.chunks} chunks, {self.documents / (now - self._started):.1f} docs/sec", flush=True)
+
+    async def run(self, documents: AsyncIterator[Document]) -> dict:
+        # Bounded queue: reading from the source pauses when the embedders fall behind.
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.concurrency * 2)
+        workers = [asyncio.create_task(self._worker(queue)) for _ in range(self.concurrency)]
+        async for batch in self._batches(documents):
+            if self._error is not None:
+                break
+            await queue.put(batch)
+        if self._error is None:
+            for _ in workers:
+                await queue.put(None)
+            await asyncio.gather(*workers)
+        if self._error is not None:
+            # Other batches still embedding would only be thrown away
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            raise self._error
+
+        elapsed = time.perf_counter() - self._started
+        return {
+            "documents": self.documents,
+            "chunks": self.chunks,
+            "seconds": round(elapsed, 3),
+            "docs_per_sec": round(self.documents / elapsed, 1) if elapsed else 0.0,
+            "chunks_per_sec": round(self.chunks / elapsed, 1) if elapsed else 0.0,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--source", choices=["mongo", "jsonl", "synthetic"], default="mongo")
+    parser.add_argument("paths", nargs="*", help="JSONL files (or globs) for --source jsonl")
+    parser.add_argument("--count", type=int, default=10000, help="documents for --source synthetic")
+    parser.add_argument("--batch-size", type=int, default=64, help="chunks per embedding call")
+    parser.add_argument("--concurrency", type=int, default=4, help="embedding calls in flight")
+    parser.add_argument("--max-chars", type=int, default=1000)
+    parser.add_argument("--overlap", type=int, default=100)
+    parser.add_argument("--checkpoint", default="ingest_projects.checkpoint.json")
+    parser.add_argument("--restart", action="store_true", help="ignore an existing checkpoint")
+    parser.add_argument("--dry-run", action="store_true", help="fake embedder and in-memory store; no checkpoint")
+    parser.add_argument("--fake-latency", type=float, default=0.0, help="seconds per fake embedding call")
+    args = parser.parse_args()
+
+    source_key = args.source if args.source != "jsonl" else "jsonl:" + ",".join(args.paths)
+    checkpoint = Checkpoint(None if args.dry_run else args.checkpoint, source_key)
+    state = None if args.restart else checkpoint.load()
+    after = state["position"] if state else None
+    if state:
+        print(f"Resuming after {after!r} ({state['documents']} docs already ingested)")
+
+    if args.dry_run:
+        embedder = FakeEmbedder(latency=args.fake_latency)
+        store = LocalVectorStore(embedder.dim)
+    else:
+        embedder = get_embedder()
+        store = get_vector_store(settings.PROJECT_VECTOR_COLLECTION, embedder.dim)
+
+    if args.source == "mongo":
+        documents = mongo_documents(after, batch_size=args.batch_size * 4)
+    elif args.source == "jsonl":
+        paths = sorted(path for pattern in args.paths for path in glob.glob(pattern))
+        documents = jsonl_documents(paths, after)
+    else:
+        documents = synthetic_documents(args.count, after)
+
+    pipeline = Pipeline(store, embedder, checkpoint, args.batch_size, args.concurrency, args.max_chars, args.overlap)
+    report = asyncio.run(pipeline.run(documents))
+
+    if isinstance(store, LocalVectorStore) and settings.LOCAL_VECTOR_PATH and not args.dry_run:
+        store.save(os.path.join(settings.LOCAL_VECTOR_PATH, settings.PROJECT_VECTOR_COLLECTION))
+    report["dry_run"] = args.dry_run
+    if hasattr(embedder, "stats"):
+        report["embedding_cache"] = embedder.stats()
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
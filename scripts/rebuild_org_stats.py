@@ -0,0 +1,64 @@
+"""
+Recomputes the materialized ``org_stats`` documents from ``users`` and
+``proposals`` and reports where the stored counters drifted from them.
+
+    python scripts/rebuild_org_stats.py [--org ORG_ID ...] [--fix]
+
+Without ``--fix`` nothing is written and the exit status is 1 when any
+organization drifted, so the check can run on a schedule. With ``--fix`` each
+drifted document is replaced by the recomputed one. Writes that land between
+the recomputation and the replacement are lost from the counters; a second run
+reports them, so run the fix when traffic is low or repeat it until clean.
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "backend")))
+
+from app.core.database import client, org_stats_collection  # noqa: E402
+from app.services.org_stats_service import compute_org_stats, drift  # noqa: E402
+
+
+async def run(org_ids, fix: bool) -> int:
+    expected = await compute_org_stats(org_ids)
+    query = {"_id": {"$in": org_ids}} if org_ids else {}
+    stored = {document["_id"]: document async for document in org_stats_collection.find(query)}
+
+    drifted = 0
+    empty = {"weeks": {}}
+    for org_id in sorted(expected.keys() | stored.keys()):
+        differences = drift(expected.get(org_id, empty), stored.get(org_id))
+        if not differences:
+            continue
+        drifted += 1
+        print(f"{org_id}: {len(differences)} field(s) drifted")
+        for field, (have, want) in differences.items():
+            print(f"  {field}: stored {have}, expected {want}")
+        if fix:
+            document = {**expected.get(org_id, empty), "updated_at": datetime.now(timezone.utc)}
+            await org_stats_collection.replace_one({"_id": org_id}, document, upsert=True)
+
+    checked = len(expected.keys() | stored.keys())
+    action = "repaired" if fix else "drifted"
+    print(f"organizations checked: {checked}, {action}: {drifted}")
+    return 1 if drifted and not fix else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--org", action="append", dest="org_ids", help="only this organization (repeatable)")
+    parser.add_argument("--fix", action="store_true", help="replace drifted documents with recomputed ones")
+    args = parser.parse_args()
+    try:
+        status = asyncio.run(run(args.org_ids, args.fix))
+    finally:
+        client.close()
+    sys.exit(status)
+
+
+if __name__ == "__main__":
+    main()